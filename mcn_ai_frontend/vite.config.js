@@ -11,4 +11,8 @@ export default defineConfig({
       "@": path.resolve(__dirname, "./src"),
     },
   },
+  build: {
+    // 生成 dist/.vite/manifest.json：后端据此识别带内容哈希的产物并设置长期缓存
+    manifest: true,
+  },
 })
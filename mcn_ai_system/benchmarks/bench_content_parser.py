@@ -0,0 +1,132 @@
+# mcn_ai_system/benchmarks/bench_content_parser.py
+"""
+内容解析微基准：对比旧版四个 _extract_* 方法（每个都逐行扫描全文）
+与单次扫描的 parse_sections / 流式 StreamingSectionParser 在大响应上的耗时。
+
+用法（在 mcn_ai_system 目录下）：
+    python benchmarks/bench_content_parser.py [--script-lines 20000] [--repeat 5]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.content_parser import StreamingSectionParser, content_from_sections, parse_sections
+
+
+# ---- 旧版提取逻辑（原 AIModelService._extract_*，保留用于对比） ----
+
+def legacy_extract_title(text):
+    for line in text.splitlines():
+        if '标题' in line:
+            parts = line.split('：')
+            if len(parts) > 1:
+                return parts[-1].strip()
+            else:
+                parts = line.split(':')
+                if len(parts) > 1:
+                    return parts[-1].strip()
+    return "AI生成标题"
+
+
+def legacy_extract_description(text):
+    for line in text.splitlines():
+        if '描述' in line:
+            parts = line.split('：')
+            if len(parts) > 1:
+                return parts[-1].strip()
+            else:
+                parts = line.split(':')
+                if len(parts) > 1:
+                    return parts[-1].strip()
+    return "AI生成描述"
+
+
+def legacy_extract_script(text):
+    lines = text.splitlines()
+    script_found = False
+    script_content = []
+    for line in lines:
+        if '脚本：' in line:
+            script_found = True
+            script_content.append(line.split('：')[-1].strip())
+        elif 'Script:' in line:
+            script_found = True
+            script_content.append(line.split(':')[-1].strip())
+        elif script_found and not any(k in line for k in ['标题', '描述', '标签', 'Title', 'Description', 'Tags']):
+            script_content.append(line.strip())
+        elif script_found and any(k in line for k in ['标题', '描述', '标签', 'Title', 'Description', 'Tags']):
+            break
+    return "\n".join(script_content).strip() if script_content else "AI生成脚本"
+
+
+def legacy_extract_tags(text):
+    for line in text.splitlines():
+        if '标签' in line:
+            parts = line.split('：')
+            if len(parts) > 1:
+                tags = parts[-1].strip()
+                return [tag.strip() for tag in tags.split(',') if tag.strip()]
+            else:
+                parts = line.split(':')
+                if len(parts) > 1:
+                    tags = parts[-1].strip()
+                    return [tag.strip() for tag in tags.split(',') if tag.strip()]
+    return ["AI", "生成", "标签"]
+
+
+def legacy_parse(text):
+    return {
+        "title": legacy_extract_title(text),
+        "description": legacy_extract_description(text),
+        "script": legacy_extract_script(text),
+        "tags": legacy_extract_tags(text)
+    }
+
+
+# ---- 新版解析 ----
+
+def single_pass_parse(text):
+    return content_from_sections(parse_sections(text))
+
+
+def streaming_parse(text, chunk_size=64):
+    parser = StreamingSectionParser()
+    for start in range(0, len(text), chunk_size):
+        parser.feed(text[start:start + chunk_size])
+    parser.close()
+    return content_from_sections(parser.sections)
+
+
+def build_response(script_lines: int, tags_last: bool) -> str:
+    """构造大响应：脚本段落很长；tags_last 时标签位于末尾（旧版需扫描全文才能找到）"""
+    script = "\n".join(f"第{i}段：镜头切换到产品特写，主播介绍使用体验和细节。" for i in range(script_lines))
+    parts = ["标题：夏日防晒全攻略", "描述：三分钟讲清楚防晒霜怎么选、怎么涂。", f"脚本：开场白\n{script}"]
+    tags = "标签：防晒,护肤,夏日"
+    return "\n".join(parts + [tags] if tags_last else [tags] + parts)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--script-lines', type=int, default=20000)
+    arg_parser.add_argument('--repeat', type=int, default=5)
+    args = arg_parser.parse_args()
+
+    for tags_last in (True, False):
+        text = build_response(args.script_lines, tags_last)
+        legacy, single = legacy_parse(text), single_pass_parse(text)
+        # 脚本中的 "第N段：" 不是段落标题，两种实现都应原样保留
+        assert legacy == single == streaming_parse(text), "解析结果不一致"
+
+        print(f"响应大小: {len(text) / 1024:.0f} KB, 脚本行数: {args.script_lines}, 标签在末尾: {tags_last}")
+        for name, func in (("legacy _extract_*", legacy_parse),
+                           ("parse_sections", single_pass_parse),
+                           ("StreamingSectionParser", streaming_parse)):
+            best = min(timeit.repeat(lambda: func(text), number=1, repeat=args.repeat))
+            print(f"  {name:<24} {best * 1000:8.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
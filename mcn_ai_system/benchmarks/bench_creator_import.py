@@ -0,0 +1,102 @@
+# mcn_ai_system/benchmarks/bench_creator_import.py
+"""
+创作者批量导入基准：生成 N 行合成的 CSV / NDJSON 文件，导入到临时 SQLite 数据库（不影响 app.db），
+输出导入耗时与每秒行数；随后按 id 重新导入同一文件（全部走更新路径），最后测量导出速度。
+
+用法（在 mcn_ai_system 目录下）：
+    python benchmarks/bench_creator_import.py [--rows 1000000] [--format csv] [--batch-size 2000]
+"""
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+
+from src.models.user import db
+from src.services.creator_io import CREATOR_IMPORT_BATCH_SIZE, LIST_SEPARATOR, import_creators, iter_export
+from src.services.creator_catalog import CREATOR_FIELDS
+
+CATEGORIES = ['美妆', '科技', '美食', '旅行', '健康', '时尚', '宠物', '动漫', '母婴', '汽车']
+TAGS = ['护肤', '穿搭', '数码', '测评', '探店', '户外', '健身', '萌宠', '二次元', 'vlog', '家居', '教育']
+PLATFORMS = ['抖音', '小红书', 'B站', '快手', '微博']
+
+
+def synthetic_rows(count, seed=0):
+    rng = random.Random(seed)
+    for number in range(1, count + 1):
+        yield {
+            "id": number,
+            "name": f"创作者{number}",
+            "category": rng.choice(CATEGORIES),
+            "followers": rng.randint(1000, 5000000),
+            "engagement_rate": round(rng.uniform(1, 15), 1),
+            "avg_views": rng.randint(500, 500000),
+            "potential_score": rng.randint(40, 100),
+            "growth_trend": rng.choice(['上升', '稳定', '下降']),
+            "platforms": rng.sample(PLATFORMS, rng.randint(1, 3)),
+            "style": rng.choice(['活泼、时尚', '专业、深度', '亲和、实用', '治愈、风景']),
+            "tags": rng.sample(TAGS, 3),
+            "past_collaborations": f"品牌{rng.randint(1, 500)}"
+        }
+
+
+def write_file(path, fmt, count):
+    with open(path, 'w', encoding='utf-8', newline='') as target:
+        if fmt == 'csv':
+            writer = csv.writer(target)
+            writer.writerow(CREATOR_FIELDS)
+            for row in synthetic_rows(count):
+                writer.writerow([LIST_SEPARATOR.join(row[f]) if isinstance(row[f], list) else row[f]
+                                 for f in CREATOR_FIELDS])
+        else:
+            for row in synthetic_rows(count):
+                target.write(json.dumps(row, ensure_ascii=False) + '\n')
+
+
+def run_import(path, fmt, batch_size, label):
+    with open(path, encoding='utf-8-sig', newline='') as source:
+        report = import_creators(source, fmt, batch_size=batch_size)
+    print(f"{label:<10}{report['imported']:>10}{report['failed']:>8}{report['elapsed_seconds']:>10.2f}"
+          f"{report['rows_per_sec']:>12.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--format', choices=['csv', 'ndjson'], default='csv')
+    parser.add_argument('--batch-size', type=int, default=CREATOR_IMPORT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        data_path = os.path.join(workdir, f"creators.{args.format}")
+        started = time.perf_counter()
+        write_file(data_path, args.format, args.rows)
+        print(f"\n生成 {args.rows} 行 {args.format}（{os.path.getsize(data_path) / 1e6:.1f} MB），"
+              f"耗时 {time.perf_counter() - started:.1f}s")
+
+        app = Flask(__name__)
+        app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+        db.init_app(app)
+        with app.app_context():
+            db.create_all()
+            print(f"{'阶段':<10}{'写入行数':>10}{'失败':>8}{'耗时(s)':>10}{'行/秒':>12}")
+            run_import(data_path, args.format, args.batch_size, "插入")
+            run_import(data_path, args.format, args.batch_size, "按id更新")
+
+            started = time.perf_counter()
+            size = sum(len(chunk) for chunk in iter_export(args.format))
+            elapsed = time.perf_counter() - started
+            print(f"导出 {args.rows} 行（{size / 1e6:.1f} M 字符），耗时 {elapsed:.2f}s，{args.rows / elapsed:.0f} 行/秒")
+            db.session.remove()
+            db.engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
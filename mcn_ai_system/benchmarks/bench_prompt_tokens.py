@@ -0,0 +1,89 @@
+# mcn_ai_system/benchmarks/bench_prompt_tokens.py
+"""
+匹配 Prompt 的 token 数对比：旧版 f-string 模板（带缩进与空行、字段不截断）与 PromptBuilder。
+token 数按 llm_backends.estimate_tokens 本地估算，用于比较相对成本。
+
+用法（在 mcn_ai_system 目录下）：
+    python benchmarks/bench_prompt_tokens.py [--long-fields 400] [--batch-size 5]
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.seed_data import MOCK_BRANDS, MOCK_CREATORS
+from src.services.llm_backends import estimate_tokens
+from src.services.prompt_builder import PromptBuilder
+
+
+def legacy_match_prompt(brand_info, creator_info):
+    """原 _match_single_creator 中的 Prompt（保留用于对比）"""
+    return f"""
+        请根据以下品牌信息和创作者信息，评估该创作者与品牌的匹配度，并给出匹配理由。
+        要求：
+        1. 匹配度：高/中/低
+        2. 匹配理由：详细说明匹配或不匹配的原因。
+        3. 如果匹配度为中或高，请给出1-2点合作建议。
+
+        品牌信息：
+        品牌名称：{brand_info.get('name', '未知品牌')}
+        品牌描述：{brand_info.get('description', '无描述')}
+        目标受众：{brand_info.get('target_audience', '不明确')}
+        主要产品/服务：{brand_info.get('products_services', '不明确')}
+
+        创作者信息：
+        创作者名称：{creator_info.get('name', '未知创作者')}
+        创作者领域/标签：{', '.join(creator_info.get('tags', [])) if creator_info.get('tags') else '无标签'}
+        创作者风格：{creator_info.get('style', '不明确')}
+        粉丝数量：{creator_info.get('followers', '不明确')}
+        过往合作案例：{creator_info.get('past_collaborations', '无')}
+
+        请按以下格式返回：
+        匹配度：[高/中/低]
+        匹配理由：[详细说明匹配原因]
+        合作建议：[如果匹配度为中或高，请给出1-2点建议，否则写无]
+        """
+
+
+def with_long_fields(info, length):
+    if not length:
+        return info
+    filler = "与多个知名品牌开展过直播带货、短视频种草和线下活动合作，" * (length // 28 + 1)
+    return {**info, "description": filler[:length], "past_collaborations": filler[:length]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--long-fields', type=int, default=400, help="把描述/过往合作扩展到的字符数，0 表示使用原始数据")
+    parser.add_argument('--batch-size', type=int, default=5)
+    args = parser.parse_args()
+
+    builder = PromptBuilder()
+    for long_fields in sorted({0, args.long_fields}):
+        brands = [with_long_fields(b, long_fields) for b in MOCK_BRANDS]
+        creators = [with_long_fields(c, long_fields) for c in MOCK_CREATORS]
+
+        legacy = [estimate_tokens(legacy_match_prompt(b, c)) for b in brands for c in creators]
+        compact = [builder.match_prompt(b, c) for b in brands for c in creators]
+        compact_tokens = [p.tokens for p in compact]
+        # 前缀缓存生效时，同一品牌只有第一次调用需要发送完整前缀
+        uncached = sum(p.tokens - p.prefix_tokens for p in compact) + sum(
+            builder.match_prompt(b, creators[0]).prefix_tokens for b in brands)
+        batches = [builder.batch_match_prompt(b, creators[i:i + args.batch_size],
+                                              [str(c['id']) for c in creators[i:i + args.batch_size]])
+                   for b in brands for i in range(0, len(creators), args.batch_size)]
+
+        print(f"字段长度: {'原始数据' if not long_fields else f'{long_fields} 字符'}，"
+              f"{len(brands)} 个品牌 × {len(creators)} 位创作者")
+        print(f"  旧版单个匹配      平均 {sum(legacy) / len(legacy):7.1f} tokens, 合计 {sum(legacy)}")
+        print(f"  紧凑单个匹配      平均 {sum(compact_tokens) / len(compact):7.1f} tokens, 合计 {sum(compact_tokens)} "
+              f"({sum(compact_tokens) / sum(legacy):.0%})")
+        print(f"  紧凑+前缀缓存     合计 {uncached} ({uncached / sum(legacy):.0%})")
+        print(f"  紧凑批量(每批{args.batch_size})  合计 {sum(p.tokens for p in batches)} "
+              f"({sum(p.tokens for p in batches) / sum(legacy):.0%})")
+    print(f"截断字段次数: {builder.stats()['truncated_fields']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+# mcn_ai_system/benchmarks/bench_semantic_index.py
+"""
+语义检索索引基准：合成 N 位创作者，测量索引构建耗时、内存映射加载耗时，
+以及 brute（精确）与 ivf（近似）两种模式的单次检索延迟和 ivf 的召回率（以 brute 结果为准）。
+
+用法（在 mcn_ai_system 目录下）：
+    python benchmarks/bench_semantic_index.py [--creators 50000] [--top-n 200] [--probes 4 8 16 32]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.seed_data import MOCK_BRANDS, MOCK_CREATORS
+from src.services.semantic_index import SemanticIndex, brand_document, creator_document
+
+EXTRA_TAGS = ['健身', '母婴', '汽车', '家居', '游戏', '音乐', '摄影', '教育', '财经', '户外']
+
+
+def synthetic_documents(count, seed=0):
+    rng = random.Random(seed)
+    tags = sorted({tag for creator in MOCK_CREATORS for tag in creator['tags']}) + EXTRA_TAGS
+    styles = [creator['style'] for creator in MOCK_CREATORS]
+    return {
+        creator_id: creator_document({
+            "category": rng.choice(tags),
+            "tags": rng.sample(tags, 3),
+            "style": rng.choice(styles),
+            "past_collaborations": f"品牌{rng.randint(1, 500)}"
+        })
+        for creator_id in range(1, count + 1)
+    }
+
+
+def recall(result, exact):
+    """按分数阈值计算召回率：分数不低于精确结果第 k 名的都算命中（避免同分时的排序差异）"""
+    if not exact:
+        return 1.0
+    threshold = exact[-1][1] - 1e-6
+    return sum(1 for _, score in result if score >= threshold) / len(exact)
+
+
+def timed_search(index, queries, top_n, mode, rounds):
+    results = [index.search(query, top_n, mode=mode) for query in queries]  # 预热
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for query in queries:
+            index.search(query, top_n, mode=mode)
+    return results, (time.perf_counter() - started) * 1000 / (rounds * len(queries))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--creators', type=int, default=50000)
+    parser.add_argument('--top-n', type=int, default=200)
+    parser.add_argument('--probes', type=int, nargs='+', default=[4, 8, 16, 32])
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+
+    documents = synthetic_documents(args.creators)
+    queries = [brand_document(brand) for brand in MOCK_BRANDS]
+
+    with tempfile.TemporaryDirectory() as index_dir:
+        started = time.perf_counter()
+        SemanticIndex(index_dir=index_dir, mode='ivf').build(documents)
+        build_seconds = time.perf_counter() - started
+
+        index = SemanticIndex(index_dir=index_dir, mode='ivf')
+        started = time.perf_counter()
+        index.build(documents)
+        load_seconds = time.perf_counter() - started
+
+        exact, brute_ms = timed_search(index, queries, args.top_n, 'brute', args.rounds)
+        print(f"\n创作者 {args.creators}，top_n {args.top_n}，查询 {len(queries)} 条")
+        print(f"构建索引：{build_seconds:.2f}s    内存映射加载：{load_seconds * 1000:.1f}ms")
+        print(f"{'模式':<12}{'单次检索(ms)':>14}{'平均召回率':>12}{'最低召回率':>12}")
+        print(f"{'brute':<12}{brute_ms:>14.2f}{1.0:>12.3f}{1.0:>12.3f}")
+        for probes in args.probes:
+            index.ivf_probes = probes
+            results, ivf_ms = timed_search(index, queries, args.top_n, 'ivf', args.rounds)
+            recalls = [recall(result, expected) for result, expected in zip(results, exact)]
+            print(f"{'ivf/' + str(probes):<12}{ivf_ms:>14.2f}{sum(recalls) / len(recalls):>12.3f}{min(recalls):>12.3f}")
+
+
+if __name__ == '__main__':
+    main()
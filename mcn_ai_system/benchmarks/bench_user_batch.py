@@ -0,0 +1,72 @@
+# mcn_ai_system/benchmarks/bench_user_batch.py
+"""
+用户批量接口基准：在临时 SQLite 数据库上对比逐个调用 POST /users（每个用户一次请求、一次提交）
+与一次调用 POST /users/batch 创建 N 个用户，以及批量更新、批量删除与分页读取全部用户的耗时。
+
+用法（在 mcn_ai_system 目录下）：
+    python benchmarks/bench_user_batch.py [--users 2000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+
+from src.models.user import db
+from src.routes.user import user_bp
+
+
+def timed(label, count, action):
+    started = time.perf_counter()
+    result = action()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<28}{elapsed * 1000:>12.1f}{count / elapsed:>14.0f}")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=2000)
+    args = parser.parse_args()
+    count = args.users
+
+    with tempfile.TemporaryDirectory() as workdir:
+        app = Flask(__name__)
+        app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+        app.register_blueprint(user_bp, url_prefix='/api')
+        db.init_app(app)
+        with app.app_context():
+            db.create_all()
+        client = app.test_client()
+
+        print(f"\n用户数 {count}")
+        print(f"{'操作':<28}{'耗时(ms)':>12}{'用户/秒':>14}")
+        timed("逐个 POST /users", count, lambda: [
+            client.post('/api/users', json={"username": f"single{i}", "email": f"single{i}@mcn.com"})
+            for i in range(count)])
+        response = timed("POST /users/batch", count, lambda: client.post('/api/users/batch', json=[
+            {"username": f"staff{i}", "email": f"staff{i}@mcn.com"} for i in range(count)]))
+        ids = [item["id"] for item in response.get_json()["data"]["results"]]
+        timed("PATCH /users/batch", count, lambda: client.patch('/api/users/batch', json=[
+            {"id": user_id, "email": f"new{user_id}@mcn.com"} for user_id in ids]))
+
+        def read_all():
+            url, rows = '/api/users?limit=500&fields=id,username', 0
+            while url:
+                page = client.get(url)
+                rows += len(page.get_json())
+                url = page.headers.get('Link', '').partition('<')[2].partition('>')[0] or None
+            return rows
+
+        timed("GET /users（游标分页读取全部）", count * 2, read_all)
+        timed("DELETE /users/batch", count, lambda: client.delete('/api/users/batch', json={"ids": ids}))
+        with app.app_context():
+            db.engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
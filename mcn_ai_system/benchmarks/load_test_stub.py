@@ -0,0 +1,95 @@
+# mcn_ai_system/benchmarks/load_test_stub.py
+"""
+离线压测：用确定性的桩后端驱动 AIModelService 的并发匹配、响应缓存和流式生成链路。
+相同的 --seed 与参数得到相同的结果，可用于对比不同并发/批量配置。
+
+用法（在 mcn_ai_system 目录下）：
+    python benchmarks/load_test_stub.py --creators 200 --latency lognormal:0.2,0.5 --error-rate 0.05
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.seed_data import MOCK_BRANDS, MOCK_CREATORS
+from src.services.ai_service import AIModelService
+from src.services.llm_backends import StubBackend
+
+
+def build_creators(count: int):
+    creators = []
+    for i in range(count):
+        base = MOCK_CREATORS[i % len(MOCK_CREATORS)]
+        creators.append({**base, "id": i + 1, "name": f"{base['name']}_{i + 1}"})
+    return creators
+
+
+def run_match(service, brand, creators, args):
+    started = time.perf_counter()
+    result = service.smart_match(brand, creators, max_concurrency=args.concurrency, timeout=args.timeout,
+                                 batch_size=args.batch_size, bypass_cache=True)
+    elapsed = time.perf_counter() - started
+    scores = [(r['id'], r['match_details']['match_score']) for r in result['match_result']]
+    failed = sum(1 for _, score in scores if score == "未知")
+    return elapsed, sorted(scores), failed
+
+
+def run_stream(service, topics):
+    started = time.perf_counter()
+    first_token, events = [], 0
+    for topic in topics:
+        call_started, seen_token = time.perf_counter(), False
+        for event, _ in service.generate_content_stream(topic, bypass_cache=True):
+            if event == 'token' and not seen_token:
+                first_token.append(time.perf_counter() - call_started)
+                seen_token = True
+            events += 1
+    return time.perf_counter() - started, first_token, events
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--creators', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--batch-size', type=int, default=1)
+    parser.add_argument('--timeout', type=float, default=5)
+    parser.add_argument('--topics', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--latency', default='lognormal:0.05,0.5')
+    parser.add_argument('--error-rate', type=float, default=0.02)
+    args = parser.parse_args()
+
+    brand = MOCK_BRANDS[0]
+    creators = build_creators(args.creators)
+    runs = []
+    for _ in range(2):
+        # 每轮使用新的服务与桩后端，验证相同种子下结果可复现
+        service = AIModelService(backend='stub')
+        service.model = StubBackend(seed=args.seed, latency=args.latency, error_rate=args.error_rate)
+        runs.append((service, run_match(service, brand, creators, args)))
+
+    (service, (elapsed, scores, failed)), (_, (_, scores_again, _)) = runs
+    print(f"智能匹配: {len(creators)} 位创作者, 并发 {args.concurrency}, 批量 {args.batch_size}")
+    print(f"  耗时 {elapsed:.2f}s, 吞吐 {len(creators) / elapsed:.1f} 位/s, 失败 {failed}, "
+          f"结果可复现: {scores == scores_again}")
+
+    topics = [f"压测主题{i}" for i in range(args.topics)]
+    elapsed, first_token, events = run_stream(service, topics)
+    first_token.sort()
+    print(f"流式生成: {len(topics)} 次, 耗时 {elapsed:.2f}s, 事件 {events} 个, "
+          f"首个片段延迟 p50={first_token[len(first_token) // 2] * 1000:.0f}ms "
+          f"p95={first_token[int(len(first_token) * 0.95) - 1] * 1000:.0f}ms" if first_token else "")
+
+    started = time.perf_counter()
+    for topic in topics:
+        service.generate_content(topic)
+        service.generate_content(topic)  # 第二次命中响应缓存
+    print(f"缓存链路: {len(topics) * 2} 次生成, 耗时 {time.perf_counter() - started:.2f}s, "
+          f"缓存统计 {service.response_cache.stats()}")
+    print(f"后端统计: {service.model.describe()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -3,11 +3,16 @@ import sys
 # DON'T CHANGE THIS !!!
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from flask import Flask, send_from_directory
+import click
+from flask import Flask, request
 from flask_cors import CORS
+from sqlalchemy import event
 from src.models.user import db
+from src.models.mcn import seed_mcn_data
+from src.models.job import upgrade_job_schema
 from src.routes.user import user_bp
-from src.routes.mcn_ai import mcn_ai_bp
+from src.routes.mcn_ai import mcn_ai_bp, job_manager
+from src.services.static_assets import StaticAssets, precompress
 
 from dotenv import load_dotenv
 import os
@@ -18,8 +23,8 @@ api_key = os.getenv("API_KEY")
 app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
 app.config['SECRET_KEY'] = 'asdf#FGSgvasgf$5$WGT'
 
-# 启用CORS
-CORS(app)
+# 启用CORS（暴露分页游标响应头，供前端读取下一页）
+CORS(app, expose_headers=['X-Next-Cursor', 'Link'])
 
 app.register_blueprint(user_bp, url_prefix='/api')
 app.register_blueprint(mcn_ai_bp, url_prefix='/api/mcn')
@@ -27,26 +32,69 @@ app.register_blueprint(mcn_ai_bp, url_prefix='/api/mcn')
 # uncomment if you need to use database
 app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(os.path.dirname(__file__), 'database', 'app.db')}"
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# 连接池：请求线程与AI任务线程共享连接池，pool_pre_ping 在取出连接时检查连接可用
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+    "pool_size": int(os.getenv('DB_POOL_SIZE', '10')),
+    "max_overflow": int(os.getenv('DB_MAX_OVERFLOW', '20')),
+    "pool_timeout": float(os.getenv('DB_POOL_TIMEOUT', '30')),
+    "pool_pre_ping": True
+}
+# 写锁被占用时等待的毫秒数，超过后才报 database is locked
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', '5000'))
+
+
+def configure_sqlite_connection(dbapi_connection, connection_record):
+    """
+    SQLite 并发访问设置：WAL 模式下读不阻塞写、写不阻塞读；synchronous=NORMAL 在 WAL 下不会损坏数据库，
+    只是断电时可能丢失最后提交的事务；busy_timeout 让并发写入排队等待而不是立即失败。
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.close()
+
+
 db.init_app(app)
 with app.app_context():
+    if db.engine.dialect.name == 'sqlite':
+        event.listen(db.engine, 'connect', configure_sqlite_connection)
     db.create_all()
+    upgrade_job_schema()
+    seed_mcn_data()
+# 绑定AI任务队列；任务只在提供服务的进程中执行（见 start_job_worker），
+# 导入本模块的命令行进程和重载器父进程不会执行或接管任务
+job_manager.init_app(app)
+
+# 静态资源清单（ETag、预压缩版本、缓存策略）在启动时生成，请求时不再访问文件系统检查文件是否存在
+static_assets = StaticAssets(app.static_folder).build()
+
+
+@app.cli.command('precompress-static')
+def precompress_static_command():
+    """为静态目录中的文本类文件生成 .gz / .br 预压缩版本（需重启服务生效）"""
+    written = precompress(app.static_folder)
+    for path in written:
+        click.echo(path)
+    click.echo(f"生成预压缩文件 {len(written)} 个")
+
+
+@app.before_request
+def start_job_worker():
+    """处理请求的进程才执行AI任务：首个请求时启动任务线程池（之后为空操作）"""
+    job_manager.start()
+
 
 @app.route('/', defaults={'path': ''})
 @app.route('/<path:path>')
 def serve(path):
-    static_folder_path = app.static_folder
-    if static_folder_path is None:
-            return "Static folder not configured", 404
-
-    if path != "" and os.path.exists(os.path.join(static_folder_path, path)):
-        return send_from_directory(static_folder_path, path)
-    else:
-        index_path = os.path.join(static_folder_path, 'index.html')
-        if os.path.exists(index_path):
-            return send_from_directory(static_folder_path, 'index.html')
-        else:
-            return "index.html not found", 404
+    if app.static_folder is None:
+        return "Static folder not configured", 404
+    return static_assets.serve(path, request)
 
 
 if __name__ == '__main__':
+    # 启用重载器时父进程只负责监视文件，由实际提供服务的子进程（WERKZEUG_RUN_MAIN=true）立即开始执行任务
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        job_manager.start()
     app.run(host='0.0.0.0', port=8000, debug=True)
@@ -0,0 +1,88 @@
+import uuid
+from datetime import datetime
+
+from src.models.user import db
+
+# 任务状态
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_COMPLETED = 'completed'
+JOB_FAILED = 'failed'
+JOB_CANCELLED = 'cancelled'
+JOB_FINISHED_STATUSES = (JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED)
+
+# 子项状态
+ITEM_PENDING = 'pending'
+ITEM_DONE = 'done'
+ITEM_FAILED = 'failed'
+
+
+class AIJob(db.Model):
+    """长耗时的AI任务（批量匹配、内容生成），持久化后进程重启可继续执行"""
+    __tablename__ = 'ai_jobs'
+
+    id = db.Column(db.String(36), primary_key=True, default=lambda: uuid.uuid4().hex)
+    job_type = db.Column(db.String(20), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default=JOB_QUEUED, index=True)
+    payload = db.Column(db.JSON, nullable=False, default=dict)
+    result = db.Column(db.JSON)
+    error = db.Column(db.Text)
+    total_items = db.Column(db.Integer, nullable=False, default=0)
+    completed_items = db.Column(db.Integer, nullable=False, default=0)
+    failed_items = db.Column(db.Integer, nullable=False, default=0)
+    # 负责执行的进程（主机名:进程号:随机后缀）及其租约到期时间；进程通过心跳续约，
+    # 租约过期的未完成任务才会被其他进程接管
+    owner = db.Column(db.String(120))
+    lease_expires_at = db.Column(db.DateTime, index=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    items = db.relationship('AIJobItem', backref='job', lazy='dynamic', cascade='all, delete-orphan')
+
+    def __repr__(self):
+        return f'<AIJob {self.id} {self.job_type} {self.status}>'
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'job_type': self.job_type,
+            'status': self.status,
+            'progress': {
+                'total': self.total_items,
+                'completed': self.completed_items,
+                'failed': self.failed_items
+            },
+            'error': self.error,
+            'owner': self.owner,
+            'created_at': self.created_at.isoformat(),
+            'updated_at': self.updated_at.isoformat()
+        }
+
+
+class AIJobItem(db.Model):
+    """任务中的单个子项，匹配任务中对应一位创作者"""
+    __tablename__ = 'ai_job_items'
+    __table_args__ = (
+        db.Index('ix_ai_job_items_job_status', 'job_id', 'status'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.String(36), db.ForeignKey('ai_jobs.id', ondelete='CASCADE'), nullable=False)
+    position = db.Column(db.Integer, nullable=False)
+    input = db.Column(db.JSON, nullable=False)
+    status = db.Column(db.String(20), nullable=False, default=ITEM_PENDING)
+    result = db.Column(db.JSON)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+
+
+def upgrade_job_schema():
+    """为旧版本创建的 ai_jobs 表补充 owner / lease_expires_at 列（db.create_all 不会修改已有的表），需在应用上下文中调用"""
+    columns = {column['name'] for column in db.inspect(db.engine).get_columns(AIJob.__tablename__)}
+    added = []
+    with db.engine.begin() as connection:
+        for column in (AIJob.__table__.c.owner, AIJob.__table__.c.lease_expires_at):
+            if column.name not in columns:
+                column_type = column.type.compile(dialect=db.engine.dialect)
+                connection.execute(db.text(f"ALTER TABLE {AIJob.__tablename__} ADD COLUMN {column.name} {column_type}"))
+                added.append(column.name)
+    if added:
+        print(f"[upgrade_job_schema] ai_jobs 表新增列: {', '.join(added)}")
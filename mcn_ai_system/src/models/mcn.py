@@ -0,0 +1,317 @@
+import threading
+from datetime import date
+
+from src.models.user import db
+from src.models.seed_data import MOCK_CREATORS, MOCK_BRANDS, MOCK_CAMPAIGNS
+
+# 合作活动状态：计划中 / 进行中 / 已完成 / 已取消
+CAMPAIGN_STATUSES = ('planned', 'active', 'completed', 'cancelled')
+
+
+class Creator(db.Model):
+    __tablename__ = 'creators'
+    __table_args__ = (
+        # 常见的组合筛选：按领域过滤后再按粉丝数范围过滤
+        db.Index('ix_creators_category_followers', 'category', 'followers'),
+        # 游标分页的稳定排序：(排序字段, id)
+        db.Index('ix_creators_followers_id', 'followers', 'id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(120), nullable=False)
+    category = db.Column(db.String(50), index=True)
+    followers = db.Column(db.Integer, nullable=False, default=0)
+    engagement_rate = db.Column(db.Float, default=0.0)
+    avg_views = db.Column(db.Integer, default=0)
+    potential_score = db.Column(db.Integer, default=0)
+    growth_trend = db.Column(db.String(20))
+    style = db.Column(db.String(120))
+    tags = db.Column(db.JSON, default=list)
+    past_collaborations = db.Column(db.Text)
+    platforms = db.relationship('CreatorPlatform', backref='creator', lazy='selectin',
+                                cascade='all, delete-orphan', order_by='CreatorPlatform.id')
+
+    def __repr__(self):
+        return f'<Creator {self.name}>'
+
+    def to_dict(self, fields=None):
+        """fields 为 None 时返回全部字段，否则只返回所选字段（未加载的列不会触发额外查询）"""
+        if fields is not None:
+            return {f: self._field_value(f) for f in fields}
+        return {
+            'id': self.id,
+            'name': self.name,
+            'category': self.category,
+            'followers': self.followers,
+            'engagement_rate': self.engagement_rate,
+            'avg_views': self.avg_views,
+            'potential_score': self.potential_score,
+            'growth_trend': self.growth_trend,
+            'platforms': [p.platform for p in self.platforms],
+            'style': self.style,
+            'tags': list(self.tags or []),
+            'past_collaborations': self.past_collaborations
+        }
+
+    def _field_value(self, field):
+        if field == 'platforms':
+            return [p.platform for p in self.platforms]
+        if field == 'tags':
+            return list(self.tags or [])
+        return getattr(self, field)
+
+
+def _null_as_zero(column):
+    """可为空字段的排序键 COALESCE(字段, 0)；0 以字面量写入 SQL，查询表达式才能与表达式索引完全一致"""
+    return db.func.coalesce(column, db.literal_column('0'))
+
+
+# 游标分页的稳定排序：(排序键, id)。potential_score / engagement_rate 可为空，
+# 按 COALESCE(字段, 0) 排序和比较，NULL 视为 0，不会在翻页时被跳过
+CREATOR_SORT_KEYS = {
+    "followers": Creator.followers,
+    "potential_score": _null_as_zero(Creator.potential_score),
+    "engagement_rate": _null_as_zero(Creator.engagement_rate)
+}
+db.Index('ix_creators_potential_score_id', _null_as_zero(Creator.potential_score), Creator.id)
+db.Index('ix_creators_engagement_rate_id', _null_as_zero(Creator.engagement_rate), Creator.id)
+
+
+class DataVersion(db.Model):
+    """
+    派生数据的跨进程版本号：批量写入（如命令行导入）提交后递增。
+    每个进程记录上次看到的版本，发现变化时丢弃本进程的派生数据（见 sync_creators_version）
+    """
+    __tablename__ = 'data_versions'
+
+    kind = db.Column(db.String(20), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+
+class CreatorPlatform(db.Model):
+    """创作者与平台的从属关系，一位创作者可以在多个平台有账号"""
+    __tablename__ = 'creator_platforms'
+    __table_args__ = (
+        db.UniqueConstraint('creator_id', 'platform_key', name='uq_creator_platform'),
+        db.Index('ix_creator_platforms_platform_key', 'platform_key', 'creator_id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    creator_id = db.Column(db.Integer, db.ForeignKey('creators.id', ondelete='CASCADE'), nullable=False)
+    platform = db.Column(db.String(50), nullable=False)
+    # 小写后的平台名，用于不区分大小写的索引查询（如 "B站" / "b站"）
+    platform_key = db.Column(db.String(50), nullable=False)
+
+    def __init__(self, platform, **kwargs):
+        super().__init__(platform=platform, platform_key=normalize_platform(platform), **kwargs)
+
+
+class Brand(db.Model):
+    __tablename__ = 'brands'
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(120), nullable=False)
+    category = db.Column(db.String(50), index=True)
+    description = db.Column(db.Text)
+    budget = db.Column(db.Integer, default=0)
+    target_audience = db.Column(db.Text)
+    campaign_type = db.Column(db.String(50))
+    products_services = db.Column(db.Text)
+    requirements = db.Column(db.Text)
+
+    def __repr__(self):
+        return f'<Brand {self.name}>'
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'name': self.name,
+            'category': self.category,
+            'description': self.description,
+            'budget': self.budget,
+            'target_audience': self.target_audience,
+            'campaign_type': self.campaign_type,
+            'products_services': self.products_services,
+            'requirements': self.requirements
+        }
+
+
+class Campaign(db.Model):
+    """品牌与创作者的合作活动"""
+    __tablename__ = 'campaigns'
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(120), nullable=False)
+    brand_id = db.Column(db.Integer, db.ForeignKey('brands.id', ondelete='CASCADE'), nullable=False, index=True)
+    creator_id = db.Column(db.Integer, db.ForeignKey('creators.id', ondelete='SET NULL'), index=True)
+    platform = db.Column(db.String(50))
+    status = db.Column(db.String(20), nullable=False, default='planned', index=True)
+    budget = db.Column(db.Integer, default=0)
+    revenue = db.Column(db.Integer, default=0)
+    start_date = db.Column(db.Date)
+    end_date = db.Column(db.Date)
+
+    def __repr__(self):
+        return f'<Campaign {self.name}>'
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'name': self.name,
+            'brand_id': self.brand_id,
+            'creator_id': self.creator_id,
+            'platform': self.platform,
+            'status': self.status,
+            'budget': self.budget,
+            'revenue': self.revenue,
+            'start_date': self.start_date.isoformat() if self.start_date else None,
+            'end_date': self.end_date.isoformat() if self.end_date else None
+        }
+
+
+def normalize_platform(platform: str) -> str:
+    return (platform or '').strip().lower()
+
+
+# 数据变更的订阅者（总数缓存、倒排索引、仪表板汇总等派生数据），按数据类型分组
+_change_listeners = {'creators': [], 'brands': [], 'campaigns': []}
+
+
+def _notify(kind, upserted_ids, removed_ids):
+    for callback in list(_change_listeners[kind]):
+        callback(list(upserted_ids), list(removed_ids))
+
+
+def on_creators_changed(callback):
+    """注册创作者变更回调，callback(upserted_ids, removed_ids)"""
+    _change_listeners['creators'].append(callback)
+    return callback
+
+
+def notify_creators_changed(upserted_ids=(), removed_ids=()):
+    """在创作者写入提交后调用，通知所有订阅者刷新派生数据"""
+    _notify('creators', upserted_ids, removed_ids)
+
+
+# 批量写入（如导入）后派生数据整体失效的订阅者：逐条增量维护的代价与写入行数成正比，
+# 批量写入后直接丢弃派生数据，下次使用时重新构建
+_reset_listeners = {'creators': []}
+
+
+def on_creators_reset(callback):
+    """注册创作者整体失效回调 callback()"""
+    _reset_listeners['creators'].append(callback)
+    return callback
+
+
+def notify_creators_reset():
+    """在批量写入创作者并提交后调用，代替逐条的 notify_creators_changed"""
+    for callback in list(_reset_listeners['creators']):
+        callback()
+
+
+# 本进程上次看到的数据版本，kind -> 版本号
+_seen_versions = {}
+_seen_versions_lock = threading.Lock()
+
+
+def _data_version(kind):
+    return db.session.scalar(db.select(DataVersion.version).where(DataVersion.kind == kind)) or 0
+
+
+def bump_creators_version():
+    """
+    递增创作者数据版本并提交，在批量写入提交后调用，使其他进程丢弃各自的派生数据。
+    本进程的派生数据由调用方通过 notify_creators_changed / notify_creators_reset 维护，
+    因此本进程只在没有错过其他进程的写入时把新版本记为已看到。
+    """
+    kind = 'creators'
+    updated = db.session.execute(db.update(DataVersion).where(DataVersion.kind == kind)
+                                 .values(version=DataVersion.version + 1)).rowcount
+    if not updated:
+        db.session.add(DataVersion(kind=kind, version=1))
+    db.session.commit()
+    version = _data_version(kind)
+    with _seen_versions_lock:
+        if _seen_versions.get(kind) == version - 1:
+            _seen_versions[kind] = version
+
+
+def sync_creators_version():
+    """
+    读取数据库中的创作者数据版本，与本进程上次看到的不同（其他进程批量写入过）时调用 notify_creators_reset。
+    每个请求处理前调用一次，代价为一次主键查询；需在应用上下文中调用。
+    """
+    kind = 'creators'
+    version = _data_version(kind)
+    with _seen_versions_lock:
+        seen = _seen_versions.get(kind)
+        _seen_versions[kind] = version
+    if seen is not None and seen != version:
+        print(f"[sync_creators_version] 创作者数据版本 {seen} -> {version}，丢弃本进程的派生数据")
+        notify_creators_reset()
+
+
+def on_brands_changed(callback):
+    """注册品牌变更回调，callback(upserted_ids, removed_ids)"""
+    _change_listeners['brands'].append(callback)
+    return callback
+
+
+def notify_brands_changed(upserted_ids=(), removed_ids=()):
+    """在品牌写入提交后调用"""
+    _notify('brands', upserted_ids, removed_ids)
+
+
+def on_campaigns_changed(callback):
+    """注册合作活动变更回调，callback(upserted_ids, removed_ids)"""
+    _change_listeners['campaigns'].append(callback)
+    return callback
+
+
+def notify_campaigns_changed(upserted_ids=(), removed_ids=()):
+    """在合作活动写入提交后调用"""
+    _notify('campaigns', upserted_ids, removed_ids)
+
+
+def creator_from_dict(data):
+    """根据与 to_dict 相同结构的字典创建 Creator（含平台关系）"""
+    fields = {k: v for k, v in data.items() if k != 'platforms'}
+    creator = Creator(**fields)
+    creator.platforms = [CreatorPlatform(platform=p) for p in data.get('platforms', [])]
+    return creator
+
+
+def campaign_from_dict(data):
+    """根据与 to_dict 相同结构的字典创建 Campaign，日期为 YYYY-MM-DD 字符串"""
+    fields = dict(data)
+    for key in ('start_date', 'end_date'):
+        if isinstance(fields.get(key), str):
+            fields[key] = date.fromisoformat(fields[key])
+    return Campaign(**fields)
+
+
+def seed_mcn_data():
+    """数据库中没有创作者、品牌或合作活动时写入演示数据，需在应用上下文中调用"""
+    seeded_creators, seeded_brands, seeded_campaigns = [], [], []
+    if db.session.query(Creator.id).first() is None:
+        seeded_creators = [creator_from_dict(c) for c in MOCK_CREATORS]
+        db.session.add_all(seeded_creators)
+    if db.session.query(Brand.id).first() is None:
+        seeded_brands = [Brand(**b) for b in MOCK_BRANDS]
+        db.session.add_all(seeded_brands)
+    if db.session.query(Campaign.id).first() is None:
+        # 只写入引用的品牌和创作者都存在的活动（已有数据库中的演示数据可能被修改过）
+        db.session.flush()
+        brand_ids = set(db.session.scalars(db.select(Brand.id)))
+        creator_ids = set(db.session.scalars(db.select(Creator.id)))
+        seeded_campaigns = [campaign_from_dict(c) for c in MOCK_CAMPAIGNS
+                            if c['brand_id'] in brand_ids and c['creator_id'] in creator_ids]
+        db.session.add_all(seeded_campaigns)
+    db.session.commit()
+    if seeded_creators:
+        notify_creators_changed(upserted_ids=[c.id for c in seeded_creators])
+    if seeded_brands:
+        notify_brands_changed(upserted_ids=[b.id for b in seeded_brands])
+    if seeded_campaigns:
+        notify_campaigns_changed(upserted_ids=[c.id for c in seeded_campaigns])
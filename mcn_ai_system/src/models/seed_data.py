@@ -0,0 +1,220 @@
+# mcn_ai_system/src/models/seed_data.py
+# 演示用的初始数据：数据库中没有创作者/品牌时，启动时写入数据库
+
+# 扩展后的 MOCK_CREATORS 列表，保持不变
+MOCK_CREATORS = [
+    {
+        "id": 1,
+        "name": "小美美妆",
+        "category": "美妆",
+        "followers": 125000,
+        "engagement_rate": 8.5,  # 这个字段在前端显示时将被“粉丝契合度”替换
+        "avg_views": 45000,
+        "potential_score": 92,
+        "growth_trend": "上升",
+        "platforms": ["抖音", "小红书", "B站"],
+        "style": "活泼、时尚",
+        "tags": ["美妆", "护肤", "时尚穿搭"],
+        "past_collaborations": "品牌A、品牌B"
+    },
+    {
+        "id": 2,
+        "name": "科技小王",
+        "category": "科技",
+        "followers": 89000,
+        "engagement_rate": 12.3,
+        "avg_views": 78000,
+        "potential_score": 88,
+        "growth_trend": "稳定",
+        "platforms": ["B站", "抖音"],
+        "style": "专业、深度",
+        "tags": ["科技", "数码", "测评"],
+        "past_collaborations": "品牌C、品牌D"
+    },
+    {
+        "id": 3,
+        "name": "美食达人",
+        "category": "美食",
+        "followers": 156000,
+        "engagement_rate": 6.8,
+        "avg_views": 32000,
+        "potential_score": 75,
+        "growth_trend": "下降",
+        "platforms": ["抖音", "快手", "小红书"],
+        "style": "亲和、实用",
+        "tags": ["美食", "探店", "家常菜"],
+        "past_collaborations": "品牌E、品牌F"
+    },
+    {
+        "id": 4,
+        "name": "旅行家张",
+        "category": "旅行",
+        "followers": 230000,
+        "engagement_rate": 9.1,
+        "avg_views": 60000,
+        "potential_score": 95,
+        "growth_trend": "上升",
+        "platforms": ["小红书", "B站", "微博"],
+        "style": "治愈、风景",
+        "tags": ["旅行", "户外", "vlog", "攻略"],
+        "past_collaborations": "航空公司X、酒店集团Y"
+    },
+    {
+        "id": 5,
+        "name": "健康生活家",
+        "category": "健康",
+        "followers": 75000,
+        "engagement_rate": 10.5,
+        "avg_views": 38000,
+        "potential_score": 80,
+        "growth_trend": "稳定",
+        "platforms": ["抖音", "小红书"],
+        "style": "专业、实用",
+        "tags": ["健身", "营养", "瑜伽", "健康饮食"],
+        "past_collaborations": "健身房A、保健品B"
+    },
+    {
+        "id": 6,
+        "name": "时尚穿搭姐",
+        "category": "时尚",
+        "followers": 180000,
+        "engagement_rate": 7.2,
+        "avg_views": 55000,
+        "potential_score": 90,
+        "growth_trend": "上升",
+        "platforms": ["抖音", "小红书"],
+        "style": "高级、简约",
+        "tags": ["穿搭", "时尚", "ootd", "奢侈品"],
+        "past_collaborations": "品牌D、品牌E"
+    },
+    {
+        "id": 7,
+        "name": "萌宠乐园",
+        "category": "萌宠",
+        "followers": 95000,
+        "engagement_rate": 15.0,
+        "avg_views": 85000,
+        "potential_score": 85,
+        "growth_trend": "稳定",
+        "platforms": ["抖音", "快手"],
+        "style": "可爱、有趣",
+        "tags": ["萌宠", "猫咪", "狗狗", "宠物用品"],
+        "past_collaborations": "宠物粮品牌F、宠物玩具G"
+    },
+    {
+        "id": 8,
+        "name": "二次元动漫宅",
+        "category": "动漫",
+        "followers": 60000,
+        "engagement_rate": 11.0,
+        "avg_views": 40000,
+        "potential_score": 70,
+        "growth_trend": "稳定",
+        "platforms": ["B站", "微博"],
+        "style": "幽默、热血",
+        "tags": ["动漫", "游戏", "二次元", "手办"],
+        "past_collaborations": "游戏公司H、动漫周边I"
+    }
+]
+
+# 扩展后的 MOCK_BRANDS 列表，保持不变
+MOCK_BRANDS = [
+    {
+        "id": 1,
+        "name": "时尚品牌A",
+        "category": "时尚",
+        "description": "专注于年轻潮流服饰。",
+        "budget": 500000,
+        "target_audience": "18-35岁女性，追求时尚与个性",
+        "campaign_type": "品牌推广",
+        "products_services": "时尚服饰、潮流配饰",
+        "requirements": "粉丝量10万+，互动率5%+，时尚穿搭类创作者"
+    },
+    {
+        "id": 2,
+        "name": "科技公司B",
+        "category": "科技",
+        "description": "领先的智能硬件和软件解决方案提供商。",
+        "budget": 800000,
+        "target_audience": "25-40岁男性，关注前沿科技",
+        "campaign_type": "产品发布",
+        "products_services": "智能手机、笔记本电脑、智能家居",
+        "requirements": "科技垂直领域，粉丝量5万+，能进行专业评测和深度解读"
+    },
+    {
+        "id": 3,
+        "name": "美妆品牌C",
+        "category": "美妆",
+        "description": "提供高端护肤品和彩妆产品。",
+        "budget": 600000,
+        "target_audience": "20-45岁女性，注重护肤和彩妆品质",
+        "campaign_type": "新品上市",
+        "products_services": "精华液、口红、粉底",
+        "requirements": "美妆垂类，粉丝量8万+，内容精致，有产品深度评测能力"
+    },
+    {
+        "id": 4,
+        "name": "旅游服务商D",
+        "category": "旅行",
+        "description": "专注于全球特色旅行线路和定制服务。",
+        "budget": 400000,
+        "target_audience": "25-50岁，热爱旅行，追求独特体验的人群",
+        "campaign_type": "目的地推广",
+        "products_services": "欧洲游、海岛度假、定制小团",
+        "requirements": "旅行博主，粉丝量15万+，vlog制作精良，善于分享旅行体验"
+    },
+    {
+        "id": 5,
+        "name": "宠物用品E",
+        "category": "萌宠",
+        "description": "生产高品质宠物食品和玩具。",
+        "budget": 300000,
+        "target_audience": "养猫狗的年轻家庭，关注宠物健康和生活品质",
+        "campaign_type": "品牌曝光",
+        "products_services": "猫粮、狗粮、智能喂食器、宠物玩具",
+        "requirements": "萌宠博主，粉丝量5万+，内容有趣，善于与宠物互动"
+    },
+    {
+        "id": 6,
+        "name": "健康食品F",
+        "category": "健康",
+        "description": "提供天然有机健康食品。",
+        "budget": 350000,
+        "target_audience": "关注健康、健身、有机生活的人群",
+        "campaign_type": "产品试用",
+        "products_services": "蛋白粉、坚果、燕麦片",
+        "requirements": "健康/健身博主，粉丝量6万+，分享健康食谱或健身日常"
+    }
+]
+
+# 演示用的合作活动：budget 为投放预算（元），revenue 为已产生的带货/转化收入（元），计划中的活动收入为 0
+MOCK_CAMPAIGNS = [
+    {"id": 1, "name": "春季新品穿搭挑战", "brand_id": 1, "creator_id": 6, "platform": "抖音", "status": "completed",
+     "budget": 80000, "revenue": 352000, "start_date": "2025-03-01", "end_date": "2025-03-31"},
+    {"id": 2, "name": "夏日通勤穿搭", "brand_id": 1, "creator_id": 1, "platform": "小红书", "status": "active",
+     "budget": 60000, "revenue": 198000, "start_date": "2025-06-01", "end_date": "2025-08-31"},
+    {"id": 3, "name": "旗舰手机深度测评", "brand_id": 2, "creator_id": 2, "platform": "B站", "status": "completed",
+     "budget": 150000, "revenue": 690000, "start_date": "2025-04-10", "end_date": "2025-05-10"},
+    {"id": 4, "name": "智能手表开箱", "brand_id": 2, "creator_id": 2, "platform": "抖音", "status": "active",
+     "budget": 90000, "revenue": 243000, "start_date": "2025-07-01", "end_date": "2025-09-30"},
+    {"id": 5, "name": "二次元联名周边", "brand_id": 2, "creator_id": 8, "platform": "B站", "status": "planned",
+     "budget": 70000, "revenue": 0, "start_date": "2025-10-01", "end_date": "2025-11-15"},
+    {"id": 6, "name": "精华液28天打卡", "brand_id": 3, "creator_id": 1, "platform": "抖音", "status": "completed",
+     "budget": 120000, "revenue": 564000, "start_date": "2025-02-15", "end_date": "2025-03-15"},
+    {"id": 7, "name": "新品口红试色", "brand_id": 3, "creator_id": 6, "platform": "小红书", "status": "active",
+     "budget": 70000, "revenue": 266000, "start_date": "2025-06-15", "end_date": "2025-09-15"},
+    {"id": 8, "name": "海岛度假vlog", "brand_id": 4, "creator_id": 4, "platform": "小红书", "status": "completed",
+     "budget": 100000, "revenue": 380000, "start_date": "2025-05-01", "end_date": "2025-06-15"},
+    {"id": 9, "name": "欧洲小团游直播", "brand_id": 4, "creator_id": 4, "platform": "B站", "status": "active",
+     "budget": 85000, "revenue": 170000, "start_date": "2025-07-15", "end_date": "2025-10-15"},
+    {"id": 10, "name": "智能喂食器种草", "brand_id": 5, "creator_id": 7, "platform": "抖音", "status": "active",
+     "budget": 50000, "revenue": 215000, "start_date": "2025-06-20", "end_date": "2025-09-20"},
+    {"id": 11, "name": "猫粮口味盲测", "brand_id": 5, "creator_id": 7, "platform": "快手", "status": "completed",
+     "budget": 40000, "revenue": 176000, "start_date": "2025-04-01", "end_date": "2025-04-30"},
+    {"id": 12, "name": "健身餐一周食谱", "brand_id": 6, "creator_id": 5, "platform": "抖音", "status": "active",
+     "budget": 60000, "revenue": 228000, "start_date": "2025-07-01", "end_date": "2025-09-30"},
+    {"id": 13, "name": "燕麦早餐挑战", "brand_id": 6, "creator_id": 3, "platform": "快手", "status": "planned",
+     "budget": 45000, "revenue": 0, "start_date": "2025-10-10", "end_date": "2025-11-10"},
+    {"id": 14, "name": "家常菜健康改造", "brand_id": 6, "creator_id": 3, "platform": "抖音", "status": "cancelled",
+     "budget": 30000, "revenue": 0, "start_date": "2025-03-01", "end_date": "2025-03-31"},
+]
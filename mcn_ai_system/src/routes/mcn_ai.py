@@ -1,9 +1,31 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from flask_cors import cross_origin
-from src.services.ai_service import AIModelService
+from src.services.ai_service import (
+    AIModelService, MAX_MATCH_CONCURRENCY, MAX_MATCH_TIMEOUT, MAX_MATCH_BATCH_SIZE
+)
+from src.services.model_resolver import STATE_READY, STATE_UNRESOLVED, STATE_RESOLVING
+from src.services.candidate_ranker import rank_candidates
+from src.models.user import db
+from src.models.mcn import Creator, Brand, sync_creators_version
+from src.services.creator_catalog import (
+    build_creator_query, paginate_creators, parse_fields, count_creators, search_creators, semantic_candidates,
+    creator_semantic_index, DEFAULT_PAGE_SIZE
+)
+from src.services.creator_index import FACETS
+from src.services.job_queue import JobManager
+from src.services.creator_analytics import CreatorAnalytics
+from src.services.dashboard_summary import dashboard_summary
+from src.services.creator_io import (
+    detect_format, import_creators, iter_export, EXPORT_MIMETYPES, CREATOR_IMPORT_BATCH_SIZE
+)
+from src.models.job import JOB_FINISHED_STATUSES
+import click
+import io
 import json
 import random
 import os
+import sys
+import time
 from datetime import datetime, timedelta
 
 mcn_ai_bp = Blueprint('mcn_ai', __name__)
@@ -11,246 +33,164 @@ mcn_ai_bp = Blueprint('mcn_ai', __name__)
 # 初始化AI服务
 # 在生产环境中，应该从环境变量读取API密钥
 ai_service = AIModelService(api_key=os.getenv('GEMINI_API_KEY'))
+# 长耗时AI任务队列，需在 main.py 中调用 job_manager.init_app(app)，提供服务的进程再调用 job_manager.start()
+job_manager = JobManager(ai_service)
+# 创作者数据分析（列式时间序列，固定种子生成演示数据）
+creator_analytics = CreatorAnalytics()
+
+# 智能匹配前本地预排序保留的创作者数量，0 表示不做预排序
+DEFAULT_MATCH_TOP_K = int(os.getenv('AI_MATCH_TOP_K', '50'))
+# 创作者数量超过该值时，先用语义索引召回最接近品牌的创作者再做本地预排序，0 表示不召回
+DEFAULT_SEMANTIC_TOP_N = int(os.getenv('AI_SEMANTIC_TOP_N', '200'))
+# 批量风险检测单次请求允许的最大内容条数
+RISK_BATCH_MAX_ITEMS = int(os.getenv('RISK_BATCH_MAX_ITEMS', '5000'))
+
+# /ai/status 中模型解析状态的展示文案，其余状态（未配置、解析失败）均显示为使用模拟数据
+MODEL_STATUS_LABELS = {
+    STATE_READY: "运行中",
+    STATE_UNRESOLVED: "待初始化",
+    STATE_RESOLVING: "初始化中"
+}
 
-# 模拟数据
-# 扩展后的 MOCK_CREATORS 列表，保持不变
-MOCK_CREATORS = [
-    {
-        "id": 1,
-        "name": "小美美妆",
-        "category": "美妆",
-        "followers": 125000,
-        "engagement_rate": 8.5,  # 这个字段在前端显示时将被“粉丝契合度”替换
-        "avg_views": 45000,
-        "potential_score": 92,
-        "growth_trend": "上升",
-        "platforms": ["抖音", "小红书", "B站"],
-        "style": "活泼、时尚",
-        "tags": ["美妆", "护肤", "时尚穿搭"],
-        "past_collaborations": "品牌A、品牌B"
-    },
-    {
-        "id": 2,
-        "name": "科技小王",
-        "category": "科技",
-        "followers": 89000,
-        "engagement_rate": 12.3,
-        "avg_views": 78000,
-        "potential_score": 88,
-        "growth_trend": "稳定",
-        "platforms": ["B站", "抖音"],
-        "style": "专业、深度",
-        "tags": ["科技", "数码", "测评"],
-        "past_collaborations": "品牌C、品牌D"
-    },
-    {
-        "id": 3,
-        "name": "美食达人",
-        "category": "美食",
-        "followers": 156000,
-        "engagement_rate": 6.8,
-        "avg_views": 32000,
-        "potential_score": 75,
-        "growth_trend": "下降",
-        "platforms": ["抖音", "快手", "小红书"],
-        "style": "亲和、实用",
-        "tags": ["美食", "探店", "家常菜"],
-        "past_collaborations": "品牌E、品牌F"
-    },
-    {
-        "id": 4,
-        "name": "旅行家张",
-        "category": "旅行",
-        "followers": 230000,
-        "engagement_rate": 9.1,
-        "avg_views": 60000,
-        "potential_score": 95,
-        "growth_trend": "上升",
-        "platforms": ["小红书", "B站", "微博"],
-        "style": "治愈、风景",
-        "tags": ["旅行", "户外", "vlog", "攻略"],
-        "past_collaborations": "航空公司X、酒店集团Y"
-    },
-    {
-        "id": 5,
-        "name": "健康生活家",
-        "category": "健康",
-        "followers": 75000,
-        "engagement_rate": 10.5,
-        "avg_views": 38000,
-        "potential_score": 80,
-        "growth_trend": "稳定",
-        "platforms": ["抖音", "小红书"],
-        "style": "专业、实用",
-        "tags": ["健身", "营养", "瑜伽", "健康饮食"],
-        "past_collaborations": "健身房A、保健品B"
-    },
-    {
-        "id": 6,
-        "name": "时尚穿搭姐",
-        "category": "时尚",
-        "followers": 180000,
-        "engagement_rate": 7.2,
-        "avg_views": 55000,
-        "potential_score": 90,
-        "growth_trend": "上升",
-        "platforms": ["抖音", "小红书"],
-        "style": "高级、简约",
-        "tags": ["穿搭", "时尚", "ootd", "奢侈品"],
-        "past_collaborations": "品牌D、品牌E"
-    },
-    {
-        "id": 7,
-        "name": "萌宠乐园",
-        "category": "萌宠",
-        "followers": 95000,
-        "engagement_rate": 15.0,
-        "avg_views": 85000,
-        "potential_score": 85,
-        "growth_trend": "稳定",
-        "platforms": ["抖音", "快手"],
-        "style": "可爱、有趣",
-        "tags": ["萌宠", "猫咪", "狗狗", "宠物用品"],
-        "past_collaborations": "宠物粮品牌F、宠物玩具G"
-    },
-    {
-        "id": 8,
-        "name": "二次元动漫宅",
-        "category": "动漫",
-        "followers": 60000,
-        "engagement_rate": 11.0,
-        "avg_views": 40000,
-        "potential_score": 70,
-        "growth_trend": "稳定",
-        "platforms": ["B站", "微博"],
-        "style": "幽默、热血",
-        "tags": ["动漫", "游戏", "二次元", "手办"],
-        "past_collaborations": "游戏公司H、动漫周边I"
-    }
-]
-
-# 扩展后的 MOCK_BRANDS 列表，保持不变
-MOCK_BRANDS = [
-    {
-        "id": 1,
-        "name": "时尚品牌A",
-        "category": "时尚",
-        "description": "专注于年轻潮流服饰。",
-        "budget": 500000,
-        "target_audience": "18-35岁女性，追求时尚与个性",
-        "campaign_type": "品牌推广",
-        "products_services": "时尚服饰、潮流配饰",
-        "requirements": "粉丝量10万+，互动率5%+，时尚穿搭类创作者"
-    },
-    {
-        "id": 2,
-        "name": "科技公司B",
-        "category": "科技",
-        "description": "领先的智能硬件和软件解决方案提供商。",
-        "budget": 800000,
-        "target_audience": "25-40岁男性，关注前沿科技",
-        "campaign_type": "产品发布",
-        "products_services": "智能手机、笔记本电脑、智能家居",
-        "requirements": "科技垂直领域，粉丝量5万+，能进行专业评测和深度解读"
-    },
-    {
-        "id": 3,
-        "name": "美妆品牌C",
-        "category": "美妆",
-        "description": "提供高端护肤品和彩妆产品。",
-        "budget": 600000,
-        "target_audience": "20-45岁女性，注重护肤和彩妆品质",
-        "campaign_type": "新品上市",
-        "products_services": "精华液、口红、粉底",
-        "requirements": "美妆垂类，粉丝量8万+，内容精致，有产品深度评测能力"
-    },
-    {
-        "id": 4,
-        "name": "旅游服务商D",
-        "category": "旅行",
-        "description": "专注于全球特色旅行线路和定制服务。",
-        "budget": 400000,
-        "target_audience": "25-50岁，热爱旅行，追求独特体验的人群",
-        "campaign_type": "目的地推广",
-        "products_services": "欧洲游、海岛度假、定制小团",
-        "requirements": "旅行博主，粉丝量15万+，vlog制作精良，善于分享旅行体验"
-    },
-    {
-        "id": 5,
-        "name": "宠物用品E",
-        "category": "萌宠",
-        "description": "生产高品质宠物食品和玩具。",
-        "budget": 300000,
-        "target_audience": "养猫狗的年轻家庭，关注宠物健康和生活品质",
-        "campaign_type": "品牌曝光",
-        "products_services": "猫粮、狗粮、智能喂食器、宠物玩具",
-        "requirements": "萌宠博主，粉丝量5万+，内容有趣，善于与宠物互动"
-    },
-    {
-        "id": 6,
-        "name": "健康食品F",
-        "category": "健康",
-        "description": "提供天然有机健康食品。",
-        "budget": 350000,
-        "target_audience": "关注健康、健身、有机生活的人群",
-        "campaign_type": "产品试用",
-        "products_services": "蛋白粉、坚果、燕麦片",
-        "requirements": "健康/健身博主，粉丝量6万+，分享健康食谱或健身日常"
-    }
-]
+
+@mcn_ai_bp.before_request
+def sync_derived_data():
+    """其他进程（如命令行导入）批量写入创作者后，丢弃本进程的总数缓存、倒排索引、语义索引和仪表板汇总"""
+    sync_creators_version()
 
 
 @mcn_ai_bp.route('/creators', methods=['GET'])
 @cross_origin()
 def get_creators():
-    """获取创作者列表"""
+    """
+    获取创作者列表（游标分页）
+    sort: followers / potential_score / engagement_rate，order: desc / asc，
+    cursor 为上一页返回的 next_cursor，fields 为逗号分隔的返回字段
+    """
     category = request.args.get('category', '')
     min_followers = request.args.get('min_followers', 0, type=int)
+    platform = request.args.get('platform', '')
 
-    filtered_creators = MOCK_CREATORS
-    if category:
-        filtered_creators = [c for c in filtered_creators if c['category'] == category]
-    if min_followers:
-        filtered_creators = [c for c in filtered_creators if c['followers'] >= min_followers]
+    try:
+        page = paginate_creators(
+            category=category,
+            min_followers=min_followers,
+            platform=platform,
+            sort=request.args.get('sort', 'followers'),
+            order=request.args.get('order', 'desc'),
+            limit=request.args.get('limit', DEFAULT_PAGE_SIZE, type=int),
+            cursor=request.args.get('cursor') or None,
+            fields=parse_fields(request.args.get('fields', ''))
+        )
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+
+    return jsonify({"success": True, **page})
+
+
+@mcn_ai_bp.route('/creators/search', methods=['GET'])
+@cross_origin()
+def search_creators_by_facets():
+    """
+    创作者分面搜索（倒排索引，不扫描全表）
+    分面参数 tags / platforms / category / style 均为逗号分隔的取值；
+    mode=or 时同一分面内任一取值命中即可，mode=and 时需全部命中；不同分面之间取交集。
+    返回当前页创作者、命中总数以及结果集上的各分面计数。
+    """
+    filters = {}
+    for facet in FACETS:
+        raw = request.args.get(facet, '')
+        values = [v.strip() for v in raw.split(',') if v.strip()]
+        if values:
+            filters[facet] = values
 
-    return jsonify({
-        "success": True,
-        "data": filtered_creators,
-        "total": len(filtered_creators)
-    })
+    try:
+        result = search_creators(
+            filters,
+            mode=request.args.get('mode', 'or'),
+            limit=request.args.get('limit', DEFAULT_PAGE_SIZE, type=int),
+            offset=request.args.get('offset', 0, type=int),
+            facet_limit=request.args.get('facet_limit', 20, type=int),
+            fields=parse_fields(request.args.get('fields', ''))
+        )
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+
+    return jsonify({"success": True, **result})
+
+
+@mcn_ai_bp.route('/creators/import', methods=['POST'])
+@cross_origin()
+def import_creators_bulk():
+    """
+    批量导入创作者（CSV / NDJSON，流式解析，分批事务写入）
+    文件可作为 multipart 的 file 字段上传，也可直接作为请求体；format 指定 csv / ndjson，
+    未指定时按文件扩展名或 Content-Type 判断。batch_size 为每个事务写入的行数，dry_run=true 时只校验不写入。
+    返回导入报告：处理行数、写入行数、失败行数与错误明细、耗时与每秒行数。
+    """
+    # 只有 multipart 请求才读取表单，否则请求体会被表单解析消耗
+    upload = request.files.get('file') if request.mimetype == 'multipart/form-data' else None
+    options = request.form if upload else request.args
+    try:
+        fmt = detect_format(request.args.get('format') or options.get('format'),
+                            filename=upload.filename if upload else None,
+                            mimetype=upload.mimetype if upload else request.mimetype)
+        batch_size = int(options.get('batch_size') or request.args.get('batch_size') or CREATOR_IMPORT_BATCH_SIZE)
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+    dry_run = str(options.get('dry_run') or request.args.get('dry_run') or '').lower() in ('1', 'true', 'yes')
+
+    lines = io.TextIOWrapper(upload.stream if upload else request.stream, encoding='utf-8-sig', newline='')
+    report = import_creators(lines, fmt, batch_size=batch_size, dry_run=dry_run)
+    print(f"[import_creators_bulk] 处理 {report['processed']} 行，写入 {report['imported']} 行，"
+          f"失败 {report['failed']} 行，{report['rows_per_sec']} 行/秒")
+    return jsonify({"success": not report["aborted"], "data": report})
+
+
+@mcn_ai_bp.route('/creators/export', methods=['GET'])
+@cross_origin()
+def export_creators_bulk():
+    """
+    批量导出创作者（流式响应）：format 为 csv（默认）或 ndjson，可按 category / platform 筛选。
+    导出的文件带 id，可直接再导入（按 id 覆盖）。
+    """
+    try:
+        fmt = detect_format(request.args.get('format', 'csv'))
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+    chunks = iter_export(fmt, category=request.args.get('category', ''), platform=request.args.get('platform', ''))
+    filename = f"creators-{datetime.now():%Y%m%d%H%M%S}.{fmt}"
+    return Response(
+        stream_with_context(chunks),
+        mimetype=EXPORT_MIMETYPES[fmt],
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
 
 
 @mcn_ai_bp.route('/creators/<int:creator_id>/analytics', methods=['GET'])
 @cross_origin()
 def get_creator_analytics(creator_id):
-    """获取创作者数据分析"""
-    # 生成模拟的30天数据
-    analytics_data = []
-    base_date = datetime.now() - timedelta(days=30)
-
-    for i in range(30):
-        date = base_date + timedelta(days=i)
-        analytics_data.append({
-            "date": date.strftime("%Y-%m-%d"),
-            "views": random.randint(20000, 80000),
-            "likes": random.randint(1000, 8000),
-            "comments": random.randint(100, 800),
-            "shares": random.randint(50, 500),
-            "followers_growth": random.randint(-100, 500)
-        })
-
-    return jsonify({
-        "success": True,
-        "data": {
-            "creator_id": creator_id,
-            "analytics": analytics_data,
-            "summary": {
-                "total_views": sum(d["views"] for d in analytics_data),
-                "avg_engagement_rate": round(random.uniform(5.0, 15.0), 2),
-                "follower_growth": sum(d["followers_growth"] for d in analytics_data)
-            }
-        }
-    })
+    """
+    获取创作者数据分析
+    start_date / end_date 为 YYYY-MM-DD（默认截至昨天的 days 天，days 默认 30），
+    granularity: day / week，ma_window 为滑动平均窗口（按区间数，默认 7）。
+    数据由固定种子生成，相同参数的结果始终相同。
+    """
+    try:
+        days = request.args.get('days', 30, type=int)
+        end_text = request.args.get('end_date')
+        end = datetime.strptime(end_text, "%Y-%m-%d").date() if end_text else datetime.now().date() - timedelta(days=1)
+        start_text = request.args.get('start_date')
+        start = datetime.strptime(start_text, "%Y-%m-%d").date() if start_text else end - timedelta(days=max(1, days) - 1)
+        report = creator_analytics.report(
+            creator_id, start, end,
+            granularity=request.args.get('granularity', 'day'),
+            ma_window=request.args.get('ma_window', 7, type=int)
+        )
+    except ValueError as e:
+        return jsonify({"success": False, "message": f"参数错误: {str(e)}"}), 400
+
+    return jsonify({"success": True, "data": report})
 
 
 @mcn_ai_bp.route('/content/generate', methods=['POST'])
@@ -261,13 +201,15 @@ def generate_content():
     topic = data.get('topic', '')
     content_type = data.get('type', 'post')
     platform = data.get('platform', '抖音')
+    # 为 True 时跳过响应缓存，强制重新生成
+    bypass_cache = bool(data.get('bypass_cache', False))
 
     if not topic:
         return jsonify({"success": False, "message": "主题不能为空"}), 400
 
     try:
         # 调用AI服务生成内容
-        result = ai_service.generate_content(topic, content_type)
+        result = ai_service.generate_content(topic, content_type, bypass_cache=bypass_cache)
 
         if result.get('success'):
             # 添加平台特定的预测数据
@@ -290,13 +232,81 @@ def generate_content():
         return jsonify({"success": False, "message": f"内容生成失败: {str(e)}"}), 500
 
 
-@mcn_ai_bp.route('/matching/brand-creator', methods=['POST'])
+def _sse(event, data):
+    """格式化一条 Server-Sent Events 消息"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@mcn_ai_bp.route('/content/generate/stream', methods=['POST'])
 @cross_origin()
-def match_brand_creator():
-    """品牌-创作者智能匹配 - 使用真实AI模型"""
+def generate_content_stream():
+    """
+    AI内容生成（SSE流式）
+    依次推送 token（模型输出片段）、section（解析完成的标题/描述/脚本/标签）事件，
+    最后推送 done（与 /content/generate 的 data 结构相同）或 error 事件。
+    """
     data = request.get_json()
-    print(f"接收到的请求数据 (data): {data}")  # 用于调试
+    topic = data.get('topic', '')
+    content_type = data.get('type', 'post')
+    platform = data.get('platform', '抖音')
+    bypass_cache = bool(data.get('bypass_cache', False))
+
+    if not topic:
+        return jsonify({"success": False, "message": "主题不能为空"}), 400
 
+    def events():
+        for event, payload in ai_service.generate_content_stream(topic, content_type, bypass_cache=bypass_cache):
+            if event == 'done':
+                payload = {
+                    "success": True,
+                    "cached": payload['cached'],
+                    "data": {
+                        **payload['content'],
+                        "platform": platform,
+                        "estimated_performance": {
+                            "predicted_views": random.randint(10000, 100000),
+                            "predicted_engagement": round(random.uniform(3.0, 12.0), 2)
+                        }
+                    }
+                }
+            elif event == 'error':
+                payload = {"success": False, **payload}
+            yield _sse(event, payload)
+
+    return Response(
+        stream_with_context(events()),
+        mimetype='text/event-stream',
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def _match_option(data, key, cast, maximum):
+    """
+    解析可选的匹配参数：未提供或为 null 时返回 None（使用服务默认值），
+    否则必须是 (0, maximum] 范围内的数字。返回 (取值, 错误信息)。
+    """
+    value = data.get(key)
+    if value is None:
+        return None, None
+    kind = "整数" if cast is int else "数字"
+    if isinstance(value, bool):
+        return None, f"{key} 必须是{kind}"
+    try:
+        number = cast(value)
+    except (TypeError, ValueError, OverflowError):
+        return None, f"{key} 必须是{kind}"
+    if cast is int and isinstance(value, float) and number != value:
+        return None, f"{key} 必须是{kind}"
+    if not 0 < number <= maximum:  # NaN 也不满足
+        return None, f"{key} 必须大于 0 且不超过 {maximum:g}"
+    return number, None
+
+
+def _prepare_match(data):
+    """
+    解析匹配请求：确定品牌信息，按平台筛选并本地预排序创作者。
+    返回 (匹配参数, None)；请求不合法时返回 (None, (错误响应, 状态码))。
+    """
     brand_id = data.get('brand_id')
     brand_requirements_from_request = data.get('brand_requirements')
     selected_platform = data.get('platform')  # 获取前端传来的平台参数
@@ -310,36 +320,100 @@ def match_brand_creator():
             final_brand_info = brand_requirements_from_request[0]
 
     if not final_brand_info and brand_id:
-        final_brand_info = next((b for b in MOCK_BRANDS if b['id'] == brand_id), None)
-        if final_brand_info and 'brand_requirements' in data and isinstance(data['brand_requirements'], dict):
-            final_brand_info.update(data['brand_requirements'])
+        brand = db.session.get(Brand, brand_id)
+        if brand:
+            # to_dict 返回新字典，合并请求中的补充信息不会影响数据库中的品牌
+            final_brand_info = brand.to_dict()
+            if isinstance(data.get('brand_requirements'), dict):
+                final_brand_info.update(data['brand_requirements'])
 
     if not final_brand_info:
-        return jsonify({"success": False, "message": "无法找到或接收到品牌信息"}), 400
+        return None, (jsonify({"success": False, "message": "无法找到或接收到品牌信息"}), 400)
+
+    # 并发数、单个创作者超时与批量大小在筛选创作者之前校验，不合法时直接返回 400
+    options = {}
+    for key, cast, maximum in (('max_concurrency', int, MAX_MATCH_CONCURRENCY),
+                               ('timeout', float, MAX_MATCH_TIMEOUT),
+                               ('batch_size', int, MAX_MATCH_BATCH_SIZE)):
+        options[key], error = _match_option(data, key, cast, maximum)
+        if error:
+            return None, (jsonify({"success": False, "message": error}), 400)
+
+    try:
+        semantic_top_n = int(data.get('semantic_top_n', DEFAULT_SEMANTIC_TOP_N) or 0)
+    except (TypeError, ValueError):
+        return None, (jsonify({"success": False, "message": "semantic_top_n 必须是整数"}), 400)
 
     # 根据平台筛选创作者
-    filtered_creators = MOCK_CREATORS
+    # 筛选出在指定平台有账号的创作者
+    query = build_creator_query(platform=selected_platform or '')
+    total_candidates = count_creators(platform=selected_platform or '')
+    if 0 < semantic_top_n < total_candidates:
+        # 语义召回：只加载与品牌画像最接近的 semantic_top_n 位创作者，按相似度排序
+        started = time.perf_counter()
+        try:
+            retrieved = semantic_candidates(final_brand_info, semantic_top_n, platform=selected_platform or '',
+                                            mode=data.get('semantic_mode'))
+        except ValueError as e:
+            return None, (jsonify({"success": False, "message": str(e)}), 400)
+        creators_by_id = {c.id: c for c in query.filter(Creator.id.in_([i for i, _ in retrieved])).all()}
+        filtered_creators = [creators_by_id[i].to_dict() for i, _ in retrieved if i in creators_by_id]
+        print(f"语义召回 {len(filtered_creators)}/{total_candidates} 位创作者，"
+              f"耗时 {(time.perf_counter() - started) * 1000:.1f}ms")
+    else:
+        filtered_creators = [c.to_dict() for c in query.order_by(Creator.id).all()]
     if selected_platform:
-        # 筛选出在指定平台有账号的创作者
-        filtered_creators = [
-            c for c in MOCK_CREATORS
-            if selected_platform.lower() in [p.lower() for p in c.get('platforms', [])]
-        ]
-        print(f"根据平台 '{selected_platform}' 筛选后，剩余创作者数量: {len(filtered_creators)}")
+        print(f"根据平台 '{selected_platform}' 筛选后，剩余创作者数量: {total_candidates}")
         if not filtered_creators:
-            return jsonify({"success": False, "message": f"没有找到在 '{selected_platform}' 平台活跃的创作者。"}), 404
+            return None, (jsonify({"success": False, "message": f"没有找到在 '{selected_platform}' 平台活跃的创作者。"}), 404)
+
+    # 本地预排序：按标签重合度、粉丝门槛、互动率和潜力评分打分，只把前 top_k 位交给AI评估
+    try:
+        top_k = int(data.get('top_k', DEFAULT_MATCH_TOP_K) or 0)
+    except (TypeError, ValueError):
+        return None, (jsonify({"success": False, "message": "top_k 必须是整数"}), 400)
+    ranking_weights = data.get('ranking_weights')
+    if ranking_weights is not None and not isinstance(ranking_weights, dict):
+        return None, (jsonify({"success": False, "message": "ranking_weights 必须是对象"}), 400)
+    candidate_creators = rank_candidates(final_brand_info, filtered_creators, top_k, ranking_weights)
+    print(f"本地预排序后，交给AI评估的创作者数量: {len(candidate_creators)}")
+
+    return {
+        "brand_info": final_brand_info,
+        "creators": candidate_creators,
+        "total_candidates": total_candidates,
+        # 并发数、单个创作者超时与批量大小可由请求指定，未指定时使用服务默认值；
+        # bypass_cache 为 True 时忽略已保存的匹配结果，全部重新评估
+        "options": {
+            **options,
+            "bypass_cache": bool(data.get('bypass_cache', False))
+        }
+    }, None
+
+
+@mcn_ai_bp.route('/matching/brand-creator', methods=['POST'])
+@cross_origin()
+def match_brand_creator():
+    """品牌-创作者智能匹配 - 使用真实AI模型"""
+    data = request.get_json()
+    print(f"接收到的请求数据 (data): {data}")  # 用于调试
+
+    match, error = _prepare_match(data)
+    if error:
+        return error
 
     try:
         # 调用AI服务进行智能匹配，传递筛选后的创作者列表
-        result = ai_service.smart_match(final_brand_info, filtered_creators)
+        result = ai_service.smart_match(match['brand_info'], match['creators'], **match['options'])
 
         if result.get('success'):
             return jsonify({
                 "success": True,
                 "data": {
-                    "brand": final_brand_info,
+                    "brand": match['brand_info'],
                     "matched_creators": result['match_result'],
-                    "total_matches": len(result['match_result'])
+                    "total_matches": len(result['match_result']),
+                    "total_candidates": match['total_candidates']
                 }
             })
         else:
@@ -350,10 +424,159 @@ def match_brand_creator():
         return jsonify({"success": False, "message": f"匹配失败: {str(e)}"}), 500
 
 
+@mcn_ai_bp.route('/matching/brand-creator/stream', methods=['POST'])
+@cross_origin()
+def match_brand_creator_stream():
+    """
+    品牌-创作者智能匹配（流式）
+    每位创作者评估完成后立即推送一条 match 事件（包含该创作者及其 match_details），
+    全部完成后推送 summary 事件，给出按匹配度排序后的最终顺序。
+    默认输出 NDJSON；请求头 Accept 为 text/event-stream 时输出 SSE。
+    客户端断开连接时，尚未开始的评估会被取消。
+    """
+    data = request.get_json()
+    match, error = _prepare_match(data)
+    if error:
+        return error
+
+    use_sse = request.accept_mimetypes.best == 'text/event-stream'
+    total = len(match['creators'])
+
+    def emit(event, payload):
+        if use_sse:
+            return _sse(event, payload)
+        return json.dumps({"event": event, "data": payload}, ensure_ascii=False) + "\n"
+
+    def events():
+        results = ai_service.iter_smart_match(match['brand_info'], match['creators'], **match['options'])
+        matched = []
+        try:
+            for _, result in results:
+                matched.append(result)
+                yield emit("match", {**result, "progress": {"completed": len(matched), "total": total}})
+
+            ai_service.sort_match_results(matched)
+            yield emit("summary", {
+                "success": True,
+                "brand": match['brand_info'],
+                "ranking": [
+                    {"id": c.get('id'), "name": c.get('name'), "match_score": c['match_details']['match_score']}
+                    for c in matched
+                ],
+                "total_matches": len(matched),
+                "total_candidates": match['total_candidates']
+            })
+        except Exception as e:
+            print(f"[match_brand_creator_stream] 路由异常: {type(e).__name__}, 详情: {e}")
+            yield emit("error", {"success": False, "message": f"匹配失败: {str(e)}"})
+        finally:
+            # 客户端断开时生成器被关闭，这里取消剩余的评估任务
+            results.close()
+
+    return Response(
+        stream_with_context(events()),
+        mimetype='text/event-stream' if use_sse else 'application/x-ndjson',
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@mcn_ai_bp.route('/jobs', methods=['POST'])
+@cross_origin()
+def submit_job():
+    """
+    提交异步AI任务，立即返回任务ID
+    job_type=match：其余参数与 /matching/brand-creator 相同
+    job_type=generate：其余参数与 /content/generate 相同
+    """
+    data = request.get_json() or {}
+    job_type = data.get('job_type')
+
+    if job_type == 'match':
+        match, error = _prepare_match(data)
+        if error:
+            return error
+        job = job_manager.submit_match_job(match['brand_info'], match['creators'],
+                                           match['options'], match['total_candidates'])
+    elif job_type == 'generate':
+        if not data.get('topic'):
+            return jsonify({"success": False, "message": "主题不能为空"}), 400
+        job = job_manager.submit_generate_job(data['topic'], data.get('type', 'post'),
+                                              data.get('platform', '抖音'),
+                                              bypass_cache=bool(data.get('bypass_cache', False)))
+    else:
+        return jsonify({"success": False, "message": "job_type 必须是 match 或 generate"}), 400
+
+    return jsonify({"success": True, "data": job}), 202
+
+
+@mcn_ai_bp.route('/jobs/<job_id>', methods=['GET'])
+@cross_origin()
+def get_job(job_id):
+    """查询任务状态与进度；include_results=false 时不返回已完成子项的结果"""
+    include_results = request.args.get('include_results', 'true').lower() != 'false'
+    job = job_manager.get(job_id, include_results=include_results)
+    if job is None:
+        return jsonify({"success": False, "message": "任务不存在"}), 404
+    return jsonify({"success": True, "data": job})
+
+
+@mcn_ai_bp.route('/jobs/<job_id>/events', methods=['GET'])
+@cross_origin()
+def stream_job_events(job_id):
+    """以 SSE 推送任务进度：进度变化时推送 progress，任务结束时推送 done（包含结果）"""
+    if job_manager.get(job_id, include_results=False) is None:
+        return jsonify({"success": False, "message": "任务不存在"}), 404
+    interval = min(max(request.args.get('interval', 1.0, type=float), 0.2), 10.0)
+
+    def events():
+        last_progress = None
+        while True:
+            # 任务由工作线程更新，每次轮询前丢弃会话中的旧数据
+            db.session.expire_all()
+            job = job_manager.get(job_id, include_results=False)
+            if job['status'] in JOB_FINISHED_STATUSES:
+                yield _sse("done", job_manager.get(job_id))
+                return
+            progress = (job['status'], job['progress'])
+            if progress != last_progress:
+                last_progress = progress
+                yield _sse("progress", job)
+            time.sleep(interval)
+
+    return Response(
+        stream_with_context(events()),
+        mimetype='text/event-stream',
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@mcn_ai_bp.route('/jobs/<job_id>/cancel', methods=['POST'])
+@cross_origin()
+def cancel_job(job_id):
+    """取消任务：排队中的任务立即取消，执行中的任务在当前子项完成后停止"""
+    job = job_manager.cancel(job_id)
+    if job is None:
+        return jsonify({"success": False, "message": "任务不存在"}), 404
+    return jsonify({"success": True, "data": job})
+
+
+@mcn_ai_bp.route('/jobs/<job_id>/retry', methods=['POST'])
+@cross_origin()
+def retry_job(job_id):
+    """重试任务中失败的子项（已取消的任务会继续执行剩余子项）"""
+    try:
+        job = job_manager.retry(job_id)
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 409
+    if job is None:
+        return jsonify({"success": False, "message": "任务不存在"}), 404
+    return jsonify({"success": True, "data": job}), 202
+
+
 @mcn_ai_bp.route('/risk/content-check', methods=['POST'])
 @cross_origin()
 def check_content_risk():
-    """内容风险检测 - 使用真实AI模型"""
+    """内容风险检测 - 本地规则引擎预筛，需要结合上下文判断的内容交给AI模型复核"""
     data = request.get_json()
     content = data.get('content', '')
 
@@ -365,25 +588,7 @@ def check_content_risk():
         result = ai_service.detect_risk(content)
 
         if result.get('success'):
-            risk_assessment = result['risk_assessment']
-
-            # 转换为前端期望的格式
-            risk_level_map = {"低": 0, "中": 1, "高": 2}
-            risk_score = risk_level_map.get(risk_assessment.get('overall_risk', '低'), 0) * 30 + random.randint(0, 30)
-
-            return jsonify({
-                "success": True,
-                "data": {
-                    "risk_level": risk_assessment.get('overall_risk', '低'),
-                    "risk_score": risk_score,
-                    "issues": [
-                        f"政治敏感性: {risk_assessment.get('political_sensitivity', {}).get('reason', '')}",
-                        f"法律合规性: {risk_assessment.get('legal_compliance', {}).get('reason', '')}",
-                        f"道德伦理: {risk_assessment.get('ethical_concerns', {}).get('reason', '')}"
-                    ],
-                    "suggestions": risk_assessment.get('suggestions', [])
-                }
-            })
+            return jsonify({"success": True, "data": _format_risk_assessment(result['risk_assessment'])})
         else:
             return jsonify({"success": False, "message": result.get('message', '风险检测失败')}), 500
 
@@ -392,54 +597,257 @@ def check_content_risk():
         return jsonify({"success": False, "message": f"风险检测失败: {str(e)}"}), 500
 
 
+def _format_risk_assessment(risk_assessment):
+    """把 detect_risk 的风险判定转换为前端期望的格式"""
+    return {
+        "risk_level": risk_assessment.get('overall_risk', '低'),
+        "risk_score": risk_assessment.get('risk_score', 0),
+        "issues": [
+            f"政治敏感性: {risk_assessment.get('political_sensitivity', {}).get('reason', '')}",
+            f"法律合规性: {risk_assessment.get('legal_compliance', {}).get('reason', '')}",
+            f"道德伦理: {risk_assessment.get('ethical_concerns', {}).get('reason', '')}"
+        ],
+        "suggestions": risk_assessment.get('suggestions', []),
+        "matches": risk_assessment.get('matches', []),
+        "source": risk_assessment.get('source', 'rules')
+    }
+
+
+def _parse_risk_batch():
+    """
+    解析批量风险检测的请求体，返回 (内容条目列表, 选项, None)；请求不合法时返回 (None, None, (错误响应, 状态码))。
+    Content-Type 为 application/x-ndjson 时逐行解析，选项从查询参数读取；
+    否则请求体为 JSON 数组（选项从查询参数读取）或 {"items": [...], 选项...}。
+    每个条目可以是字符串，也可以是 {"id": ..., "content": ...}，未提供 id 时使用条目下标。
+    """
+    if request.mimetype in ('application/x-ndjson', 'application/jsonl'):
+        raw_items, options = [], request.args
+        for number, line in enumerate(request.get_data(as_text=True).splitlines(), 1):
+            if not line.strip():
+                continue
+            try:
+                raw_items.append(json.loads(line))
+            except json.JSONDecodeError:
+                return None, None, (jsonify({"success": False, "message": f"第 {number} 行不是合法的JSON"}), 400)
+    else:
+        data = request.get_json(silent=True)
+        if isinstance(data, list):
+            raw_items, options = data, request.args
+        elif isinstance(data, dict) and isinstance(data.get('items'), list):
+            raw_items, options = data['items'], data
+        else:
+            return None, None, (jsonify({"success": False, "message": "请求体必须是内容数组或包含 items 的对象"}), 400)
+
+    if not raw_items:
+        return None, None, (jsonify({"success": False, "message": "内容列表不能为空"}), 400)
+    if len(raw_items) > RISK_BATCH_MAX_ITEMS:
+        return None, None, (jsonify({"success": False, "message": f"单次最多检测 {RISK_BATCH_MAX_ITEMS} 条内容"}), 400)
+
+    items = []
+    for position, item in enumerate(raw_items):
+        if isinstance(item, dict):
+            items.append({"id": item.get('id', position), "content": item.get('content')})
+        else:
+            items.append({"id": position, "content": item})
+    return items, options, None
+
+
+def _latency_summary(latencies):
+    """单项耗时统计（毫秒）"""
+    if not latencies:
+        return {"avg": 0, "p50": 0, "p95": 0, "max": 0}
+    ordered = sorted(latencies)
+
+    def percentile(q):
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 3)
+
+    return {
+        "avg": round(sum(ordered) / len(ordered) * 1000, 3),
+        "p50": percentile(0.5),
+        "p95": percentile(0.95),
+        "max": round(ordered[-1] * 1000, 3)
+    }
+
+
+@mcn_ai_bp.route('/risk/content-check/batch', methods=['POST'])
+@cross_origin()
+def check_content_risk_batch():
+    """
+    批量内容风险检测（流式）
+    请求体为内容数组或 NDJSON，最多 RISK_BATCH_MAX_ITEMS 条；相同文本只检测一次，需要AI复核的内容并发复核。
+    每条内容检测完成后推送一条 item 事件（index、id、检测结果、latency_ms，按完成顺序），
+    全部完成后推送 summary 事件，给出各风险等级数量、去重与AI复核数量、单项耗时统计与吞吐量。
+    默认输出 NDJSON；请求头 Accept 为 text/event-stream 时输出 SSE。
+    """
+    items, options, error = _parse_risk_batch()
+    if error:
+        return error
+
+    bypass_cache = options.get('bypass_cache', False)
+    if isinstance(bypass_cache, str):
+        bypass_cache = bypass_cache.lower() in ('1', 'true', 'yes')
+    try:
+        max_concurrency = int(options.get('max_concurrency') or 0) or None
+    except (TypeError, ValueError):
+        return jsonify({"success": False, "message": "max_concurrency 必须是整数"}), 400
+
+    use_sse = request.accept_mimetypes.best == 'text/event-stream'
+
+    def emit(event, payload):
+        if use_sse:
+            return _sse(event, payload)
+        return json.dumps({"event": event, "data": payload}, ensure_ascii=False) + "\n"
+
+    def events():
+        started = time.perf_counter()
+        valid = [index for index, item in enumerate(items) if isinstance(item['content'], str) and item['content']]
+        completed, failed, escalated = 0, 0, 0
+        risk_levels = {"低": 0, "中": 0, "高": 0}
+        latencies = []
+
+        invalid = set(range(len(items))) - set(valid)
+        for index in sorted(invalid):
+            failed += 1
+            yield emit("item", {"index": index, "id": items[index]['id'], "success": False, "message": "内容不能为空"})
+
+        results = ai_service.iter_detect_risk([items[i]['content'] for i in valid],
+                                              max_concurrency=max_concurrency, bypass_cache=bool(bypass_cache))
+        try:
+            for positions, result, elapsed in results:
+                latencies.append(elapsed)
+                risk_assessment = result['risk_assessment']
+                escalated += len(positions) if risk_assessment.get('escalated') else 0
+                data = _format_risk_assessment(risk_assessment)
+                for order, position in enumerate(positions):
+                    index = valid[position]
+                    completed += 1
+                    risk_levels[data['risk_level']] = risk_levels.get(data['risk_level'], 0) + 1
+                    yield emit("item", {
+                        "index": index,
+                        "id": items[index]['id'],
+                        "success": True,
+                        "data": data,
+                        "latency_ms": round(elapsed * 1000, 3),
+                        "deduplicated": order > 0
+                    })
+
+            elapsed_total = time.perf_counter() - started
+            yield emit("summary", {
+                "success": True,
+                "total": len(items),
+                "completed": completed,
+                "failed": failed,
+                "unique": len(latencies),
+                "deduplicated": completed - len(latencies),
+                "escalated": escalated,
+                "risk_levels": risk_levels,
+                "latency_ms": _latency_summary(latencies),
+                "elapsed_ms": round(elapsed_total * 1000, 3),
+                "throughput_per_sec": round(len(items) / elapsed_total, 1) if elapsed_total else None
+            })
+        except Exception as e:
+            print(f"[check_content_risk_batch] 路由异常: {type(e).__name__}, 详情: {e}")
+            yield emit("error", {"success": False, "message": f"风险检测失败: {str(e)}"})
+        finally:
+            # 客户端断开时生成器被关闭，这里取消剩余的复核任务
+            results.close()
+
+    return Response(
+        stream_with_context(events()),
+        mimetype='text/event-stream' if use_sse else 'application/x-ndjson',
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @mcn_ai_bp.route('/dashboard/overview', methods=['GET'])
 @cross_origin()
 def get_dashboard_overview():
-    """获取仪表板概览数据"""
-    return jsonify({
-        "success": True,
-        "data": {
-            "total_creators": len(MOCK_CREATORS),
-            "active_campaigns": 12,
-            "total_revenue": 2580000,
-            "avg_roi": 4.2,
-            "platform_distribution": {
-                "抖音": 45,
-                "小红书": 25,
-                "B站": 20,
-                "快手": 10
-            },
-            "category_distribution": {
-                "美妆": 30,
-                "科技": 25,
-                "美食": 20,
-                "时尚": 15,
-                "其他": 10
-            },
-            "recent_activities": [
-                {"time": "2小时前", "action": "新增创作者", "detail": "小美美妆"},
-                {"time": "4小时前", "action": "完成匹配", "detail": "时尚品牌A × 3位创作者"},
-                {"time": "6小时前", "action": "内容审核", "detail": "通过15条内容"},
-                {"time": "8小时前", "action": "数据分析", "detail": "生成月度报告"}
-            ]
-        }
-    })
+    """
+    获取仪表板概览数据：由随写入增量更新的物化汇总提供，不随数据规模扫描数据库。
+    响应带 ETag，请求头 If-None-Match 与当前版本一致时返回 304。
+    """
+    etag, body = dashboard_summary.snapshot()
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    # 每次使用前都需要向服务器确认版本（命中时只返回 304）
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
 
 
 # 新增：AI模型状态检查接口
 @mcn_ai_bp.route('/ai/status', methods=['GET'])
 @cross_origin()
 def get_ai_status():
-    """获取AI模型状态"""
+    """获取AI模型状态（只读取模型解析状态，不会触发模型发现）"""
+    model_state = ai_service.model_status()
     return jsonify({
         "success": True,
         "data": {
-            "model_status": "运行中" if ai_service.model else "使用模拟数据",
+            "model_status": MODEL_STATUS_LABELS.get(model_state["state"], "使用模拟数据"),
+            "model": model_state,
             "api_key_configured": bool(os.getenv('GEMINI_API_KEY')),
+            "response_cache": ai_service.response_cache.stats(),
+            "match_store": ai_service.match_store.stats(),
+            "single_flight": ai_service.single_flight.stats(),
+            "rate_limiter": ai_service.rate_limiter.stats(),
+            "prompts": ai_service.prompt_builder.stats(),
+            "semantic_index": creator_semantic_index.stats(),
             "available_features": [
                 "内容生成",
                 "智能匹配",
                 "风险检测"
             ]
         }
-    })
\ No newline at end of file
+    })
+
+
+# 命令行：flask --app src.main mcn_ai import-creators / export-creators
+@mcn_ai_bp.cli.command('import-creators')
+@click.argument('path')
+@click.option('--format', 'fmt', default=None, help="csv 或 ndjson，默认按文件扩展名判断")
+@click.option('--batch-size', default=CREATOR_IMPORT_BATCH_SIZE, show_default=True, help="每个事务写入的行数")
+@click.option('--dry-run', is_flag=True, help="只校验不写入")
+def import_creators_command(path, fmt, batch_size, dry_run):
+    """从 CSV / NDJSON 文件批量导入创作者，PATH 为 - 时读取标准输入"""
+    try:
+        fmt = detect_format(fmt, filename=None if path == '-' else path)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+
+    def progress(report):
+        if report["batches"] % 50 == 0:
+            click.echo(f"已写入 {report['imported']} 行，{report['rows_per_sec']} 行/秒", err=True)
+
+    source = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8-sig', newline='') if path == '-' \
+        else open(path, encoding='utf-8-sig', newline='')
+    with source:
+        report = import_creators(source, fmt, batch_size=batch_size, dry_run=dry_run, progress=progress)
+    for error in report["errors"]:
+        click.echo(f"第 {error['line']} 行: {error['message']}", err=True)
+    click.echo(f"处理 {report['processed']} 行，写入 {report['imported']} 行，失败 {report['failed']} 行，"
+               f"耗时 {report['elapsed_seconds']}s，{report['rows_per_sec']} 行/秒")
+    if report["aborted"]:
+        sys.exit(1)
+
+
+@mcn_ai_bp.cli.command('export-creators')
+@click.argument('path')
+@click.option('--format', 'fmt', default=None, help="csv 或 ndjson，默认按文件扩展名判断")
+@click.option('--category', default='', help="只导出该领域的创作者")
+@click.option('--platform', default='', help="只导出在该平台有账号的创作者")
+def export_creators_command(path, fmt, category, platform):
+    """把创作者导出为 CSV / NDJSON 文件，PATH 为 - 时写到标准输出"""
+    try:
+        fmt = detect_format(fmt, filename=None if path == '-' else path)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+    target = sys.stdout if path == '-' else open(path, 'w', encoding='utf-8', newline='')
+    try:
+        for chunk in iter_export(fmt, category=category, platform=platform):
+            target.write(chunk)
+    finally:
+        if target is not sys.stdout:
+            target.close()
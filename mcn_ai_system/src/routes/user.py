@@ -1,12 +1,56 @@
-from flask import Blueprint, jsonify, request
+import os
+
+from flask import Blueprint, jsonify, request, url_for
+from sqlalchemy import insert, update, delete
+from sqlalchemy.exc import IntegrityError
 from src.models.user import User, db
 
 user_bp = Blueprint('user', __name__)
 
+# GET /users 可选的返回字段
+USER_FIELDS = ('id', 'username', 'email')
+DEFAULT_USER_PAGE_SIZE = 50
+MAX_USER_PAGE_SIZE = 500
+# 批量接口单次请求允许的最大条目数
+USER_BATCH_MAX_ITEMS = int(os.getenv('USER_BATCH_MAX_ITEMS', '5000'))
+# 唯一字段及其长度上限（与 User 模型一致）
+_UNIQUE_FIELDS = {'username': 80, 'email': 120}
+_FIELD_LABELS = {'username': '用户名', 'email': '邮箱'}
+# 按 IN 查询已有取值时每次查询的数量，避免超出 SQLite 的参数个数限制
+_LOOKUP_CHUNK = 500
+
+
 @user_bp.route('/users', methods=['GET'])
 def get_users():
-    users = User.query.all()
-    return jsonify([user.to_dict() for user in users])
+    """
+    获取用户列表（按 id 升序的游标分页）
+    limit 为每页数量，cursor 为上一页响应头 X-Next-Cursor 的值，fields 为逗号分隔的返回字段。
+    响应体仍为用户数组；还有下一页时响应头带 X-Next-Cursor 与 Link: <...>; rel="next"。
+    """
+    limit = min(max(1, request.args.get('limit', DEFAULT_USER_PAGE_SIZE, type=int)), MAX_USER_PAGE_SIZE)
+    cursor = request.args.get('cursor', type=int)
+    fields = [f.strip() for f in request.args.get('fields', '').split(',') if f.strip()] or list(USER_FIELDS)
+    unknown = [f for f in fields if f not in USER_FIELDS]
+    if unknown:
+        return jsonify({"success": False, "message": f"未知字段: {', '.join(unknown)}"}), 400
+
+    # 只查询所需的列（id 用于游标），不构造 ORM 对象
+    columns = [getattr(User, f) for f in dict.fromkeys(['id', *fields])]
+    stmt = db.select(*columns).order_by(User.id).limit(limit + 1)
+    if cursor is not None:
+        stmt = stmt.where(User.id > cursor)
+    rows = db.session.execute(stmt).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    response = jsonify([{f: row._mapping[f] for f in fields} for row in rows])
+    if has_more:
+        next_cursor = rows[-1].id
+        next_url = url_for('user.get_users', limit=limit, cursor=next_cursor,
+                           fields=request.args.get('fields') or None)
+        response.headers['X-Next-Cursor'] = str(next_cursor)
+        response.headers['Link'] = f'<{next_url}>; rel="next"'
+    return response
 
 @user_bp.route('/users', methods=['POST'])
 def create_user():
@@ -37,3 +81,239 @@ def delete_user(user_id):
     db.session.delete(user)
     db.session.commit()
     return '', 204
+
+
+def _parse_batch(key):
+    """请求体为数组，或 {key: [...], "atomic": bool}；返回 (条目列表, atomic, 错误响应)"""
+    data = request.get_json(silent=True)
+    atomic = request.args.get('atomic', '').lower() in ('1', 'true', 'yes')
+    if isinstance(data, dict) and isinstance(data.get(key), list):
+        items, atomic = data[key], bool(data.get('atomic', atomic))
+    elif isinstance(data, list):
+        items = data
+    else:
+        return None, atomic, (jsonify({"success": False, "message": f"请求体必须是数组或包含 {key} 的对象"}), 400)
+    if not items:
+        return None, atomic, (jsonify({"success": False, "message": "批量条目不能为空"}), 400)
+    if len(items) > USER_BATCH_MAX_ITEMS:
+        return None, atomic, (jsonify({"success": False, "message": f"单次最多处理 {USER_BATCH_MAX_ITEMS} 条"}), 400)
+    return items, atomic, None
+
+
+def _user_fields(item, required):
+    """校验一条用户数据，返回需要写入的字段；required 为 True 时用户名和邮箱都必须提供"""
+    if not isinstance(item, dict):
+        raise ValueError("条目必须是对象")
+    fields = {}
+    for field, limit in _UNIQUE_FIELDS.items():
+        if field not in item:
+            if required:
+                raise ValueError(f"缺少{_FIELD_LABELS[field]}")
+            continue
+        value = item[field]
+        if not isinstance(value, str) or not value.strip():
+            raise ValueError(f"{_FIELD_LABELS[field]}不能为空")
+        value = value.strip()
+        if len(value) > limit:
+            raise ValueError(f"{_FIELD_LABELS[field]}不能超过 {limit} 个字符")
+        if field == 'email' and '@' not in value:
+            raise ValueError("邮箱格式不正确")
+        fields[field] = value
+    if not fields:
+        raise ValueError("至少需要提供用户名或邮箱")
+    return fields
+
+
+def _existing_values(field, values):
+    """已有用户中取值在 values 内的 {取值: 用户ID}"""
+    column = getattr(User, field)
+    values, found = list(values), {}
+    for offset in range(0, len(values), _LOOKUP_CHUNK):
+        chunk = values[offset:offset + _LOOKUP_CHUNK]
+        found.update({value: user_id for user_id, value in db.session.execute(
+            db.select(User.id, column).where(column.in_(chunk)))})
+    return found
+
+
+def _reject_conflicts(candidates, results):
+    """
+    检查唯一字段冲突：与同批中前面的条目重复，或与其他已有用户重复（更新时与自身相同不算冲突）。
+    candidates 为 [(序号, 用户ID或None, 字段)]，冲突的条目写入 results。
+    """
+    for field in _UNIQUE_FIELDS:
+        values = {fields[field] for _, _, fields in candidates if field in fields}
+        if not values:
+            continue
+        existing = _existing_values(field, values)
+        seen = {}
+        for index, user_id, fields in candidates:
+            value = fields.get(field)
+            if value is None or results[index] is not None:
+                continue
+            if value in seen:
+                results[index] = _failure(index, f"{_FIELD_LABELS[field]}与第 {seen[value]} 条重复", user_id)
+            elif existing.get(value, user_id) != user_id:
+                results[index] = _failure(index, f"{_FIELD_LABELS[field]}已存在: {value}", user_id)
+            else:
+                seen[value] = index
+
+
+def _failure(index, message, user_id=None):
+    return {"index": index, "id": user_id, "success": False, "message": message}
+
+
+def _batch_response(results, atomic, written, success_status=200):
+    """
+    汇总批量结果：全部成功返回 success_status；部分失败且已写入其余条目返回 207；
+    没有写入任何条目（全部失败，或 atomic 模式下有失败）返回 400。
+    """
+    failed = sum(1 for r in results if not r["success"])
+    if atomic and failed:
+        # 整批回滚：原本合法的条目也未写入
+        results = [r if not r["success"] else {**r, "success": False, "message": "批次中有失败条目，整批未写入"}
+                   for r in results]
+    status = success_status if not failed else (207 if written else 400)
+    return jsonify({
+        "success": failed == 0,
+        "data": {
+            "total": len(results),
+            "succeeded": len(results) - failed if written else 0,
+            "failed": failed,
+            "atomic": atomic,
+            "committed": bool(written),
+            "results": results
+        }
+    }), status
+
+
+def _commit_conflict(e):
+    db.session.rollback()
+    print(f"[user_batch] 写入冲突，整批回滚: {e}")
+    return jsonify({"success": False, "message": "写入时发生唯一性冲突（可能有并发写入），整批未写入，请重试"}), 409
+
+
+@user_bp.route('/users/batch', methods=['POST'])
+def create_users_batch():
+    """
+    批量创建用户：请求体为用户数组，或 {"users": [...], "atomic": false}。
+    合法的用户在同一个事务中一次写入；不合法或用户名/邮箱与已有用户（或同批前面的条目）重复的条目跳过，
+    并在 results 中按序号说明原因。atomic 为 true 时只要有一条失败就整批不写入。
+    """
+    items, atomic, error = _parse_batch('users')
+    if error:
+        return error
+
+    results = [None] * len(items)
+    candidates = []
+    for index, item in enumerate(items):
+        try:
+            candidates.append((index, None, _user_fields(item, required=True)))
+        except ValueError as e:
+            results[index] = _failure(index, str(e))
+    _reject_conflicts(candidates, results)
+    valid = [(index, fields) for index, _, fields in candidates if results[index] is None]
+
+    written = bool(valid) and not (atomic and len(valid) < len(items))
+    if written:
+        try:
+            # 一条 INSERT 批量写入，并按参数顺序返回自增ID
+            ids = db.session.scalars(insert(User).returning(User.id, sort_by_parameter_order=True),
+                                     [fields for _, fields in valid]).all()
+            db.session.commit()
+        except IntegrityError as e:
+            return _commit_conflict(e)
+        for (index, fields), user_id in zip(valid, ids):
+            results[index] = {"index": index, "id": user_id, "success": True, "user": {"id": user_id, **fields}}
+    for index, fields in valid:
+        if results[index] is None:
+            results[index] = {"index": index, "id": None, "success": True}
+    return _batch_response(results, atomic, written, success_status=201)
+
+
+@user_bp.route('/users/batch', methods=['PATCH', 'PUT'])
+def update_users_batch():
+    """
+    批量更新用户：请求体为 [{"id": 1, "username": ..., "email": ...}] 或 {"users": [...], "atomic": false}，
+    每条只更新提供的字段。所有合法条目在同一个事务中按主键批量更新；用户不存在、字段不合法、
+    与其他用户冲突或同一用户重复出现的条目跳过并说明原因。atomic 为 true 时有失败则整批不写入。
+    """
+    items, atomic, error = _parse_batch('users')
+    if error:
+        return error
+
+    results = [None] * len(items)
+    candidates, seen_ids = [], {}
+    for index, item in enumerate(items):
+        user_id = item.get('id') if isinstance(item, dict) else None
+        if not isinstance(user_id, int) or isinstance(user_id, bool):
+            results[index] = _failure(index, "缺少整数 id")
+            continue
+        if user_id in seen_ids:
+            results[index] = _failure(index, f"与第 {seen_ids[user_id]} 条是同一用户", user_id)
+            continue
+        seen_ids[user_id] = index
+        try:
+            candidates.append((index, user_id, _user_fields(item, required=False)))
+        except ValueError as e:
+            results[index] = _failure(index, str(e), user_id)
+
+    existing_ids = set()
+    candidate_ids = [user_id for _, user_id, _ in candidates]
+    for offset in range(0, len(candidate_ids), _LOOKUP_CHUNK):
+        existing_ids.update(db.session.scalars(
+            db.select(User.id).where(User.id.in_(candidate_ids[offset:offset + _LOOKUP_CHUNK]))))
+    for index, user_id, _ in candidates:
+        if user_id not in existing_ids:
+            results[index] = _failure(index, "用户不存在", user_id)
+    _reject_conflicts([c for c in candidates if results[c[0]] is None], results)
+    valid = [(index, user_id, fields) for index, user_id, fields in candidates if results[index] is None]
+
+    written = bool(valid) and not (atomic and len(valid) < len(items))
+    if written:
+        try:
+            # 按主键的批量 UPDATE（executemany），不加载 ORM 对象
+            db.session.execute(update(User), [{"id": user_id, **fields} for _, user_id, fields in valid])
+            db.session.commit()
+        except IntegrityError as e:
+            return _commit_conflict(e)
+    for index, user_id, fields in valid:
+        results[index] = {"index": index, "id": user_id, "success": True, "updated": sorted(fields)}
+    return _batch_response(results, atomic, written)
+
+
+@user_bp.route('/users/batch', methods=['DELETE'])
+def delete_users_batch():
+    """
+    批量删除用户：请求体为 id 数组或 {"ids": [...], "atomic": false}。
+    存在的用户在同一个事务中一次删除；不存在或不合法的 id 在 results 中说明。atomic 为 true 时有失败则整批不删除。
+    """
+    items, atomic, error = _parse_batch('ids')
+    if error:
+        return error
+
+    results = [None] * len(items)
+    positions = {}
+    for index, user_id in enumerate(items):
+        if not isinstance(user_id, int) or isinstance(user_id, bool):
+            results[index] = _failure(index, "id 必须是整数")
+        elif user_id in positions:
+            results[index] = _failure(index, f"与第 {positions[user_id]} 条重复", user_id)
+        else:
+            positions[user_id] = index
+
+    ids = list(positions)
+    existing_ids = set()
+    for offset in range(0, len(ids), _LOOKUP_CHUNK):
+        existing_ids.update(db.session.scalars(
+            db.select(User.id).where(User.id.in_(ids[offset:offset + _LOOKUP_CHUNK]))))
+    for user_id, index in positions.items():
+        results[index] = {"index": index, "id": user_id, "success": True} if user_id in existing_ids \
+            else _failure(index, "用户不存在", user_id)
+
+    valid = sorted(existing_ids)
+    written = bool(valid) and not (atomic and len(valid) < len(items))
+    if written:
+        for offset in range(0, len(valid), _LOOKUP_CHUNK):
+            db.session.execute(delete(User).where(User.id.in_(valid[offset:offset + _LOOKUP_CHUNK])))
+        db.session.commit()
+    return _batch_response(results, atomic, written)
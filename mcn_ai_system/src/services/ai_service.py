@@ -1,85 +1,148 @@
 # mcn_ai_system/src/services/ai_service.py
 import google.generativeai as genai
+import itertools
 import json
 import os
 from typing import Dict, List, Any
 import random  # 确保导入 random 模块
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, as_completed, FIRST_COMPLETED
+from src.services.response_cache import ResponseCache, DEFAULT_CACHE_DB_PATH
+from src.services.match_store import MatchResultStore
+from src.services.content_parser import StreamingSectionParser, content_from_sections, parse_sections
+from src.services.model_resolver import ModelResolver
+from src.services.llm_backends import LLMBackend, GeminiBackend, create_backend, estimate_tokens, DEFAULT_BACKEND
+from src.services.single_flight import SingleFlight, make_flight_key
+from src.services.rate_limiter import ModelRateLimiter
+from src.services.prompt_builder import PromptBuilder
+from src.services.risk_engine import RiskRuleEngine, RISK_LEVELS, risk_score
+from src.services.risk_rules import RISK_CATEGORIES
+
+# 智能匹配的默认并发数与单个创作者评估超时（秒），可通过环境变量调整
+DEFAULT_MATCH_CONCURRENCY = int(os.getenv('AI_MATCH_CONCURRENCY', '8'))
+DEFAULT_MATCH_TIMEOUT = float(os.getenv('AI_MATCH_TIMEOUT', '30'))
+# 单次请求允许的最大并发数，防止请求参数过大压垮上游配额
+MAX_MATCH_CONCURRENCY = int(os.getenv('AI_MATCH_MAX_CONCURRENCY', '32'))
+# 单次请求允许指定的最长单个创作者评估超时（秒）
+MAX_MATCH_TIMEOUT = float(os.getenv('AI_MATCH_MAX_TIMEOUT', '300'))
+# 批量匹配模式下每个Prompt包含的创作者数量，1 表示逐个评估
+DEFAULT_MATCH_BATCH_SIZE = int(os.getenv('AI_MATCH_BATCH_SIZE', '1'))
+MAX_MATCH_BATCH_SIZE = int(os.getenv('AI_MATCH_MAX_BATCH_SIZE', '20'))
+# 内容生成响应缓存：容量、有效期（秒），AI_CACHE_PERSIST 开启后同时写入 src/database/ai_cache.db
+CACHE_MAX_ENTRIES = int(os.getenv('AI_CACHE_MAX_ENTRIES', '1024'))
+CACHE_TTL = float(os.getenv('AI_CACHE_TTL', '86400'))
+CACHE_PERSIST = os.getenv('AI_CACHE_PERSIST', 'false').lower() in ('1', 'true', 'yes')
+# 风险复核（需要AI判断的内容）的超时（秒）与批量检测时的默认/最大并发数
+RISK_REVIEW_TIMEOUT = float(os.getenv('AI_RISK_TIMEOUT', '30'))
+DEFAULT_RISK_CONCURRENCY = int(os.getenv('AI_RISK_CONCURRENCY', '8'))
+MAX_RISK_CONCURRENCY = int(os.getenv('AI_RISK_MAX_CONCURRENCY', '32'))
+# 品牌×创作者匹配结果的保存数量
+MATCH_STORE_MAX_ENTRIES = int(os.getenv('AI_MATCH_STORE_MAX_ENTRIES', '10000'))
+
+# 启动后是否在后台线程中提前解析模型（默认首次使用时才解析）
+MODEL_WARMUP = os.getenv('AI_MODEL_WARMUP', 'false').lower() in ('1', 'true', 'yes')
+
+# 匹配度排序权重
+MATCH_SCORE_ORDER = {"高": 3, "中": 2, "低": 1, "未知": 0}
 
 
 class AIModelService:
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, genai_client=None, warm_up: bool = None, backend: str = None):
         """
         初始化AI模型服务
+        genai_client: 默认为 google.generativeai，可传入本地桩对象
+        warm_up: 是否在后台线程中提前解析模型，默认读取环境变量 AI_MODEL_WARMUP
+        backend: 模型后端 gemini / stub，默认读取环境变量 AI_BACKEND
         """
-        if api_key:
-            print("[AIModelService] 使用真实 API KEY:", api_key[:6] + "..." if api_key else "None")
-            try:
-                genai.configure(api_key=api_key)
-
-                # 尝试列出模型并选择一个支持 generateContent 的模型
-                available_models = []
-                try:
-                    for m in genai.list_models():
-                        if 'generateContent' in m.supported_generation_methods:
-                            available_models.append(m.name)
-
-                    selected_model_name = None
-                    if available_models:
-                        # 优先选择最新的、推荐的模型
-                        if 'models/gemini-1.5-flash' in available_models:
-                            selected_model_name = 'gemini-1.5-flash'
-                        elif 'gemini-1.5-flash' in available_models:  # 兼容不带 'models/' 前缀的情况
-                            selected_model_name = 'gemini-1.5-flash'
-                        elif 'models/gemini-1.5-pro' in available_models:
-                            selected_model_name = 'gemini-1.5-pro'
-                        elif 'gemini-1.5-pro' in available_models:
-                            selected_model_name = 'gemini-1.5-pro'
-                        elif 'models/gemini-pro' in available_models:  # 次优先选择 gemini-pro (如果还没弃用)
-                            selected_model_name = 'gemini-pro'
-                        elif 'gemini-pro' in available_models:
-                            selected_model_name = 'gemini-pro'
-                        else:
-                            # 如果上述模型都不可用，则选择列表中的第一个可用模型
-                            selected_model_name = available_models[0].split('/')[-1]
-
-                        self.model = genai.GenerativeModel(selected_model_name)
-                        print(f"[AIModelService] 模型初始化成功，使用的模型: {self.model.model_name}")
-                    else:
-                        print("[AIModelService] 未找到任何支持 'generateContent' 方法的模型。")
-                        self.model = None
-
-                except Exception as e:
-                    print(f"[AIModelService] 列出模型或选择模型失败: {e}")
-                    self.model = None
-
-            except Exception as e:
-                print("[AIModelService] genai.configure 失败:", e)
-                self.model = None
+        self.response_cache = ResponseCache(
+            max_entries=CACHE_MAX_ENTRIES,
+            ttl=CACHE_TTL,
+            db_path=DEFAULT_CACHE_DB_PATH if CACHE_PERSIST else None
+        )
+        self.match_store = MatchResultStore(
+            max_entries=MATCH_STORE_MAX_ENTRIES,
+            ttl=CACHE_TTL,
+            db_path=DEFAULT_CACHE_DB_PATH if CACHE_PERSIST else None
+        )
+        # 相同 (模型, Prompt) 的并发调用合并为一次上游请求
+        self.single_flight = SingleFlight()
+        # 客户端限流（rpm/tpm）、自适应并发与可重试错误的退避重试，进程内所有模型调用共享
+        self.rate_limiter = ModelRateLimiter()
+        # 紧凑的 Prompt 模板与长字段截断，并统计每类 Prompt 的 token 数
+        self.prompt_builder = PromptBuilder()
+        # 本地风险规则引擎，只有命中依赖上下文的规则时才请求模型复核
+        self.risk_engine = RiskRuleEngine()
+        # 模型在首次使用时才解析，构造服务（即导入路由模块）时不做任何网络请求
+        self.model_resolver = ModelResolver(api_key=api_key, genai_client=genai_client or genai)
+        self.backend_name = (backend or DEFAULT_BACKEND).lower()
+        self._backend = create_backend(self.backend_name)  # 不依赖 API KEY 的后端（如 stub）
+        self._gemini_backend = None
+        if self._backend is not None:
+            print(f"[AIModelService] 使用模型后端: {self._backend.describe()}")
+        elif api_key:
+            print("[AIModelService] 使用真实 API KEY:", api_key[:6] + "...")
+            if MODEL_WARMUP if warm_up is None else warm_up:
+                self.model_resolver.warm_up()
         else:
             print("[AIModelService] 没有检测到 API KEY，使用模拟数据")
-            self.model = None
 
-    def generate_content(self, topic: str, content_type: str = "post") -> Dict[str, Any]:
+    @property
+    def model(self) -> LLMBackend:
+        """
+        当前使用的模型后端。Gemini 模型在首次访问时解析，未配置 API KEY 或解析失败时为 None，
+        此时各功能使用模拟数据。
+        """
+        if self._backend is not None:
+            return self._backend
+        genai_model = self.model_resolver.resolve()
+        if genai_model is None:
+            return None
+        if self._gemini_backend is None or self._gemini_backend.model is not genai_model:
+            self._gemini_backend = GeminiBackend(genai_model)
+        return self._gemini_backend
+
+    @model.setter
+    def model(self, model):
+        """指定模型后端；传入提供 generate_content 的模型对象时按 Gemini 后端包装"""
+        if model is None:
+            self._backend = None
+            self.model_resolver.override(None)
+        else:
+            self._backend = model if isinstance(model, LLMBackend) else GeminiBackend(model)
+
+    def model_status(self) -> Dict[str, Any]:
+        """模型后端状态，不会触发 Gemini 模型解析"""
+        if self._backend is not None:
+            return {"state": "ready", "backend": self._backend.describe(), "model_name": self._backend.model_name,
+                    "source": "backend", "error": None}
+        return {**self.model_resolver.status(), "backend": {"name": self.backend_name}}
+
+    def generate_content(self, topic: str, content_type: str = "post", bypass_cache: bool = False) -> Dict[str, Any]:
+        """
+        生成内容。相同 (模型, Prompt) 的成功响应会被缓存；
+        bypass_cache 为 True 时跳过缓存读取，直接请求模型并用新结果刷新缓存。
+        """
         print(f"[generate_content] 收到请求，topic: {topic}, type: {content_type}")
 
-        if self.model:  # 确保模型已成功初始化
+        model = self.model
+        if model:  # 确保模型已成功初始化
             try:
                 prompt = self._build_content_prompt(topic, content_type)
+                cache_key = ResponseCache.make_key(model.model_name, prompt)
+                if not bypass_cache:
+                    cached_text = self.response_cache.get(cache_key)
+                    if cached_text is not None:
+                        print("[generate_content] 命中响应缓存")
+                        return self._build_content_result(cached_text, cached=True)
+
                 print("[generate_content] 使用的 prompt:\n", prompt)
-                response = self.model.generate_content(prompt)
+                response = self._call_model(model, prompt)
 
                 # 检查response是否有text属性，有些情况下API可能会返回错误而没有text
                 if hasattr(response, 'text') and response.text:
                     print("[generate_content] AI 响应内容:\n", response.text)
-                    return {
-                        "success": True,
-                        "content": {
-                            "title": self._extract_title(response.text),
-                            "description": self._extract_description(response.text),
-                            "script": self._extract_script(response.text),
-                            "tags": self._extract_tags(response.text)
-                        }
-                    }
+                    self.response_cache.set(cache_key, response.text)
+                    return self._build_content_result(response.text, cached=False)
                 else:
                     error_message = "AI 响应内容为空或格式不正确。"
                     if hasattr(response, 'prompt_feedback') and response.prompt_feedback:
@@ -91,136 +154,119 @@ class AIModelService:
                     }
 
             except Exception as e:
-                # 打印更详细的异常信息
-                print(f"[generate_content] AI 内容生成异常: 类型={type(e).__name__}, 详情={e}")
-                # 尝试从异常中提取更多信息，特别是对于API错误
-                if hasattr(e, 'response') and hasattr(e.response, 'text'):
-                    try:
-                        error_details = json.loads(e.response.text)
-                        print(f"[generate_content] API 错误详情: {error_details}")
-                        return {
-                            "success": False,
-                            "message": f"内容生成失败: {error_details.get('error', {}).get('message', str(e))}"
-                        }
-                    except json.JSONDecodeError:
-                        return {
-                            "success": False,
-                            "message": f"内容生成失败: API返回错误但无法解析: {e.response.text}"
-                        }
                 return {
                     "success": False,
-                    "message": f"内容生成失败，请检查网络连接或API Key是否有效: {str(e)}"
+                    "message": self._describe_generation_error(e)
                 }
         else:
             print("[generate_content] 模型为 None，使用模拟内容")
             return self._get_mock_content(topic, content_type)
 
+    def _call_model(self, model: LLMBackend, prompt: str, timeout: float = None, prefix: str = ''):
+        """
+        调用模型生成；同一时刻相同模型和 Prompt（忽略空白差异）的调用共享一次上游请求。
+        prefix 为可共享的前缀，支持前缀缓存的后端会复用已上传的前缀。
+        实际的上游请求经过限流器，token 用量按本地估算（不额外调用 count_tokens 接口）。
+        """
+        full_prompt = f"{prefix}\n{prompt}" if prefix else prompt
+
+        def send(remaining):
+            if prefix:
+                return model.generate_with_prefix(prefix, prompt, timeout=remaining)
+            return model.generate(prompt, timeout=remaining)
+
+        def limited_call():
+            return self.rate_limiter.call(send, tokens=estimate_tokens(full_prompt), timeout=timeout,
+                                          output_tokens=lambda response: estimate_tokens(response.text or ''))
+
+        response, shared = self.single_flight.do(make_flight_key(model.model_name, full_prompt), limited_call)
+        if shared:
+            print("[AIModelService] 合并了相同的并发模型请求")
+        return response
+
+    def _stream_model(self, model: LLMBackend, prompt: str):
+        """流式调用模型；相同请求的并发读者共享同一个上游流"""
+        return self.single_flight.stream(
+            make_flight_key(model.model_name, prompt),
+            lambda: self.rate_limiter.stream(lambda remaining: model.stream(prompt, timeout=remaining),
+                                             tokens=estimate_tokens(prompt), output_tokens=estimate_tokens))
+
+    def _build_content_result(self, text: str, cached: bool) -> Dict[str, Any]:
+        return {
+            "success": True,
+            "cached": cached,
+            "content": content_from_sections(parse_sections(text))
+        }
+
+    def _describe_generation_error(self, e: Exception) -> str:
+        """把内容生成过程中的异常转换为返回给前端的错误信息"""
+        # 打印更详细的异常信息
+        print(f"[generate_content] AI 内容生成异常: 类型={type(e).__name__}, 详情={e}")
+        # 尝试从异常中提取更多信息，特别是对于API错误
+        if hasattr(e, 'response') and hasattr(e.response, 'text'):
+            try:
+                error_details = json.loads(e.response.text)
+                print(f"[generate_content] API 错误详情: {error_details}")
+                return f"内容生成失败: {error_details.get('error', {}).get('message', str(e))}"
+            except json.JSONDecodeError:
+                return f"内容生成失败: API返回错误但无法解析: {e.response.text}"
+        return f"内容生成失败，请检查网络连接或API Key是否有效: {str(e)}"
+
+    def generate_content_stream(self, topic: str, content_type: str = "post", bypass_cache: bool = False):
+        """
+        流式生成内容，逐个产出 (事件名, 数据)：
+        token   —— 模型输出的文本片段
+        section —— 某个段落（title/description/script/tags）确定结束时的解析结果
+        done    —— 生成完成，附带完整内容（与 generate_content 的 content 结构相同）
+        error   —— 生成失败
+        命中缓存时不调用模型，直接产出各段落和 done。
+        """
+        print(f"[generate_content_stream] 收到请求，topic: {topic}, type: {content_type}")
+
+        model = self.model
+        if not model:
+            print("[generate_content_stream] 模型为 None，使用模拟内容")
+            content = self._get_mock_content(topic, content_type)['content']
+            for name in ('title', 'description', 'script', 'tags'):
+                yield "section", {"name": name, "value": content[name]}
+            yield "done", {"cached": False, "content": content}
+            return
+
+        parser = StreamingSectionParser()
+        try:
+            prompt = self._build_content_prompt(topic, content_type)
+            cache_key = ResponseCache.make_key(model.model_name, prompt)
+            cached_text = None if bypass_cache else self.response_cache.get(cache_key)
+            if cached_text is not None:
+                print("[generate_content_stream] 命中响应缓存")
+                for name, value in parser.feed(cached_text) + parser.close():
+                    yield "section", {"name": name, "value": value}
+                yield "done", {"cached": True, "content": content_from_sections(parser.sections)}
+                return
+
+            chunks = []
+            for text in self._stream_model(model, prompt):
+                chunks.append(text)
+                yield "token", {"text": text}
+                for name, value in parser.feed(text):
+                    yield "section", {"name": name, "value": value}
+
+            for name, value in parser.close():
+                yield "section", {"name": name, "value": value}
+
+            full_text = "".join(chunks)
+            if not full_text:
+                yield "error", {"message": "内容生成失败: AI 响应内容为空或格式不正确。"}
+                return
+            self.response_cache.set(cache_key, full_text)
+            yield "done", {"cached": False, "content": content_from_sections(parser.sections)}
+
+        except Exception as e:
+            yield "error", {"message": self._describe_generation_error(e)}
+
     def _build_content_prompt(self, topic: str, content_type: str) -> str:
-        # 根据 content_type 调整提示词，使其更准确
-        if content_type == "title":
-            return f"""
-            请为以下主题生成一个吸引人的标题：{topic}
-
-            请按以下格式返回：
-            标题：[生成一个吸引人的标题]
-
-            要求：
-            1. 标题要简洁有力，具有吸引力
-            2. 10-30字
-            3. 符合社交媒体传播特点
-            """
-        elif content_type == "post":
-            return f"""
-            请为以下主题生成社交媒体帖子内容：{topic}
-
-            请按以下格式返回：
-            标题：[生成一个吸引人的标题]
-            描述：[生成一个简洁的描述，50-100字]
-            脚本：[生成详细的内容脚本，200-500字]
-            标签：[生成3-5个相关标签，用逗号分隔]
-
-            要求：
-            1. 内容要有创意且吸引人
-            2. 符合社交媒体传播特点
-            3. 语言生动有趣
-            4. 适合目标受众
-            """
-        else:  # 默认或其他类型
-            return f"""
-            请为以下主题生成{content_type}内容：{topic}
-
-            请按以下格式返回：
-            标题：[生成一个吸引人的标题]
-            描述：[生成一个简洁的描述，50-100字]
-            脚本：[生成详细的内容脚本，200-500字]
-            标签：[生成3-5个相关标签，用逗号分隔]
-
-            要求：
-            1. 内容要有创意且吸引人
-            2. 符合社交媒体传播特点
-            3. 语言生动有趣
-            4. 适合目标受众
-            """
-
-    def _extract_title(self, text: str) -> str:
-        for line in text.splitlines():
-            if '标题' in line:
-                # 尝试更健壮的提取，避免因为中文冒号或英文冒号导致问题
-                parts = line.split('：')
-                if len(parts) > 1:
-                    return parts[-1].strip()
-                else:
-                    parts = line.split(':')  # 尝试英文冒号
-                    if len(parts) > 1:
-                        return parts[-1].strip()
-        return "AI生成标题"
-
-    def _extract_description(self, text: str) -> str:
-        for line in text.splitlines():
-            if '描述' in line:
-                parts = line.split('：')
-                if len(parts) > 1:
-                    return parts[-1].strip()
-                else:
-                    parts = line.split(':')
-                    if len(parts) > 1:
-                        return parts[-1].strip()
-        return "AI生成描述"
-
-    def _extract_script(self, text: str) -> str:
-        # 对于脚本，可能有多行，需要更复杂的提取逻辑
-        # 简单处理：找到"脚本："或"Script:"后，取到下一个关键词或行尾
-        lines = text.splitlines()
-        script_found = False
-        script_content = []
-        for line in lines:
-            if '脚本：' in line:
-                script_found = True
-                script_content.append(line.split('：')[-1].strip())
-            elif 'Script:' in line:  # 英文
-                script_found = True
-                script_content.append(line.split(':')[-1].strip())
-            elif script_found and not any(k in line for k in ['标题', '描述', '标签', 'Title', 'Description', 'Tags']):
-                # 如果已经找到了脚本开头，并且当前行不包含其他关键词，则认为是脚本内容
-                script_content.append(line.strip())
-            elif script_found and any(k in line for k in ['标题', '描述', '标签', 'Title', 'Description', 'Tags']):
-                # 遇到下一个关键词，停止收集脚本
-                break
-        return "\n".join(script_content).strip() if script_content else "AI生成脚本"
-
-    def _extract_tags(self, text: str) -> List[str]:
-        for line in text.splitlines():
-            if '标签' in line:
-                parts = line.split('：')
-                if len(parts) > 1:
-                    tags = parts[-1].strip()
-                    return [tag.strip() for tag in tags.split(',') if tag.strip()]
-                else:
-                    parts = line.split(':')
-                    if len(parts) > 1:
-                        tags = parts[-1].strip()
-                        return [tag.strip() for tag in tags.split(',') if tag.strip()]
-        return ["AI", "生成", "标签"]
+        # 根据 content_type 选择模板（标题 / 帖子 / 其他类型）
+        return self.prompt_builder.content_prompt(topic, content_type).text
 
     def _get_mock_content(self, topic: str, content_type: str) -> Dict[str, Any]:
         # 模拟数据也根据 content_type 略微调整
@@ -245,92 +291,173 @@ class AIModelService:
                 }
             }
 
+    def detect_risk(self, content: str, bypass_cache: bool = False) -> Dict[str, Any]:
+        """
+        内容风险检测。先用本地规则引擎扫描：未命中规则或明确违规的内容直接返回规则判定；
+        只有命中依赖上下文的规则（如"最好"、"第一"）时才请求模型复核，复核响应会被缓存。
+        模型不可用或复核失败时沿用规则判定。
+        """
+        verdict = self.risk_engine.scan(content)
+        rule_assessment = self._rule_risk_assessment(verdict)
+        if not verdict["needs_review"]:
+            return {"success": True, "risk_assessment": rule_assessment}
+
+        model = self.model
+        if not model:
+            print("[detect_risk] 模型为 None，使用规则判定")
+            return {"success": True, "risk_assessment": rule_assessment}
+        return {"success": True, "risk_assessment": self._review_risk(model, content, verdict, rule_assessment,
+                                                                      bypass_cache)}
+
+    def iter_detect_risk(self, contents: List[str], max_concurrency: int = None, bypass_cache: bool = False):
+        """
+        批量风险检测：相同文本只检测一次。规则引擎在当前线程逐条扫描（每条微秒级），
+        需要AI复核的内容提交到有界线程池并发复核，复核进行期间先产出规则判定的结果。
+        按完成顺序产出 (下标列表, 检测结果, 耗时秒数)，下标列表为该文本在 contents 中的所有位置。
+        调用方提前关闭生成器（如客户端断开连接）时，尚未开始的复核会被取消。
+        """
+        positions = {}
+        for index, content in enumerate(contents):
+            positions.setdefault(content, []).append(index)
+        max_concurrency = min(max(1, int(max_concurrency or DEFAULT_RISK_CONCURRENCY)), MAX_RISK_CONCURRENCY)
+
+        model = self.model
+        executor = None
+        futures = {}
+        rule_results = []
+        try:
+            for content, indices in positions.items():
+                started = time.perf_counter()
+                verdict = self.risk_engine.scan(content)
+                rule_assessment = self._rule_risk_assessment(verdict)
+                if verdict["needs_review"] and model:
+                    if executor is None:
+                        executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="detect_risk")
+                    future = executor.submit(self._timed_review_risk, model, content, verdict, rule_assessment,
+                                             bypass_cache, time.perf_counter() - started)
+                    futures[future] = indices
+                else:
+                    rule_results.append((indices, rule_assessment, time.perf_counter() - started))
+            print(f"[detect_risk] 批量检测 {len(contents)} 条，去重后 {len(positions)} 条，"
+                  f"需要AI复核 {len(futures)} 条")
+
+            for indices, rule_assessment, elapsed in rule_results:
+                yield indices, {"success": True, "risk_assessment": rule_assessment}, elapsed
+            for future in as_completed(futures):
+                assessment, elapsed = future.result()
+                yield futures[future], {"success": True, "risk_assessment": assessment}, elapsed
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def _timed_review_risk(self, model: LLMBackend, content: str, verdict: Dict[str, Any],
+                           rule_assessment: Dict[str, Any], bypass_cache: bool, scan_seconds: float):
+        """在线程池中执行AI复核，返回 (风险判定, 规则扫描与复核的总耗时)；排队等待的时间不计入"""
+        started = time.perf_counter()
+        assessment = self._review_risk(model, content, verdict, rule_assessment, bypass_cache)
+        return assessment, scan_seconds + time.perf_counter() - started
+
+    @staticmethod
+    def _rule_risk_assessment(verdict: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "overall_risk": verdict["overall_risk"],
+            **{category: verdict[category] for category in RISK_CATEGORIES},
+            "suggestions": verdict["suggestions"],
+            "risk_score": verdict["risk_score"],
+            "matches": verdict["matches"],
+            "needs_review": verdict["needs_review"],
+            "source": "rules",
+            "escalated": False
+        }
+
+    def _review_risk(self, model: LLMBackend, content: str, verdict: Dict[str, Any],
+                     rule_assessment: Dict[str, Any], bypass_cache: bool) -> Dict[str, Any]:
+        """请求模型复核规则引擎的命中；复核失败时返回规则判定"""
+        try:
+            prompt = self.prompt_builder.risk_prompt(content, verdict["matches"]).text
+            cache_key = ResponseCache.make_key(model.model_name, prompt)
+            text = None if bypass_cache else self.response_cache.get(cache_key)
+            cached = text is not None
+            if not cached:
+                response = self._call_model(model, prompt, RISK_REVIEW_TIMEOUT)
+                text = response.text if hasattr(response, 'text') else ''
+            reviewed = self._parse_risk_response(text or '')
+            if reviewed is None:
+                print("[detect_risk] AI 复核结果无法解析，使用规则判定")
+                return rule_assessment
+            if not cached:
+                self.response_cache.set(cache_key, text)
+        except Exception as e:
+            print(f"[detect_risk] AI 复核异常: 类型={type(e).__name__}, 详情={e}，使用规则判定")
+            return rule_assessment
+
+        return {
+            **rule_assessment,
+            **reviewed,
+            "suggestions": reviewed["suggestions"] or (
+                ["内容未发现明显风险，可以发布"] if reviewed["overall_risk"] == "低" else rule_assessment["suggestions"]),
+            "risk_score": risk_score(reviewed["overall_risk"], len(verdict["matches"])),
+            "source": "ai",
+            "escalated": True,
+            "cached": cached
+        }
+
+    def _parse_risk_response(self, text: str) -> Dict[str, Any]:
+        """
+        解析AI返回的风险复核JSON对象，兼容 ```json 代码块包裹的情况。
+        无法解析或缺少维度时返回 None；总体风险缺失时取各维度的最高等级。
+        """
+        start, end = text.find('{'), text.rfind('}')
+        if start == -1 or end <= start:
+            return None
+        try:
+            data = json.loads(text[start:end + 1])
+        except json.JSONDecodeError:
+            return None
+        if not isinstance(data, dict):
+            return None
+
+        result = {}
+        for category in RISK_CATEGORIES:
+            item = data.get(category)
+            if not isinstance(item, dict) or item.get('level') not in RISK_LEVELS:
+                return None
+            result[category] = {"level": item['level'], "reason": str(item.get('reason') or "无")}
+        overall = data.get('overall_risk')
+        if overall not in RISK_LEVELS:
+            overall = max((result[c]['level'] for c in RISK_CATEGORIES), key=RISK_LEVELS.index)
+        result['overall_risk'] = overall
+        suggestions = data.get('suggestions') or []
+        result['suggestions'] = [str(s) for s in suggestions] if isinstance(suggestions, list) else [str(suggestions)]
+        return result
+
     # 修改后的 smart_match 方法，接收创作者列表
-    def smart_match(self, brand_info: Dict[str, Any], creators: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def smart_match(self, brand_info: Dict[str, Any], creators: List[Dict[str, Any]],
+                    max_concurrency: int = None, timeout: float = None, batch_size: int = None,
+                    bypass_cache: bool = False) -> Dict[str, Any]:
         """
         根据品牌信息，与给定的创作者列表进行智能匹配。
         对于每个创作者，构建一个Prompt让AI评估匹配度。
+        各创作者的评估通过有界线程池并发执行：
+        max_concurrency 控制同时进行的AI调用数量，timeout 为单个创作者评估的超时时间（秒），
+        未传入时分别读取环境变量 AI_MATCH_CONCURRENCY / AI_MATCH_TIMEOUT。
+        batch_size 大于 1 时启用批量模式：每次调用把多个创作者打包进同一个Prompt，
+        要求AI返回JSON数组；解析失败时拆分批次重试，直至退化为单个创作者的评估。
+        已评估过且品牌、创作者资料均未变化的组合直接复用保存的结果，只重新评估新增或修改过的创作者；
+        bypass_cache 为 True 时全部重新评估。
         """
         print(f"[smart_match] 收到品牌匹配请求，品牌: {brand_info.get('name', 'N/A')}")
 
-        matched_results = []
-
         if self.model:
-            for creator_info in creators:  # 遍历创作者列表
-                try:
-                    print(f"  - 正在匹配创作者: {creator_info.get('name', 'N/A')}")
-                    # 构建一个用于匹配的Prompt
-                    match_prompt = f"""
-                    请根据以下品牌信息和创作者信息，评估该创作者与品牌的匹配度，并给出匹配理由。
-                    要求：
-                    1. 匹配度：高/中/低
-                    2. 匹配理由：详细说明匹配或不匹配的原因。
-                    3. 如果匹配度为中或高，请给出1-2点合作建议。
-
-                    品牌信息：
-                    品牌名称：{brand_info.get('name', '未知品牌')}
-                    品牌描述：{brand_info.get('description', '无描述')}
-                    目标受众：{brand_info.get('target_audience', '不明确')}
-                    主要产品/服务：{brand_info.get('products_services', '不明确')}
-
-                    创作者信息：
-                    创作者名称：{creator_info.get('name', '未知创作者')}
-                    创作者领域/标签：{', '.join(creator_info.get('tags', [])) if creator_info.get('tags') else '无标签'}
-                    创作者风格：{creator_info.get('style', '不明确')}
-                    粉丝数量：{creator_info.get('followers', '不明确')}
-                    过往合作案例：{creator_info.get('past_collaborations', '无')}
-
-                    请按以下格式返回：
-                    匹配度：[高/中/低]
-                    匹配理由：[详细说明匹配原因]
-                    合作建议：[如果匹配度为中或高，请给出1-2点建议，否则写无]
-                    """
-
-                    # print("[smart_match] 使用的 prompt:\n", match_prompt) # 匹配多个创作者时，避免打印过多Prompt
-                    response = self.model.generate_content(match_prompt)
-
-                    if hasattr(response, 'text') and response.text:
-                        # print(f"  - AI 响应内容 for {creator_info.get('name')}:\n", response.text) # 匹配多个创作者时，避免打印过多响应
-                        parsed_result = self._parse_match_response(response.text)
-
-                        # 将创作者信息与匹配结果合并
-                        combined_result = {
-                            **creator_info,  # 包含完整的创作者信息
-                            "match_details": parsed_result  # AI评估的匹配度、理由、建议
-                        }
-                        matched_results.append(combined_result)
-                    else:
-                        error_message = "AI 响应内容为空或格式不正确。"
-                        if hasattr(response, 'prompt_feedback') and response.prompt_feedback:
-                            error_message += f" 提示反馈: {response.prompt_feedback}"
-                        print(f"  - 创作者 {creator_info.get('name')} 匹配失败: {error_message}")
-                        # 即使匹配失败，也将其加入结果，但标记为失败或提供默认信息
-                        matched_results.append({
-                            **creator_info,
-                            "match_details": {
-                                "match_score": "未知",
-                                "reason": f"AI评估失败: {error_message}",
-                                "suggestions": "无"
-                            }
-                        })
-
-                except Exception as e:
-                    print(
-                        f"[smart_match] AI 匹配生成异常 for {creator_info.get('name')}: 类型={type(e).__name__}, 详情={e}")
-                    # 在异常情况下，也要将创作者加入结果列表，避免遗漏
-                    matched_results.append({
-                        **creator_info,
-                        "match_details": {
-                            "match_score": "未知",
-                            "reason": f"匹配过程出错: {str(e)}",
-                            "suggestions": "无"
-                        }
-                    })
-
-            # 您可能需要在这里对 matched_results 进行排序，例如按匹配度高低
-            # 示例：按匹配度从高到低排序 (高 > 中 > 低)
-            score_order = {"高": 3, "中": 2, "低": 1, "未知": 0}
-            matched_results.sort(key=lambda x: score_order.get(x['match_details']['match_score'], 0), reverse=True)
+            # 按输入顺序预留结果位置，保证排序前的顺序与串行版本一致
+            matched_results = [None] * len(creators)
+            for index, result in self.iter_smart_match(brand_info, creators, max_concurrency=max_concurrency,
+                                                       timeout=timeout, batch_size=batch_size,
+                                                       bypass_cache=bypass_cache):
+                matched_results[index] = result
+
+            # 按匹配度从高到低排序 (高 > 中 > 低)
+            self.sort_match_results(matched_results)
 
             return {
                 "success": True,
@@ -340,6 +467,218 @@ class AIModelService:
             print("[smart_match] 模型为 None，使用模拟匹配结果")
             return self._get_mock_match_result(brand_info, creators)  # 调整这里，传入整个创作者列表
 
+    def iter_smart_match(self, brand_info: Dict[str, Any], creators: List[Dict[str, Any]],
+                         max_concurrency: int = None, timeout: float = None, batch_size: int = None,
+                         bypass_cache: bool = False):
+        """
+        smart_match 的流式版本：每当一位创作者的匹配结果就绪，立即产出 (创作者下标, 匹配结果)，
+        已保存的结果最先产出。调用方提前关闭生成器（如客户端断开连接）时，尚未开始的评估会被取消。
+        """
+        if not self.model:
+            yield from enumerate(self._get_mock_match_result(brand_info, creators)['match_result'])
+            return
+
+        max_concurrency = min(max(1, int(max_concurrency or DEFAULT_MATCH_CONCURRENCY)), MAX_MATCH_CONCURRENCY)
+        timeout = float(timeout or DEFAULT_MATCH_TIMEOUT)
+        batch_size = min(max(1, int(batch_size or DEFAULT_MATCH_BATCH_SIZE)), MAX_MATCH_BATCH_SIZE)
+        model_name = self.model.model_name
+
+        pending_indices = []
+        for index, creator_info in enumerate(creators):
+            details = None if bypass_cache else self.match_store.get(brand_info, creator_info, model_name)
+            if details:
+                yield index, {**creator_info, "match_details": details}
+            else:
+                pending_indices.append(index)
+        print(f"[smart_match] 复用已保存结果 {len(creators) - len(pending_indices)} 个，"
+              f"需要评估 {len(pending_indices)} 个")
+
+        pending_creators = [creators[i] for i in pending_indices]
+        tasks = self._run_match_tasks(brand_info, pending_creators, max_concurrency, timeout, batch_size)
+        try:
+            for position, result in tasks:
+                index = pending_indices[position]
+                # 失败的评估不保存，下次请求会重新评估
+                if result['match_details']['match_score'] != "未知":
+                    self.match_store.put(brand_info, creators[index], model_name, result['match_details'])
+                yield index, result
+        finally:
+            # 显式关闭以便立即取消排队中的评估任务
+            tasks.close()
+
+    @staticmethod
+    def sort_match_results(matched_results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """按匹配度从高到低原地排序（稳定排序，同分保持原顺序）"""
+        matched_results.sort(key=lambda x: MATCH_SCORE_ORDER.get(x['match_details']['match_score'], 0), reverse=True)
+        return matched_results
+
+    def _run_match_tasks(self, brand_info: Dict[str, Any], creators: List[Dict[str, Any]],
+                         max_concurrency: int, timeout: float, batch_size: int):
+        """
+        在有界线程池中调度匹配任务，按完成顺序逐个产出 (创作者下标, 匹配结果)。
+        每个任务是一组创作者下标：批量解析不完整时，未得到结果的创作者会被拆成两半重新提交。
+        超时从任务真正开始执行时计时，排队等待的时间不计入。
+        """
+        started_at = {}  # 任务ID -> 开始执行的时间
+        futures = {}  # future -> (任务ID, 创作者下标列表)
+        task_ids = itertools.count()
+        executor = ThreadPoolExecutor(max_workers=min(max_concurrency, max(1, len(creators))),
+                                      thread_name_prefix="smart_match")
+
+        def submit(indices):
+            task_id = next(task_ids)
+            future = executor.submit(self._run_match_task, brand_info,
+                                     [creators[i] for i in indices], timeout, started_at, task_id)
+            futures[future] = (task_id, indices)
+            return future
+
+        try:
+            pending = {submit(list(range(offset, min(offset + batch_size, len(creators)))))
+                       for offset in range(0, len(creators), batch_size)}
+            while pending:
+                done, pending = wait(pending, timeout=min(timeout, 0.5), return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    _, indices = futures.pop(future)
+                    try:
+                        batch_results = future.result()
+                    except Exception as e:
+                        print(f"[smart_match] AI 匹配生成异常 for "
+                              f"{[creators[i].get('name') for i in indices]}: 类型={type(e).__name__}, 详情={e}")
+                        for i in indices:
+                            yield i, self._build_match_failure(creators[i], f"匹配过程出错: {str(e)}")
+                        continue
+
+                    # 批量结果按位置对应；None 表示该创作者未能从批量响应中解析出结果
+                    missing = []
+                    for i, result in zip(indices, batch_results):
+                        if result is None:
+                            missing.append(i)
+                        else:
+                            yield i, result
+                    if missing:
+                        print(f"  - 批量匹配有 {len(missing)} 位创作者未解析成功，拆分批次重试")
+                        half = (len(missing) + 1) // 2
+                        for part in (missing[:half], missing[half:]):
+                            if part:
+                                pending.add(submit(part))
+
+                now = time.monotonic()
+                for future in list(pending):
+                    task_id, indices = futures[future]
+                    start = started_at.get(task_id)
+                    if start is not None and now - start > timeout:
+                        pending.discard(future)
+                        future.cancel()
+                        del futures[future]
+                        for i in indices:
+                            print(f"  - 创作者 {creators[i].get('name')} 匹配超时（{timeout}秒）")
+                            yield i, self._build_match_failure(creators[i], f"匹配过程出错: 评估超时（{timeout}秒）")
+        finally:
+            # 不等待已超时的线程，直接返回结果
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run_match_task(self, brand_info: Dict[str, Any], batch: List[Dict[str, Any]],
+                        timeout: float, started_at: Dict[int, float], task_id: int) -> List[Any]:
+        """
+        线程池中执行的单个匹配任务：记录开始时间后，按批次大小选择单个或批量评估。
+        """
+        started_at[task_id] = time.monotonic()
+        if len(batch) == 1:
+            return [self._match_single_creator(brand_info, batch[0], timeout)]
+        return self._match_creator_batch(brand_info, batch, timeout)
+
+    def _match_creator_batch(self, brand_info: Dict[str, Any], batch: List[Dict[str, Any]],
+                             timeout: float) -> List[Any]:
+        """
+        把一批创作者打包进同一个Prompt评估，返回与 batch 位置对应的结果列表，
+        未能解析出结果的位置为 None。
+        """
+        print(f"  - 正在批量匹配 {len(batch)} 位创作者: {[c.get('name', 'N/A') for c in batch]}")
+        creator_keys = [str(creator_info.get('id', position)) for position, creator_info in enumerate(batch)]
+        prompt = self.prompt_builder.batch_match_prompt(brand_info, batch, creator_keys)
+        print(f"  - 批量匹配 Prompt 约 {prompt.tokens} tokens（共享前缀 {prompt.prefix_tokens}）")
+
+        response = self._call_model(self.model, prompt.body, timeout, prefix=prompt.prefix)
+        if not (hasattr(response, 'text') and response.text):
+            print(f"  - 批量匹配响应为空，拆分批次重试")
+            return [None] * len(batch)
+
+        parsed = self._parse_batch_match_response(response.text)
+        results = []
+        for key, creator_info in zip(creator_keys, batch):
+            details = parsed.get(key)
+            results.append({**creator_info, "match_details": details} if details else None)
+        return results
+
+    def _parse_batch_match_response(self, text: str) -> Dict[str, Dict[str, Any]]:
+        """
+        解析批量匹配返回的JSON数组，返回 创作者ID -> 匹配详情 的映射。
+        兼容模型用 ```json 代码块包裹的情况；无法解析或字段不合法的元素会被忽略。
+        """
+        start, end = text.find('['), text.rfind(']')
+        if start == -1 or end <= start:
+            return {}
+        try:
+            items = json.loads(text[start:end + 1])
+        except json.JSONDecodeError:
+            return {}
+
+        parsed = {}
+        for item in items if isinstance(items, list) else []:
+            if not isinstance(item, dict) or item.get('match_score') not in ("高", "中", "低"):
+                continue
+            suggestions = item.get('suggestions') or "无"
+            if isinstance(suggestions, list):
+                suggestions = "；".join(str(s) for s in suggestions)
+            parsed[str(item.get('creator_id'))] = {
+                "match_score": item['match_score'],
+                "reason": str(item.get('reason') or "AI未能解析匹配理由。"),
+                "suggestions": str(suggestions)
+            }
+        return parsed
+
+    def _match_single_creator(self, brand_info: Dict[str, Any], creator_info: Dict[str, Any],
+                              timeout: float) -> Dict[str, Any]:
+        """
+        评估单个创作者与品牌的匹配度（在线程池中执行）。
+        """
+        print(f"  - 正在匹配创作者: {creator_info.get('name', 'N/A')}")
+        # 构建一个用于匹配的Prompt：说明与品牌信息作为前缀，同一品牌的所有创作者共享
+        prompt = self.prompt_builder.match_prompt(brand_info, creator_info)
+
+        # 匹配多个创作者时，避免打印过多Prompt和响应
+        response = self._call_model(self.model, prompt.body, timeout, prefix=prompt.prefix)
+
+        if hasattr(response, 'text') and response.text:
+            parsed_result = self._parse_match_response(response.text)
+
+            # 将创作者信息与匹配结果合并
+            return {
+                **creator_info,  # 包含完整的创作者信息
+                "match_details": parsed_result  # AI评估的匹配度、理由、建议
+            }
+
+        error_message = "AI 响应内容为空或格式不正确。"
+        if hasattr(response, 'prompt_feedback') and response.prompt_feedback:
+            error_message += f" 提示反馈: {response.prompt_feedback}"
+        print(f"  - 创作者 {creator_info.get('name')} 匹配失败: {error_message}")
+        # 即使匹配失败，也将其加入结果，但标记为失败或提供默认信息
+        return self._build_match_failure(creator_info, f"AI评估失败: {error_message}")
+
+    def _build_match_failure(self, creator_info: Dict[str, Any], reason: str) -> Dict[str, Any]:
+        """
+        构建单个创作者匹配失败时的结果条目，避免创作者在结果中遗漏。
+        """
+        return {
+            **creator_info,
+            "match_details": {
+                "match_score": "未知",
+                "reason": reason,
+                "suggestions": "无"
+            }
+        }
+
     def _parse_match_response(self, text: str) -> Dict[str, Any]:
         """
         解析AI返回的匹配结果文本。您需要根据Prompt中定义的返回格式来编写此解析逻辑。
@@ -0,0 +1,98 @@
+# mcn_ai_system/src/services/candidate_ranker.py
+import heapq
+import re
+from typing import Dict, List, Any
+
+# 本地预排序各项得分的默认权重，可由请求中的 ranking_weights 覆盖
+DEFAULT_RANKING_WEIGHTS = {
+    "tag_overlap": 0.4,  # 创作者领域/标签与品牌信息的重合度
+    "followers": 0.2,  # 粉丝量（相对品牌要求的门槛）
+    "engagement": 0.2,  # 互动率
+    "potential": 0.2  # 潜力评分
+}
+
+# 品牌信息中用于标签比对的字段
+BRAND_TEXT_FIELDS = ('category', 'description', 'target_audience', 'products_services', 'requirements')
+
+_FOLLOWER_PATTERN = re.compile(r'粉丝(?:量|数)?\s*(\d+(?:\.\d+)?)\s*(万|w|W|k|K)?\s*\+?')
+_ENGAGEMENT_PATTERN = re.compile(r'互动率\s*(\d+(?:\.\d+)?)\s*%')
+_UNIT_MULTIPLIERS = {'万': 10000, 'w': 10000, 'W': 10000, 'k': 1000, 'K': 1000}
+
+
+def parse_requirement_thresholds(requirements: str) -> Dict[str, float]:
+    """
+    从品牌的 requirements 文本中解析粉丝量与互动率门槛，
+    例如 "粉丝量10万+，互动率5%+" -> {"min_followers": 100000, "min_engagement_rate": 5.0}
+    """
+    thresholds = {}
+    if not requirements:
+        return thresholds
+
+    match = _FOLLOWER_PATTERN.search(requirements)
+    if match:
+        thresholds["min_followers"] = float(match.group(1)) * _UNIT_MULTIPLIERS.get(match.group(2), 1)
+    match = _ENGAGEMENT_PATTERN.search(requirements)
+    if match:
+        thresholds["min_engagement_rate"] = float(match.group(1))
+    return thresholds
+
+
+def normalize_weights(weights: Dict[str, Any] = None) -> Dict[str, float]:
+    """合并请求传入的权重与默认权重，忽略未知项和非法值"""
+    merged = dict(DEFAULT_RANKING_WEIGHTS)
+    for name, value in (weights or {}).items():
+        if name in merged:
+            try:
+                merged[name] = max(0.0, float(value))
+            except (TypeError, ValueError):
+                continue
+    return merged
+
+
+def rank_candidates(brand_info: Dict[str, Any], creators: List[Dict[str, Any]],
+                    top_k: int, weights: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+    """
+    在调用大模型之前，用本地规则为创作者打分并返回得分最高的 top_k 位。
+    打分只依赖创作者已有的结构化字段，单次排序为 O(n log k)。
+    top_k 不大于 0 或不小于创作者数量时原样返回。
+    """
+    if top_k <= 0 or top_k >= len(creators):
+        return creators
+
+    weights = normalize_weights(weights)
+    thresholds = parse_requirement_thresholds(brand_info.get('requirements', ''))
+    brand_text = " ".join(str(brand_info.get(field, '')) for field in BRAND_TEXT_FIELDS)
+    brand_category = brand_info.get('category')
+
+    max_followers = max((c.get('followers') or 0 for c in creators), default=0) or 1
+    max_engagement = max((c.get('engagement_rate') or 0 for c in creators), default=0) or 1
+
+    def score(creator_info: Dict[str, Any]) -> float:
+        # 标签重合度：领域一致直接满分，否则按出现在品牌信息中的标签比例计分
+        tags = creator_info.get('tags') or []
+        if brand_category and creator_info.get('category') == brand_category:
+            tag_score = 1.0
+        elif tags:
+            tag_score = sum(1 for tag in tags if tag and tag in brand_text) / len(tags)
+        else:
+            tag_score = 0.0
+
+        followers = creator_info.get('followers') or 0
+        min_followers = thresholds.get('min_followers')
+        follower_score = min(1.0, followers / min_followers) if min_followers else followers / max_followers
+
+        engagement = creator_info.get('engagement_rate') or 0
+        engagement_score = engagement / max_engagement
+        if engagement < thresholds.get('min_engagement_rate', 0):
+            engagement_score *= 0.5
+
+        potential_score = min(1.0, (creator_info.get('potential_score') or 0) / 100)
+
+        return (weights["tag_overlap"] * tag_score
+                + weights["followers"] * follower_score
+                + weights["engagement"] * engagement_score
+                + weights["potential"] * potential_score)
+
+    # 同分时保持原有顺序
+    ranked = heapq.nlargest(top_k, enumerate(creators), key=lambda item: (score(item[1]), -item[0]))
+    return [creator_info for _, creator_info in ranked]
@@ -0,0 +1,126 @@
+# mcn_ai_system/src/services/content_parser.py
+import re
+from typing import Dict, List, Any, Tuple
+
+# 段落关键词（中英文）-> 段落名称
+SECTION_KEYWORDS = {
+    '标题': 'title', 'Title': 'title',
+    '描述': 'description', 'Description': 'description',
+    '脚本': 'script', 'Script': 'script',
+    '标签': 'tags', 'Tags': 'tags'
+}
+# 单行段落：行结束即完整；描述和脚本可能跨多行，遇到下一个段落标题或输出结束才完整
+SINGLE_LINE_SECTIONS = ('title', 'tags')
+
+# 段落标题行：允许前后带 Markdown 标记（如 "**标题**：" / "- 标签:"），兼容全角、半角冒号。
+# 整段文本解析时配合 re.M 一次扫描找出所有标题行；流式解析时逐行匹配，两者规则一致。
+_HEADER_PATTERN = re.compile(
+    r'^[ \t*#>\-\d.]*(' + '|'.join(SECTION_KEYWORDS) + r')[ \t*]*[：:][ \t*]*(.*?)[ \t*\r]*$',
+    re.M
+)
+_TAG_SPLIT = re.compile(r'[,，、]')
+
+
+def parse_tags(value: str) -> List[str]:
+    return [tag.strip() for tag in _TAG_SPLIT.split(value) if tag.strip()]
+
+
+def _section_value(name: str, first_line: str, body: str) -> Any:
+    if name in SINGLE_LINE_SECTIONS:
+        value = first_line.strip()
+    else:
+        lines = [first_line] + body.split('\n') if body else [first_line]
+        value = "\n".join(line.strip() for line in lines).strip()
+    return parse_tags(value) if name == 'tags' else value
+
+
+def parse_sections(text: str) -> Dict[str, Any]:
+    """
+    一次扫描解析整段模型输出，返回 段落名称 -> 内容 的映射。
+    先用多行正则定位所有段落标题行，再按标题位置切片取内容，不逐行重复扫描全文；
+    同一段落出现多次时以第一次为准。
+    """
+    sections = {}
+    matches = list(_HEADER_PATTERN.finditer(text))
+    for i, match in enumerate(matches):
+        name = SECTION_KEYWORDS[match.group(1)]
+        if name in sections:
+            continue
+        body = ''
+        if name not in SINGLE_LINE_SECTIONS:
+            end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+            body = text[match.end() + 1:end]
+        sections[name] = _section_value(name, match.group(2), body)
+    return sections
+
+
+class StreamingSectionParser:
+    """
+    增量段落解析器：按任意大小的文本片段喂入模型输出，
+    每当某个段落可以确定结束时立即产出 (段落名称, 内容)。
+    解析规则与 parse_sections 相同，全部喂入后 sections 与整段解析的结果一致。
+    """
+
+    def __init__(self):
+        self._buffer = ''  # 尚未遇到换行的残余文本
+        self._current = None  # 正在收集的多行段落：(名称, 标题行内容)
+        self._lines = []
+        self.sections = {}
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        if '\n' not in chunk:
+            self._buffer += chunk
+            return []
+        completed = []
+        *lines, rest = (self._buffer + chunk).split('\n')
+        self._buffer = rest
+        for line in lines:
+            completed.extend(self._consume_line(line))
+        return completed
+
+    def close(self) -> List[Tuple[str, Any]]:
+        completed = []
+        if self._buffer:
+            completed.extend(self._consume_line(self._buffer))
+            self._buffer = ''
+        completed.extend(self._finish_current())
+        return completed
+
+    def _consume_line(self, line: str) -> List[Tuple[str, Any]]:
+        match = _HEADER_PATTERN.match(line)
+        if not match:
+            if self._current:
+                self._lines.append(line)
+            return []
+
+        completed = self._finish_current()
+        name = SECTION_KEYWORDS[match.group(1)]
+        if name in SINGLE_LINE_SECTIONS:
+            completed.extend(self._emit(name, match.group(2), ''))
+        else:
+            self._current, self._lines = (name, match.group(2)), []
+        return completed
+
+    def _finish_current(self) -> List[Tuple[str, Any]]:
+        if not self._current:
+            return []
+        (name, first_line), body = self._current, "\n".join(self._lines)
+        self._current, self._lines = None, []
+        return self._emit(name, first_line, body)
+
+    def _emit(self, name: str, first_line: str, body: str) -> List[Tuple[str, Any]]:
+        if name in self.sections:
+            return []
+        value = _section_value(name, first_line, body)
+        self.sections[name] = value
+        return [(name, value)]
+
+
+def content_from_sections(sections: Dict[str, Any]) -> Dict[str, Any]:
+    """把解析出的段落补齐默认值，得到与 generate_content 相同结构的内容字典"""
+    return {
+        "title": sections.get('title') or "AI生成标题",
+        "description": sections.get('description') or "AI生成描述",
+        "script": sections.get('script') or "AI生成脚本",
+        "tags": sections.get('tags') or ["AI", "生成", "标签"]
+    }
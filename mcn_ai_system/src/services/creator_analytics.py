@@ -0,0 +1,238 @@
+# mcn_ai_system/src/services/creator_analytics.py
+import os
+import threading
+from collections import OrderedDict
+from datetime import date
+from typing import Dict, Any, Tuple
+
+import numpy as np
+
+METRICS = ('views', 'likes', 'comments', 'shares', 'followers_growth')
+GRANULARITIES = ('day', 'week')
+
+# 演示数据的随机种子；同一种子下同一创作者同一天的数据始终相同
+ANALYTICS_SEED = int(os.getenv('ANALYTICS_SEED', '20240601'))
+# 常驻内存的时间序列窗口（天，截至今天）与缓存的创作者数量
+ANALYTICS_HISTORY_DAYS = int(os.getenv('ANALYTICS_HISTORY_DAYS', '400'))
+ANALYTICS_MAX_CREATORS = int(os.getenv('ANALYTICS_MAX_CREATORS', '1024'))
+# 单次查询允许的最大日期跨度（天）
+ANALYTICS_MAX_RANGE_DAYS = int(os.getenv('ANALYTICS_MAX_RANGE_DAYS', '3660'))
+
+# 趋势项以该日期为基准，保证数据只取决于日期本身，与查询窗口无关
+_TREND_ANCHOR = np.datetime64('2024-01-01', 'D').astype(np.int64)
+
+
+def _mix(*values: int) -> np.uint64:
+    """把若干整数混合为一个 64 位种子"""
+    state = np.array([0x243F6A8885A308D3], dtype=np.uint64)
+    for value in values:
+        state = _splitmix64(state ^ np.uint64(value & 0xFFFFFFFFFFFFFFFF))
+    return state[0]
+
+
+def _splitmix64(x: np.ndarray) -> np.ndarray:
+    """SplitMix64 终结函数（uint64 溢出按模 2^64 回绕）"""
+    x = x + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def _uniform(key: np.uint64, days: np.ndarray) -> np.ndarray:
+    """按 (种子, 日期) 计数器生成 [0, 1) 均匀随机数：任意日期区间都可向量化生成，且同一天的值固定"""
+    with np.errstate(over='ignore'):
+        bits = _splitmix64(days.astype(np.uint64) ^ key)
+    return (bits >> np.uint64(11)).astype(np.float64) * (1.0 / (1 << 53))
+
+
+class CreatorSeries:
+    """一位创作者的列式时间序列：days 为自 1970-01-01 起的天数（升序连续），每个指标一列 int64"""
+
+    def __init__(self, creator_id: int, days: np.ndarray, columns: Dict[str, np.ndarray]):
+        self.creator_id = creator_id
+        self.days = days
+        self.columns = columns
+
+    def slice(self, start: int, end: int) -> 'CreatorSeries':
+        """截取 [start, end] 天的数据（闭区间，需在窗口内），返回共享内存的视图"""
+        lo, hi = start - int(self.days[0]), end - int(self.days[0]) + 1
+        return CreatorSeries(self.creator_id, self.days[lo:hi], {m: c[lo:hi] for m, c in self.columns.items()})
+
+
+def generate_series(creator_id: int, start: int, end: int, seed: int = ANALYTICS_SEED) -> CreatorSeries:
+    """
+    生成创作者在 [start, end] 天的演示数据。创作者画像（基础播放量、趋势、各互动率）由种子和创作者ID确定，
+    每天的波动由 (种子, 创作者ID, 指标, 日期) 计数器生成，因此任意区间生成的同一天数据完全一致。
+    """
+    profile = np.random.default_rng([seed, creator_id])
+    base_views = profile.uniform(20000, 80000)
+    trend = profile.uniform(-0.0004, 0.0012)  # 每天的对数增长率
+    like_rate, comment_rate, share_rate = profile.uniform(0.05, 0.1), profile.uniform(0.005, 0.01), \
+        profile.uniform(0.0025, 0.006)
+    follow_base = profile.uniform(50, 300)
+
+    days = np.arange(start, end + 1, dtype=np.int64)
+    noise = {name: _uniform(_mix(seed, creator_id, index), days)
+             for index, name in enumerate(('views', 'likes', 'comments', 'shares', 'followers', 'unfollows'))}
+    weekend = ((days + 3) % 7) >= 5  # 1970-01-01 是星期四
+    level = np.clip(np.exp(trend * (days - _TREND_ANCHOR)), 0.3, 3.0)
+
+    views = base_views * level * np.where(weekend, 1.25, 1.0) * (0.75 + 0.5 * noise['views'])
+    columns = {
+        'views': np.rint(views).astype(np.int64),
+        'likes': np.rint(views * like_rate * (0.8 + 0.4 * noise['likes'])).astype(np.int64),
+        'comments': np.rint(views * comment_rate * (0.8 + 0.4 * noise['comments'])).astype(np.int64),
+        'shares': np.rint(views * share_rate * (0.8 + 0.4 * noise['shares'])).astype(np.int64),
+        'followers_growth': np.rint(follow_base * level * (0.4 + 1.2 * noise['followers'])
+                                    - 100 * noise['unfollows']).astype(np.int64)
+    }
+    return CreatorSeries(creator_id, days, columns)
+
+
+def day_number(value: date) -> int:
+    return (value - date(1970, 1, 1)).days
+
+
+def rollup(series: CreatorSeries, granularity: str) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    按日或按周（周一为一周开始）汇总，返回 (每个区间的起始天, 指标 -> 汇总值)；
+    首尾不完整的周只汇总区间内的天数，起始天为区间内的第一天。
+    """
+    if granularity == 'day':
+        return series.days, series.columns
+    week_starts = series.days - (series.days + 3) % 7
+    # days 连续升序，每周第一次出现的位置即分组边界
+    boundaries = np.flatnonzero(np.r_[True, week_starts[1:] != week_starts[:-1]])
+    return series.days[boundaries], {m: np.add.reduceat(c, boundaries) for m, c in series.columns.items()}
+
+
+def moving_average(values: np.ndarray, window: int) -> np.ndarray:
+    """滑动平均（前缀和实现）；不足 window 个点时对已有的点取平均"""
+    window = max(1, int(window))
+    cumulative = np.concatenate(([0], np.cumsum(values, dtype=np.float64)))
+    positions = np.arange(1, len(values) + 1)
+    lower = np.maximum(positions - window, 0)
+    return (cumulative[positions] - cumulative[lower]) / (positions - lower)
+
+
+def percent_change(current: np.ndarray, previous: np.ndarray) -> np.ndarray:
+    """逐元素计算 current 相对 previous 的变化率（%），previous 为 0 时为 NaN"""
+    current, previous = current.astype(np.float64), previous.astype(np.float64)
+    result = np.full(len(current), np.nan)
+    np.divide((current - previous) * 100, np.abs(previous), out=result, where=previous != 0)
+    return result
+
+
+def growth_rate(values: np.ndarray) -> np.ndarray:
+    """相对上一个区间的增长率（%），第一个区间为 NaN"""
+    return np.concatenate(([np.nan], percent_change(values[1:], values[:-1])))
+
+
+def _to_list(values: np.ndarray, digits: int = 2) -> list:
+    """转换为 JSON 友好的列表，NaN 转为 None"""
+    rounded = np.round(values, digits).astype(object)
+    rounded[np.isnan(values)] = None
+    return rounded.tolist()
+
+
+class CreatorAnalytics:
+    """
+    创作者数据分析：每位创作者的各项指标按列保存为 NumPy 数组（截至今天的 ANALYTICS_HISTORY_DAYS 天），
+    按 LRU 缓存 ANALYTICS_MAX_CREATORS 位创作者；窗口之外的日期区间直接按需生成。
+    汇总、滑动平均与增长率均为向量化计算。数据由固定种子生成，同一查询的结果始终相同。
+    所有方法都是线程安全的。
+    """
+
+    def __init__(self, seed: int = ANALYTICS_SEED, history_days: int = ANALYTICS_HISTORY_DAYS,
+                 max_creators: int = ANALYTICS_MAX_CREATORS):
+        self.seed = seed
+        self.history_days = max(1, int(history_days))
+        self.max_creators = max(1, int(max_creators))
+        self._series = OrderedDict()  # (创作者ID, 窗口结束日) -> CreatorSeries
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def series(self, creator_id: int, start: int, end: int) -> CreatorSeries:
+        """返回创作者在 [start, end] 天的时间序列"""
+        today = day_number(date.today())
+        window_start = today - self.history_days + 1
+        if not (window_start <= start and end <= today):
+            return generate_series(creator_id, start, end, self.seed)
+
+        key = (creator_id, today)
+        with self._lock:
+            series = self._series.get(key)
+            if series is not None:
+                self._series.move_to_end(key)
+                self._hits += 1
+        if series is None:
+            series = generate_series(creator_id, window_start, today, self.seed)
+            with self._lock:
+                self._misses += 1
+                self._series[key] = series
+                while len(self._series) > self.max_creators:
+                    self._series.popitem(last=False)
+        return series.slice(start, end)
+
+    def report(self, creator_id: int, start: date, end: date, granularity: str = 'day',
+               ma_window: int = 7) -> Dict[str, Any]:
+        """
+        生成分析报告：analytics 为按区间的明细（与旧接口的行结构相同），
+        moving_average / growth_rate 为各指标的滑动平均与环比增长率（列式），
+        summary 为区间合计、平均互动率，以及与上一个等长区间相比的增长率。
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"granularity 必须是 {'/'.join(GRANULARITIES)} 之一")
+        if end < start:
+            raise ValueError("结束日期不能早于开始日期")
+        span = (end - start).days + 1
+        if span > ANALYTICS_MAX_RANGE_DAYS:
+            raise ValueError(f"日期跨度不能超过 {ANALYTICS_MAX_RANGE_DAYS} 天")
+
+        first, last = day_number(start), day_number(end)
+        series = self.series(creator_id, first, last)
+        previous = self.series(creator_id, first - span, first - 1)
+        starts, columns = rollup(series, granularity)
+
+        dates = np.datetime_as_string(starts.astype('datetime64[D]')).tolist()
+        values = {m: columns[m].tolist() for m in METRICS}
+        analytics = [dict(zip(('date', *METRICS), row)) for row in zip(dates, *(values[m] for m in METRICS))]
+
+        totals = {m: int(series.columns[m].sum()) for m in METRICS}
+        previous_totals = {m: int(previous.columns[m].sum()) for m in METRICS}
+        interactions = totals['likes'] + totals['comments'] + totals['shares']
+        period_growth = percent_change(np.array([totals[m] for m in METRICS]),
+                                       np.array([previous_totals[m] for m in METRICS]))
+
+        return {
+            "creator_id": creator_id,
+            "start_date": start.isoformat(),
+            "end_date": end.isoformat(),
+            "granularity": granularity,
+            "analytics": analytics,
+            "moving_average": {
+                "window": max(1, int(ma_window)),
+                **{m: _to_list(moving_average(columns[m], ma_window)) for m in METRICS}
+            },
+            "growth_rate": {m: _to_list(growth_rate(columns[m])) for m in METRICS},
+            "summary": {
+                "total_views": totals['views'],
+                "total_likes": totals['likes'],
+                "total_comments": totals['comments'],
+                "total_shares": totals['shares'],
+                "avg_engagement_rate": round(interactions / totals['views'] * 100, 2) if totals['views'] else 0.0,
+                "follower_growth": totals['followers_growth'],
+                "period_over_period": dict(zip(METRICS, _to_list(period_growth)))
+            }
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "creators": len(self._series),
+                "max_creators": self.max_creators,
+                "history_days": self.history_days,
+                "hits": self._hits,
+                "misses": self._misses
+            }
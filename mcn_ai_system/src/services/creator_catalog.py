@@ -0,0 +1,274 @@
+# mcn_ai_system/src/services/creator_catalog.py
+import base64
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Any, Optional, Tuple
+
+from sqlalchemy.orm import load_only, noload, selectinload
+
+from src.models.user import db
+from src.models.mcn import (
+    Creator, CreatorPlatform, CREATOR_SORT_KEYS, normalize_platform, on_creators_changed, on_creators_reset
+)
+from src.services.creator_index import CreatorFacetIndex, FACETS
+from src.services.semantic_index import SemanticIndex, creator_document, brand_document
+
+# 支持的稳定排序字段 -> 排序键，均与 id 组成 (排序键, id) 复合索引（可为空的字段 NULL 按 0 处理）
+SORT_COLUMNS = CREATOR_SORT_KEYS
+# fields= 投影可选的字段（与 Creator.to_dict 的键一致）
+CREATOR_FIELDS = ('id', 'name', 'category', 'followers', 'engagement_rate', 'avg_views', 'potential_score',
+                  'growth_trend', 'platforms', 'style', 'tags', 'past_collaborations')
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+# 筛选条件对应的总数缓存有效期（秒）；创作者数据变更时立即清空
+COUNT_CACHE_TTL = float(os.getenv('CREATOR_COUNT_CACHE_TTL', '60'))
+
+
+def build_creator_query(category: str = '', min_followers: int = 0, platform: str = ''):
+    """按领域、最低粉丝数和平台构建创作者查询，各条件均命中索引"""
+    query = Creator.query
+    if category:
+        query = query.filter(Creator.category == category)
+    if min_followers:
+        query = query.filter(Creator.followers >= min_followers)
+    if platform:
+        # 限定为在指定平台有账号的创作者（通过 creator_platforms.platform_key 索引查询）
+        platform_members = db.select(CreatorPlatform.creator_id).where(
+            CreatorPlatform.platform_key == normalize_platform(platform))
+        query = query.filter(Creator.id.in_(platform_members))
+    return query
+
+
+class _CountCache:
+    """筛选条件 -> 总数 的缓存，避免翻页时每一页都执行 COUNT"""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: Tuple, compute) -> int:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                return entry[1]
+        value = compute()
+        with self._lock:
+            self._entries[key] = (now + self.ttl, value)
+        return value
+
+    def clear(self, *_):
+        with self._lock:
+            self._entries.clear()
+
+
+_count_cache = _CountCache(COUNT_CACHE_TTL)
+on_creators_changed(_count_cache.clear)
+on_creators_reset(_count_cache.clear)
+
+
+def count_creators(category: str = '', min_followers: int = 0, platform: str = '') -> int:
+    key = (category, min_followers, normalize_platform(platform))
+    return _count_cache.get_or_compute(
+        key, lambda: build_creator_query(category, min_followers, platform).order_by(None).count())
+
+
+def encode_cursor(sort_value: Any, creator_id: int) -> str:
+    raw = json.dumps([sort_value, creator_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, int]:
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        sort_value, creator_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return sort_value, int(creator_id)
+    except (ValueError, TypeError):
+        raise ValueError("cursor 无效")
+
+
+def parse_fields(fields: str) -> Optional[List[str]]:
+    """解析逗号分隔的 fields 参数，为空时返回 None 表示全部字段"""
+    if not fields:
+        return None
+    selected = [f.strip() for f in fields.split(',') if f.strip()]
+    unknown = [f for f in selected if f not in CREATOR_FIELDS]
+    if unknown:
+        raise ValueError(f"未知字段: {', '.join(unknown)}")
+    return selected
+
+
+def paginate_creators(category: str = '', min_followers: int = 0, platform: str = '',
+                      sort: str = 'followers', order: str = 'desc', limit: int = DEFAULT_PAGE_SIZE,
+                      cursor: str = None, fields: List[str] = None) -> Dict[str, Any]:
+    """
+    基于 (排序字段, id) 的游标分页：每页只按索引向后读取 limit+1 行，
+    与页码深度无关；fields 为 None 时返回全部字段，否则只加载并返回所选字段。
+    """
+    if sort not in SORT_COLUMNS:
+        raise ValueError(f"不支持的排序字段: {sort}")
+    if order not in ('asc', 'desc'):
+        raise ValueError(f"不支持的排序方向: {order}")
+    limit = min(max(1, limit), MAX_PAGE_SIZE)
+    sort_column = SORT_COLUMNS[sort]
+
+    query = build_creator_query(category, min_followers, platform)
+    if cursor:
+        sort_value, last_id = decode_cursor(cursor)
+        keyset = db.tuple_(sort_column, Creator.id)
+        query = query.filter(keyset < (sort_value, last_id) if order == 'desc' else keyset > (sort_value, last_id))
+
+    if order == 'desc':
+        query = query.order_by(sort_column.desc(), Creator.id.desc())
+    else:
+        query = query.order_by(sort_column.asc(), Creator.id.asc())
+
+    if fields is not None:
+        # 只加载需要的列；未请求 platforms 时不查询平台关系
+        columns = {'id', sort} | {f for f in fields if f != 'platforms'}
+        query = query.options(load_only(*[getattr(Creator, c) for c in columns]))
+        query = query.options(selectinload(Creator.platforms) if 'platforms' in fields else noload(Creator.platforms))
+
+    rows = query.limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = None
+    if has_more:
+        # 游标中的排序值与排序键一致：NULL 记为 0
+        last_value = getattr(rows[-1], sort)
+        next_cursor = encode_cursor(last_value if last_value is not None else 0, rows[-1].id)
+
+    return {
+        "data": [creator.to_dict(fields) for creator in rows],
+        "total": count_creators(category, min_followers, platform),
+        "next_cursor": next_cursor,
+        "has_more": has_more,
+        "limit": limit
+    }
+
+
+# 进程内的分面倒排索引：首次搜索时从数据库构建，之后随创作者写入增量更新
+creator_index = CreatorFacetIndex()
+_index_build_lock = threading.Lock()
+
+
+def _load_index_documents(creator_ids: List[int] = None) -> List[Dict[str, Any]]:
+    """只查询建索引需要的列，避免为每个创作者构造完整的 ORM 对象"""
+    creator_stmt = db.select(Creator.id, Creator.category, Creator.style, Creator.tags)
+    platform_stmt = db.select(CreatorPlatform.creator_id, CreatorPlatform.platform)
+    if creator_ids is not None:
+        creator_stmt = creator_stmt.where(Creator.id.in_(creator_ids))
+        platform_stmt = platform_stmt.where(CreatorPlatform.creator_id.in_(creator_ids))
+
+    platforms = {}
+    for creator_id, platform in db.session.execute(platform_stmt.order_by(CreatorPlatform.id)):
+        platforms.setdefault(creator_id, []).append(platform)
+    return [
+        {"id": row.id, "category": row.category, "style": row.style, "tags": row.tags or [],
+         "platforms": platforms.get(row.id, [])}
+        for row in db.session.execute(creator_stmt)
+    ]
+
+
+def ensure_creator_index() -> CreatorFacetIndex:
+    if not creator_index.built:
+        with _index_build_lock:
+            if not creator_index.built:
+                documents = _load_index_documents()
+                creator_index.build(documents)
+                print(f"[creator_index] 倒排索引构建完成，创作者数量: {len(documents)}")
+    return creator_index
+
+
+@on_creators_changed
+def _refresh_creator_index(upserted_ids, removed_ids):
+    # 索引尚未构建时无需维护，首次搜索会完整构建
+    if not creator_index.built:
+        return
+    for creator_id in removed_ids:
+        creator_index.remove(creator_id)
+    if upserted_ids:
+        for document in _load_index_documents(upserted_ids):
+            creator_index.upsert(document)
+
+
+@on_creators_reset
+def _reset_creator_index():
+    creator_index.reset()
+
+
+def search_creators(filters: Dict[str, List[str]], mode: str = 'or', limit: int = DEFAULT_PAGE_SIZE,
+                    offset: int = 0, facet_limit: int = 20, fields: List[str] = None) -> Dict[str, Any]:
+    """
+    分面搜索：在倒排索引上求出命中总数、当前页的创作者ID和各分面计数，
+    只按ID回表读取当前页的创作者（按索引槽位顺序分页）。
+    """
+    unknown = [facet for facet in filters if facet not in FACETS]
+    if unknown:
+        raise ValueError(f"不支持的分面: {', '.join(unknown)}")
+    if mode not in ('and', 'or'):
+        raise ValueError(f"不支持的组合方式: {mode}")
+    limit = min(max(1, limit), MAX_PAGE_SIZE)
+    offset = max(0, offset)
+
+    result = ensure_creator_index().search(filters, mode=mode, offset=offset, limit=limit, facet_limit=facet_limit)
+    page_ids = result["ids"]
+    creators = {c.id: c for c in Creator.query.filter(Creator.id.in_(page_ids)).all()} if page_ids else {}
+
+    return {
+        "data": [creators[i].to_dict(fields) for i in page_ids if i in creators],
+        "total": result["total"],
+        "facets": result["facets"],
+        "limit": limit,
+        "offset": offset
+    }
+
+
+# 创作者画像的语义检索索引：首次检索时构建（或内存映射磁盘上的索引），之后随创作者写入增量更新
+creator_semantic_index = SemanticIndex()
+_semantic_build_lock = threading.Lock()
+
+
+def _load_semantic_documents(creator_ids: List[int] = None) -> Dict[int, str]:
+    stmt = db.select(Creator.id, Creator.category, Creator.style, Creator.tags, Creator.past_collaborations)
+    if creator_ids is not None:
+        stmt = stmt.where(Creator.id.in_(creator_ids))
+    return {row.id: creator_document(row._asdict()) for row in db.session.execute(stmt)}
+
+
+def ensure_semantic_index() -> SemanticIndex:
+    if not creator_semantic_index.built or creator_semantic_index.needs_rebuild:
+        with _semantic_build_lock:
+            if not creator_semantic_index.built or creator_semantic_index.needs_rebuild:
+                creator_semantic_index.build(_load_semantic_documents())
+    return creator_semantic_index
+
+
+@on_creators_changed
+def _refresh_semantic_index(upserted_ids, removed_ids):
+    if not creator_semantic_index.built:
+        return
+    documents = _load_semantic_documents(upserted_ids) if upserted_ids else {}
+    # 查询不到的创作者视为已删除
+    removed = list(removed_ids) + [i for i in upserted_ids if i not in documents]
+    creator_semantic_index.apply_changes(documents, removed)
+
+
+@on_creators_reset
+def _reset_semantic_index():
+    if creator_semantic_index.built:
+        creator_semantic_index.invalidate()
+
+
+def semantic_candidates(brand_info: Dict[str, Any], k: int, platform: str = '',
+                        mode: str = None) -> List[Tuple[int, float]]:
+    """按品牌信息检索语义最接近的 k 位创作者 [(创作者ID, 相似度)]，可限定在指定平台有账号的创作者"""
+    allowed_ids = None
+    if platform:
+        allowed_ids = db.session.scalars(db.select(CreatorPlatform.creator_id).where(
+            CreatorPlatform.platform_key == normalize_platform(platform))).all()
+    return ensure_semantic_index().search(brand_document(brand_info), k, allowed_ids=allowed_ids, mode=mode)
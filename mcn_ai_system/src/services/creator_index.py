@@ -0,0 +1,212 @@
+# mcn_ai_system/src/services/creator_index.py
+import heapq
+import itertools
+import re
+import threading
+from typing import Dict, List, Any, Iterable
+
+# 参与倒排索引的分面字段
+FACETS = ('tags', 'platforms', 'category', 'style')
+
+# style 是 "活泼、时尚" 形式的字符串，按分隔符拆成多个取值
+_STYLE_SPLIT = re.compile(r'[、,，/\s]+')
+
+
+def facet_values(creator_info: Dict[str, Any]) -> Dict[str, set]:
+    """提取创作者在各分面上的取值集合"""
+    values = {}
+    for facet in FACETS:
+        raw = creator_info.get(facet)
+        if raw is None:
+            values[facet] = set()
+        elif isinstance(raw, (list, tuple, set)):
+            values[facet] = {str(v).strip() for v in raw if str(v).strip()}
+        elif facet == 'style':
+            values[facet] = {v for v in _STYLE_SPLIT.split(str(raw)) if v}
+        else:
+            values[facet] = {str(raw).strip()} if str(raw).strip() else set()
+    return values
+
+
+class CreatorFacetIndex:
+    """
+    创作者分面倒排索引。
+    每个 (分面, 取值) 对应一个位图（Python 大整数），第 n 位表示第 n 个槽位的创作者；
+    AND/OR 查询即位图的按位与/或，分面计数即与结果位图相与后的 popcount。
+    支持按创作者增量更新，删除后的槽位会被复用。所有方法都是线程安全的。
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._postings = {facet: {} for facet in FACETS}  # 分面 -> 取值 -> 位图
+        self._docs = {}  # 创作者ID -> (槽位, 各分面取值)
+        self._slot_ids = []  # 槽位 -> 创作者ID（空槽为 None）
+        self._free_slots = []
+        self._all = 0  # 所有有效槽位的位图
+        self._unfiltered_counts = None  # 无筛选条件时的分面计数缓存
+        self.built = False
+
+    def build(self, creators: Iterable[Dict[str, Any]]) -> None:
+        """
+        全量构建。先按取值收集槽位，再一次性把槽位写入 bytearray 转成位图，
+        避免逐个创作者对大整数做按位或（那样整体是 O(n²) 的）。
+        """
+        slots_by_value = {facet: {} for facet in FACETS}
+        docs, slot_ids = {}, []
+        for creator_info in creators:
+            values = facet_values(creator_info)
+            slot = len(slot_ids)
+            slot_ids.append(creator_info['id'])
+            docs[creator_info['id']] = (slot, values)
+            for facet, facet_vals in values.items():
+                for value in facet_vals:
+                    slots_by_value[facet].setdefault(value, []).append(slot)
+
+        size = (len(slot_ids) + 7) // 8
+        postings = {facet: {value: _bitmap_from_slots(slots, size) for value, slots in by_value.items()}
+                    for facet, by_value in slots_by_value.items()}
+
+        with self._lock:
+            self._postings = postings
+            self._docs = docs
+            self._slot_ids = slot_ids
+            self._free_slots = []
+            self._all = (1 << len(slot_ids)) - 1
+            self._unfiltered_counts = None
+            self.built = True
+
+    def reset(self) -> None:
+        """清空索引并标记为未构建，下次使用前需重新 build"""
+        with self._lock:
+            self._postings = {facet: {} for facet in FACETS}
+            self._docs = {}
+            self._slot_ids = []
+            self._free_slots = []
+            self._all = 0
+            self._unfiltered_counts = None
+            self.built = False
+
+    def upsert(self, creator_info: Dict[str, Any]) -> None:
+        creator_id = creator_info['id']
+        values = facet_values(creator_info)
+        with self._lock:
+            if creator_id in self._docs:
+                slot, old_values = self._docs[creator_id]
+                self._unlink(slot, old_values)
+            elif self._free_slots:
+                slot = self._free_slots.pop()
+                self._slot_ids[slot] = creator_id
+            else:
+                slot = len(self._slot_ids)
+                self._slot_ids.append(creator_id)
+
+            bit = 1 << slot
+            for facet, facet_vals in values.items():
+                postings = self._postings[facet]
+                for value in facet_vals:
+                    postings[value] = postings.get(value, 0) | bit
+            self._docs[creator_id] = (slot, values)
+            self._all |= bit
+            self._unfiltered_counts = None
+
+    def remove(self, creator_id: int) -> None:
+        with self._lock:
+            entry = self._docs.pop(creator_id, None)
+            if entry is None:
+                return
+            slot, values = entry
+            self._unlink(slot, values)
+            self._all &= ~(1 << slot)
+            self._slot_ids[slot] = None
+            self._free_slots.append(slot)
+            self._unfiltered_counts = None
+
+    def search(self, filters: Dict[str, List[str]], mode: str = 'or', offset: int = 0,
+               limit: int = 50, facet_limit: int = 20) -> Dict[str, Any]:
+        """
+        filters: 分面 -> 取值列表。同一分面内的多个取值按 mode 组合（or: 任一命中，and: 全部命中），
+        不同分面之间取交集。返回命中总数、按槽位顺序的当前页创作者ID，以及结果集上的各分面计数。
+        """
+        with self._lock:
+            result = self._all
+            for facet, wanted in filters.items():
+                if not wanted:
+                    continue
+                postings = self._postings[facet]
+                bitmaps = [postings.get(value, 0) for value in wanted]
+                if mode == 'and':
+                    facet_bitmap = self._all
+                    for bitmap in bitmaps:
+                        facet_bitmap &= bitmap
+                else:
+                    facet_bitmap = 0
+                    for bitmap in bitmaps:
+                        facet_bitmap |= bitmap
+                result &= facet_bitmap
+
+            total = result.bit_count()
+            if total * 64 <= len(self._slot_ids):
+                # 结果稀疏：直接累加命中创作者的取值，比逐个位图相与更快
+                hit_ids = [self._slot_ids[slot] for slot in _iter_bits(result)]
+                page_ids = hit_ids[offset:offset + limit]
+                counters = {facet: {} for facet in FACETS}
+                for creator_id in hit_ids:
+                    for facet, facet_vals in self._docs[creator_id][1].items():
+                        counter = counters[facet]
+                        for value in facet_vals:
+                            counter[value] = counter.get(value, 0) + 1
+                raw_counts = {facet: counter.items() for facet, counter in counters.items()}
+            else:
+                page_ids = [self._slot_ids[slot] for slot in itertools.islice(_iter_bits(result), offset, offset + limit)]
+                if result == self._all:
+                    # 无筛选条件：使用缓存的全量计数，索引变更时失效
+                    if self._unfiltered_counts is None:
+                        self._unfiltered_counts = {
+                            facet: [(value, bitmap.bit_count()) for value, bitmap in postings.items()]
+                            for facet, postings in self._postings.items()}
+                    raw_counts = self._unfiltered_counts
+                else:
+                    raw_counts = {facet: [(value, (bitmap & result).bit_count()) for value, bitmap in postings.items()]
+                                  for facet, postings in self._postings.items()}
+
+        facet_counts = {}
+        for facet, counts in raw_counts.items():
+            top = heapq.nsmallest(facet_limit, ((-count, value) for value, count in counts if count))
+            facet_counts[facet] = {value: -count for count, value in top}
+        return {"ids": page_ids, "total": total, "facets": facet_counts}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "built": self.built,
+                "creators": len(self._docs),
+                "facet_values": {facet: len(postings) for facet, postings in self._postings.items()}
+            }
+
+    def _unlink(self, slot: int, values: Dict[str, set]) -> None:
+        # 调用方需持有锁：从旧取值的位图中清除该槽位，空位图直接删除
+        mask = ~(1 << slot)
+        for facet, facet_vals in values.items():
+            postings = self._postings[facet]
+            for value in facet_vals:
+                bitmap = postings.get(value, 0) & mask
+                if bitmap:
+                    postings[value] = bitmap
+                else:
+                    postings.pop(value, None)
+
+
+def _bitmap_from_slots(slots: List[int], size: int) -> int:
+    buffer = bytearray(size)
+    for slot in slots:
+        buffer[slot >> 3] |= 1 << (slot & 7)
+    return int.from_bytes(buffer, 'little')
+
+
+def _iter_bits(bitmap: int):
+    """依次产出位图中为 1 的位序号（借助二进制字符串查找，避免对大整数逐位移位）"""
+    bits = bin(bitmap)[:1:-1]  # 低位在前
+    position = bits.find('1')
+    while position != -1:
+        yield position
+        position = bits.find('1', position + 1)
@@ -0,0 +1,364 @@
+# mcn_ai_system/src/services/creator_io.py
+"""
+创作者批量导入/导出。
+
+导入：流式解析 CSV 或 NDJSON（逐行读取，内存占用与文件大小无关），逐行校验，
+每 CREATOR_IMPORT_BATCH_SIZE 行在一个事务中通过 executemany 批量写入（不为每行构造 ORM 对象）。
+带 id 的行按 id 整行覆盖（存在则更新，不存在则插入），不带 id 的行新增；
+行中未提供的字段取默认值，平台列表整体替换。
+
+CSV 的表头即字段名（与 Creator.to_dict 的键一致），tags / platforms 用 "|" 分隔，也可以是 JSON 数组；
+NDJSON 每行一个与 Creator.to_dict 结构相同的 JSON 对象。
+"""
+import csv
+import io
+import json
+import math
+import os
+import time
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Tuple
+
+from sqlalchemy import bindparam
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.models.user import db
+from src.models.mcn import (
+    Creator, CreatorPlatform, normalize_platform, notify_creators_changed, notify_creators_reset,
+    bump_creators_version
+)
+from src.services.creator_catalog import CREATOR_FIELDS, build_creator_query
+
+IMPORT_FORMATS = ('csv', 'ndjson')
+# 每个事务写入的行数
+CREATOR_IMPORT_BATCH_SIZE = int(os.getenv('CREATOR_IMPORT_BATCH_SIZE', '2000'))
+# 导入报告中最多列出的错误行数（错误总数不受限制）
+CREATOR_IMPORT_MAX_ERRORS = int(os.getenv('CREATOR_IMPORT_MAX_ERRORS', '100'))
+# 写入行数不超过该值时逐条增量更新派生数据（索引、汇总等），超过时整体失效、下次使用时重建
+CREATOR_IMPORT_INCREMENTAL_LIMIT = int(os.getenv('CREATOR_IMPORT_INCREMENTAL_LIMIT', '5000'))
+# 导出时每次查询的行数
+CREATOR_EXPORT_BATCH_SIZE = int(os.getenv('CREATOR_EXPORT_BATCH_SIZE', '2000'))
+
+LIST_SEPARATOR = '|'
+# 可写入的列（不含 platforms）及其默认值，同一批的每一行都带全部列，才能走 executemany
+_COLUMN_DEFAULTS = {
+    'name': None, 'category': None, 'followers': 0, 'engagement_rate': 0.0, 'avg_views': 0,
+    'potential_score': 0, 'growth_trend': None, 'style': None, 'tags': [], 'past_collaborations': None
+}
+_STRING_LIMITS = {'name': 120, 'category': 50, 'growth_trend': 20, 'style': 120}
+_INT_FIELDS = ('followers', 'avg_views', 'potential_score')
+_PLATFORM_LIMIT = 50
+# 数据库整数列（SQLite INTEGER / PostgreSQL BIGINT）可存储的最大值，超过时绑定参数会抛出 OverflowError
+_MAX_INTEGER = 2 ** 63 - 1
+
+_FORMAT_BY_SUFFIX = {'.csv': 'csv', '.ndjson': 'ndjson', '.jsonl': 'ndjson'}
+_FORMAT_BY_MIMETYPE = {'text/csv': 'csv', 'application/csv': 'csv', 'application/x-ndjson': 'ndjson',
+                       'application/ndjson': 'ndjson', 'application/jsonl': 'ndjson', 'application/json': 'ndjson'}
+EXPORT_MIMETYPES = {'csv': 'text/csv', 'ndjson': 'application/x-ndjson'}
+
+
+def detect_format(explicit: str = None, filename: str = None, mimetype: str = None) -> str:
+    """按 显式指定 > 文件扩展名 > Content-Type 的顺序确定文件格式"""
+    if explicit:
+        fmt = explicit.strip().lower()
+        if fmt == 'jsonl':
+            fmt = 'ndjson'
+        if fmt not in IMPORT_FORMATS:
+            raise ValueError(f"不支持的格式: {explicit}（可选 {'/'.join(IMPORT_FORMATS)}）")
+        return fmt
+    if filename:
+        fmt = _FORMAT_BY_SUFFIX.get(os.path.splitext(filename)[1].lower())
+        if fmt:
+            return fmt
+    if mimetype in _FORMAT_BY_MIMETYPE:
+        return _FORMAT_BY_MIMETYPE[mimetype]
+    raise ValueError("无法确定文件格式，请通过 format 参数指定 csv 或 ndjson")
+
+
+def iter_records(lines: Iterable[str], fmt: str) -> Iterator[Tuple[int, Any]]:
+    """逐行解析，产出 (行号, 原始记录)；NDJSON 中不合法的行产出 ValueError 作为记录，由调用方计入错误"""
+    if fmt == 'csv':
+        reader = csv.DictReader(lines)
+        for record in reader:
+            # 行号为该记录结束所在的物理行（表头为第 1 行）
+            yield reader.line_num, record
+        return
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield number, ValueError("不是合法的JSON")
+            continue
+        yield number, record if isinstance(record, dict) else ValueError("每行必须是一个JSON对象")
+
+
+def _text(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    text = str(value).strip()
+    return text or None
+
+
+def _number(value: Any, field: str, cast):
+    text = _text(value)
+    if text is None:
+        return _COLUMN_DEFAULTS[field]
+    try:
+        number = cast(text.replace(',', ''))  # 允许千分位逗号，如 "125,000"
+    except ValueError:
+        raise ValueError(f"{field} 必须是数字: {text}")
+    if isinstance(number, int) and number > _MAX_INTEGER:
+        raise ValueError(f"{field} 超出范围（最大 {_MAX_INTEGER}）: {text}")
+    # nan / inf 会被 float 接受，但无法写成合法的JSON，NaN 写入 SQLite 后还会变成 NULL
+    if not math.isfinite(number):
+        raise ValueError(f"{field} 必须是有限的数字: {text}")
+    if number < 0:
+        raise ValueError(f"{field} 不能为负数")
+    return number
+
+
+def _string_list(value: Any, field: str) -> List[str]:
+    if value is None or value == '':
+        return []
+    if isinstance(value, str):
+        text = value.strip()
+        if text.startswith('['):
+            try:
+                value = json.loads(text)
+            except ValueError:
+                raise ValueError(f"{field} 不是合法的JSON数组")
+        else:
+            value = text.split(LIST_SEPARATOR)
+    if not isinstance(value, list):
+        raise ValueError(f"{field} 必须是列表或以 {LIST_SEPARATOR} 分隔的字符串")
+    items = [str(item).strip() for item in value if item is not None and str(item).strip()]
+    return list(dict.fromkeys(items))
+
+
+def validate_creator(record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    校验并规范化一行记录，返回 可写入的列 + platforms（以及可选的 id）；不合法时抛出 ValueError。
+    CREATOR_FIELDS 以外的字段（如平台导出文件中的其他列）会被忽略。
+    """
+    if record.get(None):
+        raise ValueError("列数多于表头")
+
+    row = {}
+    creator_id = _text(record.get('id'))
+    if creator_id is not None:
+        try:
+            row['id'] = int(creator_id)
+        except ValueError:
+            raise ValueError(f"id 必须是整数: {creator_id}")
+        if not 0 < row['id'] <= _MAX_INTEGER:
+            raise ValueError("id 必须是正整数" if row['id'] <= 0 else f"id 超出范围（最大 {_MAX_INTEGER}）")
+
+    for field, limit in _STRING_LIMITS.items():
+        value = _text(record.get(field))
+        if value is not None and len(value) > limit:
+            raise ValueError(f"{field} 不能超过 {limit} 个字符")
+        row[field] = value
+    if not row['name']:
+        raise ValueError("name 不能为空")
+    for field in _INT_FIELDS:
+        row[field] = _number(record.get(field), field, int)
+    row['engagement_rate'] = _number(record.get('engagement_rate'), 'engagement_rate', float)
+    if row['potential_score'] > 100:
+        raise ValueError("potential_score 不能超过 100")
+    row['tags'] = _string_list(record.get('tags'), 'tags')
+    row['past_collaborations'] = _text(record.get('past_collaborations'))
+
+    platforms = _string_list(record.get('platforms'), 'platforms')
+    if any(len(platform) > _PLATFORM_LIMIT for platform in platforms):
+        raise ValueError(f"平台名称不能超过 {_PLATFORM_LIMIT} 个字符")
+    # 同一平台大小写不同的写法只保留一个（与 uq_creator_platform 约束一致）
+    row['platforms'] = list({normalize_platform(p): p for p in reversed(platforms)}.values())[::-1]
+    return row
+
+
+def _upsert_statement(table):
+    """按 id 覆盖写入的 INSERT 语句；SQLite / PostgreSQL 使用 ON CONFLICT，其他数据库由调用方先删除再插入"""
+    dialect = db.engine.dialect.name
+    if dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    elif dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        return None
+    stmt = insert(table)
+    return stmt.on_conflict_do_update(
+        index_elements=[table.c.id],
+        set_={column: stmt.excluded[column] for column in _COLUMN_DEFAULTS}
+    )
+
+
+def _write_batch(rows: List[Dict[str, Any]]) -> List[int]:
+    """在当前事务中写入一批已校验的行，返回写入的创作者ID"""
+    creators, platforms = Creator.__table__, CreatorPlatform.__table__
+    # 同一批中重复的 id 以最后一行为准
+    with_id = list({row['id']: row for row in rows if 'id' in row}.values())
+    without_id = [row for row in rows if 'id' not in row]
+
+    if with_id:
+        params = [{'id': row['id'], **{column: row[column] for column in _COLUMN_DEFAULTS}} for row in with_id]
+        upsert = _upsert_statement(creators)
+        if upsert is None:
+            db.session.execute(creators.delete().where(creators.c.id == bindparam('b_id')),
+                               [{'b_id': row['id']} for row in with_id])
+            upsert = creators.insert()
+        db.session.execute(upsert, params)
+    if without_id:
+        # insertmanyvalues：一条语句批量插入并按参数顺序返回自增ID
+        inserted = db.session.execute(
+            creators.insert().returning(creators.c.id, sort_by_parameter_order=True),
+            [{column: row[column] for column in _COLUMN_DEFAULTS} for row in without_id]
+        ).scalars().all()
+        for row, creator_id in zip(without_id, inserted):
+            row['id'] = creator_id
+
+    if with_id:
+        # 已有创作者的平台列表整体替换（新插入的创作者没有平台记录）
+        db.session.execute(platforms.delete().where(platforms.c.creator_id == bindparam('b_creator_id')),
+                           [{'b_creator_id': row['id']} for row in with_id])
+    written = with_id + without_id
+    platform_rows = [{'creator_id': row['id'], 'platform': platform, 'platform_key': normalize_platform(platform)}
+                     for row in written for platform in row['platforms']]
+    if platform_rows:
+        db.session.execute(platforms.insert(), platform_rows)
+    return [row['id'] for row in written]
+
+
+def import_creators(lines: Iterable[str], fmt: str, batch_size: int = CREATOR_IMPORT_BATCH_SIZE,
+                    dry_run: bool = False, max_errors: int = CREATOR_IMPORT_MAX_ERRORS,
+                    progress=None) -> Dict[str, Any]:
+    """
+    流式导入创作者，需在应用上下文中调用。lines 为逐行读取的文本（文件对象或任意可迭代对象）。
+    不合法的行跳过并记录在 errors 中（最多 max_errors 条）；某一批写入失败时回滚该批并继续后续批次，
+    文件编码或结构损坏时停止导入（aborted 为 True）。
+    dry_run 为 True 时只做解析和校验。progress(report) 在每批提交后调用，可用于打印进度。
+    返回导入报告（处理行数、写入行数、失败行数、耗时与每秒行数）。
+    """
+    if fmt not in IMPORT_FORMATS:
+        raise ValueError(f"不支持的格式: {fmt}")
+    batch_size = max(1, int(batch_size))
+    started = time.perf_counter()
+    report = {"format": fmt, "dry_run": dry_run, "processed": 0, "imported": 0, "failed": 0, "batches": 0,
+              "aborted": False, "errors": []}
+    changed_ids = []  # 写入行数不超过 CREATOR_IMPORT_INCREMENTAL_LIMIT 时用于增量通知
+
+    def record_error(line, message, count=1):
+        report["failed"] += count
+        if len(report["errors"]) < max_errors:
+            report["errors"].append({"line": line, "message": message})
+
+    def flush(batch):
+        first_line, last_line = batch[0][0], batch[-1][0]
+        rows = [row for _, row in batch]
+        if dry_run:
+            report["imported"] += len(rows)
+            return
+        try:
+            ids = _write_batch(rows)
+            db.session.commit()
+        except (SQLAlchemyError, OverflowError, TypeError, ValueError) as e:
+            # 数据库驱动绑定参数失败（如整数超出范围）时同样只放弃这一批
+            db.session.rollback()
+            print(f"[import_creators] 第 {first_line}-{last_line} 行写入失败: {type(e).__name__}, 详情: {e}")
+            record_error(f"{first_line}-{last_line}", f"批量写入失败: {type(e).__name__}", len(rows))
+            return
+        report["imported"] += len(rows)
+        report["batches"] += 1
+        if changed_ids is not None:
+            changed_ids.extend(ids)
+        if progress:
+            progress(_finish(report, started))
+
+    try:
+        batch = []
+        for line, record in iter_records(lines, fmt):
+            report["processed"] += 1
+            try:
+                if isinstance(record, ValueError):
+                    raise record
+                batch.append((line, validate_creator(record)))
+            except ValueError as e:
+                record_error(line, str(e))
+                continue
+            if len(batch) >= batch_size:
+                flush(batch)
+                batch = []
+                if changed_ids is not None and len(changed_ids) > CREATOR_IMPORT_INCREMENTAL_LIMIT:
+                    changed_ids = None
+        if batch:
+            flush(batch)
+    except (UnicodeDecodeError, csv.Error) as e:
+        # 文件编码或结构损坏时无法继续逐行解析；已提交的批次保留，未提交的一批丢弃
+        report["aborted"] = True
+        record_error(None, f"文件解析中断（第 {report['processed'] + 1} 条记录附近）: {e}", len(batch))
+    finally:
+        # 已提交的批次即使后续出错也需要通知派生数据；版本号使其他进程（如服务进程）也丢弃派生数据
+        if not dry_run and report["imported"]:
+            bump_creators_version()
+            if changed_ids is not None and len(changed_ids) <= CREATOR_IMPORT_INCREMENTAL_LIMIT:
+                notify_creators_changed(upserted_ids=changed_ids)
+            else:
+                notify_creators_reset()
+    return _finish(report, started)
+
+
+def _finish(report: Dict[str, Any], started: float) -> Dict[str, Any]:
+    elapsed = time.perf_counter() - started
+    report["elapsed_seconds"] = round(elapsed, 3)
+    report["rows_per_sec"] = round(report["processed"] / elapsed, 1) if elapsed else None
+    return report
+
+
+def _export_value(value: Any, fmt: str) -> Any:
+    if fmt == 'csv' and isinstance(value, list):
+        return LIST_SEPARATOR.join(value)
+    return value
+
+
+def iter_export(fmt: str, category: str = '', platform: str = '',
+                batch_size: int = CREATOR_EXPORT_BATCH_SIZE) -> Iterator[str]:
+    """
+    按 id 顺序分批导出创作者（键集分页，每批一次查询创作者、一次查询平台），逐批产出文本块，
+    导出的文件可直接再导入。需在应用上下文中迭代。
+    """
+    if fmt not in IMPORT_FORMATS:
+        raise ValueError(f"不支持的格式: {fmt}")
+    columns = [getattr(Creator, field) for field in CREATOR_FIELDS if field != 'platforms']
+    query = build_creator_query(platform=platform)
+    if category:
+        query = query.filter(Creator.category == category)
+    query = query.with_entities(*columns).order_by(Creator.id)
+
+    if fmt == 'csv':
+        yield ','.join(CREATOR_FIELDS) + '\r\n'
+    last_id = 0
+    while True:
+        rows = query.filter(Creator.id > last_id).limit(batch_size).all()
+        if not rows:
+            return
+        ids = [row.id for row in rows]
+        platforms = {}
+        for creator_id, name in db.session.execute(
+                db.select(CreatorPlatform.creator_id, CreatorPlatform.platform)
+                .where(CreatorPlatform.creator_id.in_(ids)).order_by(CreatorPlatform.id)):
+            platforms.setdefault(creator_id, []).append(name)
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer) if fmt == 'csv' else None
+        for row in rows:
+            record = row._asdict()
+            record['tags'] = list(record['tags'] or [])
+            record['platforms'] = platforms.get(row.id, [])
+            if writer:
+                writer.writerow([_export_value(record[field], fmt) for field in CREATOR_FIELDS])
+            else:
+                buffer.write(json.dumps({field: record[field] for field in CREATOR_FIELDS}, ensure_ascii=False))
+                buffer.write('\n')
+        yield buffer.getvalue()
+        last_id = ids[-1]
@@ -0,0 +1,216 @@
+# mcn_ai_system/src/services/dashboard_summary.py
+import json
+import threading
+import uuid
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Any, Tuple
+
+from src.models.user import db
+from src.models.mcn import (
+    Creator, CreatorPlatform, Brand, Campaign,
+    on_creators_changed, on_creators_reset, on_brands_changed, on_campaigns_changed
+)
+
+# 计入总收入与平均 ROI 的活动状态
+REVENUE_STATUSES = ('active', 'completed')
+UNCATEGORIZED = '未分类'
+
+# 最近动态（演示数据）
+RECENT_ACTIVITIES = [
+    {"time": "2小时前", "action": "新增创作者", "detail": "小美美妆"},
+    {"time": "4小时前", "action": "完成匹配", "detail": "时尚品牌A × 3位创作者"},
+    {"time": "6小时前", "action": "内容审核", "detail": "通过15条内容"},
+    {"time": "8小时前", "action": "数据分析", "detail": "生成月度报告"}
+]
+
+
+def _load_creators(creator_ids: List[int] = None) -> Dict[int, Tuple[str, Tuple[str, ...]]]:
+    """创作者ID -> (领域, 平台)，只查询汇总需要的列"""
+    creator_stmt = db.select(Creator.id, Creator.category)
+    platform_stmt = db.select(CreatorPlatform.creator_id, CreatorPlatform.platform)
+    if creator_ids is not None:
+        creator_stmt = creator_stmt.where(Creator.id.in_(creator_ids))
+        platform_stmt = platform_stmt.where(CreatorPlatform.creator_id.in_(creator_ids))
+
+    platforms = {}
+    for creator_id, platform in db.session.execute(platform_stmt):
+        platforms.setdefault(creator_id, []).append(platform)
+    return {row.id: (row.category or UNCATEGORIZED, tuple(platforms.get(row.id, ())))
+            for row in db.session.execute(creator_stmt)}
+
+
+def _load_brands(brand_ids: List[int] = None) -> set:
+    stmt = db.select(Brand.id)
+    if brand_ids is not None:
+        stmt = stmt.where(Brand.id.in_(brand_ids))
+    return set(db.session.scalars(stmt))
+
+
+def _load_campaigns(campaign_ids: List[int] = None) -> Dict[int, Tuple[str, int, int]]:
+    """活动ID -> (状态, 预算, 收入)"""
+    stmt = db.select(Campaign.id, Campaign.status, Campaign.budget, Campaign.revenue)
+    if campaign_ids is not None:
+        stmt = stmt.where(Campaign.id.in_(campaign_ids))
+    return {row.id: (row.status, row.budget or 0, row.revenue or 0) for row in db.session.execute(stmt)}
+
+
+def _percentages(counter: Counter) -> Dict[str, float]:
+    """计数 -> 占比（%），按数量从多到少"""
+    total = sum(counter.values())
+    return {key: round(count * 100 / total, 1) for key, count in counter.most_common() if count > 0} if total else {}
+
+
+class DashboardSummary:
+    """
+    仪表板概览的物化汇总：首次请求时完整扫描一次，之后随创作者/品牌/合作活动的写入增量更新。
+    每条记录对汇总的贡献（领域与平台、活动状态与金额）单独保存，更新时先减去旧贡献再加上新贡献，
+    代价只与变更的记录数有关。每次变更 version 加一，响应体与 ETag 按版本缓存，请求处理与数据规模无关。
+    所有方法都是线程安全的。
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._built = False
+        self._generation = uuid.uuid4().hex[:8]  # 进程重启后版本号从头计数，ETag 加上进程标识避免冲突
+        self._version = 0
+        self._updated_at = None
+        self._creators = {}  # 创作者ID -> (领域, 平台)
+        self._brands = set()
+        self._campaigns = {}  # 活动ID -> (状态, 预算, 收入)
+        self._categories = Counter()
+        self._platforms = Counter()
+        self._campaign_statuses = Counter()
+        self._revenue = 0
+        self._spend = 0
+        self._snapshot = None  # (version, etag, 响应体)
+
+    @property
+    def built(self) -> bool:
+        return self._built
+
+    def ensure_built(self) -> 'DashboardSummary':
+        if not self._built:
+            with self._lock:
+                if not self._built:
+                    self._rebuild()
+        return self
+
+    def apply_creators(self, upserted_ids: List[int], removed_ids: List[int]) -> None:
+        # 尚未构建时无需维护，首次请求会完整构建
+        if not self._built:
+            return
+        rows = _load_creators(upserted_ids) if upserted_ids else {}
+        with self._lock:
+            for creator_id in removed_ids:
+                self._set_creator(creator_id, None)
+            for creator_id in upserted_ids:
+                self._set_creator(creator_id, rows.get(creator_id))
+            self._bump()
+
+    def apply_brands(self, upserted_ids: List[int], removed_ids: List[int]) -> None:
+        if not self._built:
+            return
+        existing = _load_brands(upserted_ids) if upserted_ids else set()
+        with self._lock:
+            self._brands.difference_update(removed_ids)
+            self._brands.difference_update(set(upserted_ids) - existing)
+            self._brands.update(existing)
+            self._bump()
+
+    def apply_campaigns(self, upserted_ids: List[int], removed_ids: List[int]) -> None:
+        if not self._built:
+            return
+        rows = _load_campaigns(upserted_ids) if upserted_ids else {}
+        with self._lock:
+            for campaign_id in removed_ids:
+                self._set_campaign(campaign_id, None)
+            for campaign_id in upserted_ids:
+                self._set_campaign(campaign_id, rows.get(campaign_id))
+            self._bump()
+
+    def invalidate(self) -> None:
+        """丢弃汇总（如批量导入后），下次请求时完整重建；重建时版本号继续递增，ETag 不会与之前重复"""
+        with self._lock:
+            self._built = False
+
+    def snapshot(self) -> Tuple[str, str]:
+        """返回 (ETag, JSON 响应体)；同一版本只序列化一次"""
+        self.ensure_built()
+        with self._lock:
+            if self._snapshot is None or self._snapshot[0] != self._version:
+                body = json.dumps({"success": True, "data": self._payload()}, ensure_ascii=False)
+                self._snapshot = (self._version, f"dashboard-{self._generation}-{self._version}", body)
+            return self._snapshot[1], self._snapshot[2]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"built": self._built, "version": self._version, "creators": len(self._creators),
+                    "brands": len(self._brands), "campaigns": len(self._campaigns)}
+
+    def _rebuild(self) -> None:
+        creators, brands, campaigns = _load_creators(), _load_brands(), _load_campaigns()
+        self._creators, self._campaigns = {}, {}
+        self._categories, self._platforms, self._campaign_statuses = Counter(), Counter(), Counter()
+        self._revenue = self._spend = 0
+        for creator_id, facts in creators.items():
+            self._set_creator(creator_id, facts)
+        for campaign_id, facts in campaigns.items():
+            self._set_campaign(campaign_id, facts)
+        self._brands = brands
+        self._built = True
+        self._bump()
+        print(f"[DashboardSummary] 汇总构建完成，创作者 {len(creators)}，品牌 {len(brands)}，活动 {len(campaigns)}")
+
+    def _set_creator(self, creator_id: int, facts) -> None:
+        """用新的贡献替换旧的贡献；facts 为 None 表示创作者已删除"""
+        old = self._creators.pop(creator_id, None)
+        if old is not None:
+            self._categories[old[0]] -= 1
+            self._platforms.subtract(old[1])
+        if facts is not None:
+            self._creators[creator_id] = facts
+            self._categories[facts[0]] += 1
+            self._platforms.update(facts[1])
+
+    def _set_campaign(self, campaign_id: int, facts) -> None:
+        old = self._campaigns.pop(campaign_id, None)
+        if old is not None:
+            self._campaign_statuses[old[0]] -= 1
+            if old[0] in REVENUE_STATUSES:
+                self._revenue -= old[2]
+                self._spend -= old[1]
+        if facts is not None:
+            self._campaigns[campaign_id] = facts
+            self._campaign_statuses[facts[0]] += 1
+            if facts[0] in REVENUE_STATUSES:
+                self._revenue += facts[2]
+                self._spend += facts[1]
+
+    def _bump(self) -> None:
+        self._version += 1
+        self._updated_at = datetime.now().isoformat(timespec='seconds')
+
+    def _payload(self) -> Dict[str, Any]:
+        return {
+            "total_creators": len(self._creators),
+            "total_brands": len(self._brands),
+            "total_campaigns": len(self._campaigns),
+            "active_campaigns": self._campaign_statuses['active'],
+            "campaign_status": {status: count for status, count in self._campaign_statuses.items() if count > 0},
+            "total_revenue": self._revenue,
+            "avg_roi": round(self._revenue / self._spend, 1) if self._spend else 0.0,
+            "platform_distribution": _percentages(self._platforms),
+            "category_distribution": _percentages(self._categories),
+            "recent_activities": RECENT_ACTIVITIES,
+            "version": self._version,
+            "updated_at": self._updated_at
+        }
+
+
+# 进程内的仪表板汇总，随数据写入增量更新
+dashboard_summary = DashboardSummary()
+on_creators_changed(dashboard_summary.apply_creators)
+on_brands_changed(dashboard_summary.apply_brands)
+on_campaigns_changed(dashboard_summary.apply_campaigns)
+on_creators_reset(dashboard_summary.invalidate)
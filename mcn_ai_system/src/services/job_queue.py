@@ -0,0 +1,310 @@
+# mcn_ai_system/src/services/job_queue.py
+import os
+import socket
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional
+
+from src.models.user import db
+from src.models.job import (
+    AIJob, AIJobItem,
+    JOB_QUEUED, JOB_RUNNING, JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED, JOB_FINISHED_STATUSES,
+    ITEM_PENDING, ITEM_DONE, ITEM_FAILED
+)
+
+# 同时执行的任务数量；每个匹配任务内部还会按 max_concurrency 并发调用模型
+DEFAULT_JOB_WORKERS = int(os.getenv('AI_JOB_WORKERS', '2'))
+# 任务租约时长与心跳（续约、接管过期任务）间隔（秒）；心跳间隔应明显小于租约时长
+JOB_LEASE_SECONDS = float(os.getenv('AI_JOB_LEASE_SECONDS', '60'))
+JOB_HEARTBEAT_SECONDS = float(os.getenv('AI_JOB_HEARTBEAT_SECONDS', '15'))
+
+_UNFINISHED_STATUSES = (JOB_QUEUED, JOB_RUNNING)
+
+
+class JobManager:
+    """
+    AI 任务队列：任务及其子项保存在 SQLite 中，由本地线程池执行。
+    支持取消、重试失败子项，已完成的子项不会重复执行。
+
+    只有调用了 start 的进程（提供服务的进程）才执行任务；导入应用的其他进程（命令行、重载器父进程）
+    只能提交任务，任务保持排队，由执行任务的进程接管。每个任务记录负责执行的进程（owner）和租约，
+    执行进程通过心跳续约；只有租约过期（进程已退出）的未完成任务才会被其他进程重新排队执行。
+    """
+
+    def __init__(self, ai_service, max_workers: int = DEFAULT_JOB_WORKERS,
+                 lease_seconds: float = JOB_LEASE_SECONDS, heartbeat_seconds: float = JOB_HEARTBEAT_SECONDS):
+        self.ai_service = ai_service
+        self.max_workers = max(1, max_workers)
+        self.lease_seconds = lease_seconds
+        self.heartbeat_seconds = heartbeat_seconds
+        self.owner = None  # start 时确定，fork 出的子进程各自不同
+        self._app = None
+        self._executor = None
+        self._started = False
+        self._stop_event = threading.Event()
+        self._cancel_events = {}  # 任务ID -> 取消标记
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        """绑定 Flask 应用；不启动线程池，也不接管任何任务"""
+        self._app = app
+
+    def start(self) -> None:
+        """
+        在本进程中开始执行任务：启动线程池和心跳线程，心跳线程立即接管租约已过期的未完成任务。
+        只应由提供服务的进程调用，可重复调用。需在 init_app 与 db.create_all 之后调用。
+        """
+        if self._started:
+            return
+        with self._lock:
+            if self._started:
+                return
+            if self._app is None:
+                raise RuntimeError("JobManager 尚未调用 init_app")
+            self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="ai_job")
+            self._stop_event.clear()
+            threading.Thread(target=self._heartbeat_loop, name="ai_job_heartbeat", daemon=True).start()
+            self._started = True
+        print(f"[JobManager] 开始执行任务，owner={self.owner}")
+
+    def stop(self) -> None:
+        """停止心跳并等待执行中的任务结束；未完成任务的租约过期后由其他进程接管"""
+        with self._lock:
+            if not self._started:
+                return
+            self._started = False
+            self._stop_event.set()
+            executor, self._executor = self._executor, None
+        executor.shutdown(wait=True)
+
+    def _lease_deadline(self) -> datetime:
+        return datetime.utcnow() + timedelta(seconds=self.lease_seconds)
+
+    def _heartbeat_loop(self) -> None:
+        while not self._stop_event.is_set():
+            with self._app.app_context():
+                try:
+                    self._renew_leases()
+                    self._recover_expired()
+                except Exception as e:
+                    print(f"[JobManager] 心跳失败: 类型={type(e).__name__}, 详情={e}")
+                    db.session.rollback()
+                finally:
+                    db.session.remove()
+            self._stop_event.wait(self.heartbeat_seconds)
+
+    def _renew_leases(self) -> None:
+        """为本进程负责的未完成任务续约（不改变 updated_at）"""
+        (AIJob.query
+         .filter(AIJob.owner == self.owner, AIJob.status.in_(_UNFINISHED_STATUSES))
+         .update({"lease_expires_at": self._lease_deadline(), "updated_at": AIJob.updated_at},
+                 synchronize_session=False))
+        db.session.commit()
+
+    def _recover_expired(self) -> None:
+        """接管租约已过期（或从未分配）的未完成任务；以条件更新认领，多个进程同时检查时每个任务只会被一个进程接管"""
+        now = datetime.utcnow()
+        expired = db.and_(
+            AIJob.status.in_(_UNFINISHED_STATUSES),
+            db.or_(AIJob.lease_expires_at.is_(None), AIJob.lease_expires_at < now),
+            db.or_(AIJob.owner.is_(None), AIJob.owner != self.owner)
+        )
+        job_ids = db.session.scalars(db.select(AIJob.id).where(expired).order_by(AIJob.created_at)).all()
+        recovered = []
+        for job_id in job_ids:
+            claimed = (AIJob.query
+                       .filter(AIJob.id == job_id, expired)
+                       .update({"status": JOB_QUEUED, "owner": self.owner,
+                                "lease_expires_at": self._lease_deadline()},
+                               synchronize_session=False))
+            db.session.commit()
+            if claimed:
+                recovered.append(job_id)
+                self._enqueue(job_id)
+        if recovered:
+            print(f"[JobManager] 接管租约过期的未完成任务 {len(recovered)} 个")
+
+    def _assign(self, job: AIJob) -> None:
+        """本进程在执行任务时由本进程负责；否则不分配，由执行任务的进程接管"""
+        job.status = JOB_QUEUED
+        job.owner = self.owner if self._started else None
+        job.lease_expires_at = self._lease_deadline() if self._started else None
+
+    def submit_match_job(self, brand_info: Dict[str, Any], creators: List[Dict[str, Any]],
+                         options: Dict[str, Any], total_candidates: int) -> Dict[str, Any]:
+        job = AIJob(
+            job_type='match',
+            payload={"brand_info": brand_info, "options": options, "total_candidates": total_candidates},
+            total_items=len(creators)
+        )
+        self._assign(job)
+        db.session.add(job)
+        db.session.add_all([AIJobItem(job=job, position=i, input=c) for i, c in enumerate(creators)])
+        db.session.commit()
+        self._enqueue(job.id)
+        return job.to_dict()
+
+    def submit_generate_job(self, topic: str, content_type: str, platform: str,
+                            bypass_cache: bool = False) -> Dict[str, Any]:
+        job = AIJob(job_type='generate', payload={"bypass_cache": bypass_cache}, total_items=1)
+        self._assign(job)
+        db.session.add(job)
+        db.session.add(AIJobItem(job=job, position=0,
+                                 input={"topic": topic, "type": content_type, "platform": platform}))
+        db.session.commit()
+        self._enqueue(job.id)
+        return job.to_dict()
+
+    def get(self, job_id: str, include_results: bool = True) -> Optional[Dict[str, Any]]:
+        job = db.session.get(AIJob, job_id)
+        if job is None:
+            return None
+        job_dict = job.to_dict()
+        if include_results:
+            job_dict['result'] = self._collect_results(job)
+        return job_dict
+
+    def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = db.session.get(AIJob, job_id)
+        if job is None:
+            return None
+        if job.status not in JOB_FINISHED_STATUSES:
+            with self._lock:
+                event = self._cancel_events.get(job_id)
+            if event is not None:
+                event.set()
+            # 排队中的任务直接标记；执行中的任务由工作线程在下一个子项完成后结束
+            if job.status == JOB_QUEUED or event is None:
+                job.status = JOB_CANCELLED
+                db.session.commit()
+        return job.to_dict()
+
+    def retry(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """把失败的子项重置为待执行并重新排队；已取消的任务会继续执行剩余子项"""
+        job = db.session.get(AIJob, job_id)
+        if job is None:
+            return None
+        if job.status in (JOB_QUEUED, JOB_RUNNING):
+            raise ValueError("任务正在执行中，无法重试")
+
+        reset = job.items.filter_by(status=ITEM_FAILED).update({"status": ITEM_PENDING})
+        job.failed_items = 0
+        job.error = None
+        self._assign(job)
+        db.session.commit()
+        print(f"[JobManager] 任务 {job_id} 重试，重置失败子项 {reset} 个")
+        self._enqueue(job_id)
+        return job.to_dict()
+
+    def _enqueue(self, job_id: str) -> None:
+        with self._lock:
+            if self._executor is None:
+                # 本进程不执行任务（未调用 start）：任务保持排队，由执行任务的进程接管
+                print(f"[JobManager] 任务 {job_id} 已排队，等待执行任务的进程接管")
+                return
+            self._cancel_events[job_id] = threading.Event()
+            self._executor.submit(self._run, job_id)
+
+    def _run(self, job_id: str) -> None:
+        with self._app.app_context():
+            cancel_event = self._cancel_events.get(job_id) or threading.Event()
+            try:
+                # 以条件更新原子地认领任务，避免同一任务被重复执行（如已被取消，或已被其他进程接管）
+                claimed = (AIJob.query
+                           .filter_by(id=job_id, status=JOB_QUEUED, owner=self.owner)
+                           .update({"status": JOB_RUNNING, "lease_expires_at": self._lease_deadline()}))
+                db.session.commit()
+                if not claimed:
+                    return
+                job = db.session.get(AIJob, job_id)
+
+                if job.job_type == 'match':
+                    self._run_match(job, cancel_event)
+                elif job.job_type == 'generate':
+                    self._run_generate(job)
+                else:
+                    job.status = JOB_FAILED
+                    job.error = f"未知任务类型: {job.job_type}"
+                db.session.commit()
+            except Exception as e:
+                print(f"[JobManager] 任务 {job_id} 执行异常: 类型={type(e).__name__}, 详情={e}")
+                db.session.rollback()
+                job = db.session.get(AIJob, job_id)
+                if job is not None:
+                    job.status = JOB_FAILED
+                    job.error = str(e)
+                    db.session.commit()
+            finally:
+                with self._lock:
+                    self._cancel_events.pop(job_id, None)
+                db.session.remove()
+
+    def _run_match(self, job: AIJob, cancel_event: threading.Event) -> None:
+        items = job.items.filter_by(status=ITEM_PENDING).order_by(AIJobItem.position).all()
+        brand_info = job.payload['brand_info']
+        results = self.ai_service.iter_smart_match(brand_info, [item.input for item in items],
+                                                   **job.payload.get('options', {}))
+        try:
+            for index, result in results:
+                item = items[index]
+                item.attempts += 1
+                item.result = result['match_details']
+                if result['match_details']['match_score'] == "未知":
+                    item.status = ITEM_FAILED
+                    job.failed_items += 1
+                else:
+                    item.status = ITEM_DONE
+                    job.completed_items += 1
+                db.session.commit()
+                # 提交后 job 的属性会重新读取：被其他进程取消或接管（本进程租约曾过期）时停止
+                if cancel_event.is_set() or job.status == JOB_CANCELLED:
+                    break
+                if job.owner != self.owner:
+                    print(f"[JobManager] 任务 {job.id} 已由 {job.owner} 接管，本进程停止执行")
+                    return
+        finally:
+            results.close()
+
+        if cancel_event.is_set() or job.status == JOB_CANCELLED:
+            job.status = JOB_CANCELLED
+        else:
+            job.status = JOB_COMPLETED
+            if job.failed_items:
+                job.error = f"{job.failed_items} 位创作者匹配失败，可重试"
+
+    def _run_generate(self, job: AIJob) -> None:
+        item = job.items.first()
+        item.attempts += 1
+        result = self.ai_service.generate_content(item.input['topic'], item.input['type'],
+                                                  bypass_cache=job.payload.get('bypass_cache', False))
+        if result.get('success'):
+            item.status = ITEM_DONE
+            item.result = {**result['content'], "platform": item.input['platform']}
+            job.completed_items = 1
+            job.status = JOB_COMPLETED
+        else:
+            item.status = ITEM_FAILED
+            item.result = {"message": result.get('message', '内容生成失败')}
+            job.failed_items = 1
+            job.status = JOB_FAILED
+            job.error = item.result['message']
+
+    def _collect_results(self, job: AIJob) -> Any:
+        items = (job.items
+                 .filter(AIJobItem.status.in_((ITEM_DONE, ITEM_FAILED)))
+                 .order_by(AIJobItem.position)
+                 .all())
+        if job.job_type == 'generate':
+            return items[0].result if items else None
+
+        matched = [{**item.input, "match_details": item.result} for item in items]
+        self.ai_service.sort_match_results(matched)
+        return {
+            "brand": job.payload['brand_info'],
+            "matched_creators": matched,
+            "total_matches": len(matched),
+            "total_candidates": job.payload.get('total_candidates', len(matched))
+        }
@@ -0,0 +1,319 @@
+# mcn_ai_system/src/services/llm_backends.py
+import abc
+import hashlib
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Iterator, Optional
+
+# 使用的模型后端：gemini（默认）或 stub（本地确定性桩，用于离线压测）
+DEFAULT_BACKEND = os.getenv('AI_BACKEND', 'gemini').lower()
+
+# 本地桩后端配置
+STUB_SEED = int(os.getenv('AI_STUB_SEED', '0'))
+# 延迟分布，见 parse_latency：none / fixed:秒 / uniform:最小,最大 / normal:均值,标准差 /
+# lognormal:中位数,sigma / exp:均值
+STUB_LATENCY = os.getenv('AI_STUB_LATENCY', 'none')
+STUB_ERROR_RATE = float(os.getenv('AI_STUB_ERROR_RATE', '0'))
+# 流式输出时每个片段的字符数，以及片段之间的间隔（秒）
+STUB_STREAM_CHUNK = int(os.getenv('AI_STUB_STREAM_CHUNK', '16'))
+STUB_TOKEN_LATENCY = float(os.getenv('AI_STUB_TOKEN_LATENCY', '0'))
+# 记录调用次数（决定第几次重试）与已缓存前缀的 Prompt 数量上限，超过后淘汰最久未使用的记录
+STUB_MAX_TRACKED_PROMPTS = int(os.getenv('AI_STUB_MAX_TRACKED_PROMPTS', '10000'))
+
+_CJK_PATTERN = re.compile(r'[\u3000-\u303f\u4e00-\u9fff\uff00-\uffef]')
+_WORD_PATTERN = re.compile(r'[A-Za-z0-9_]+|[^\sA-Za-z0-9_\u3000-\u303f\u4e00-\u9fff\uff00-\uffef]')
+_WHITESPACE_RUN_PATTERN = re.compile(r'\n\s*|\s{2,}')
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    不调用模型的 token 数估算：中文字符按 1 个 token，英文单词约 4 个字符 1 个 token，
+    换行及连续空白（如缩进）每段按 1 个 token。
+    """
+    cjk = len(_CJK_PATTERN.findall(text))
+    others = sum(max(1, math.ceil(len(word) / 4)) for word in _WORD_PATTERN.findall(text))
+    return cjk + others + len(_WHITESPACE_RUN_PATTERN.findall(text))
+
+
+class LLMResponse:
+    """后端统一的响应结构；text 为空表示模型没有返回内容（如被安全策略拦截）"""
+
+    def __init__(self, text: str, prompt_feedback: Any = None):
+        self.text = text
+        self.prompt_feedback = prompt_feedback
+
+
+class LLMBackend(abc.ABC):
+    """
+    大模型后端接口：generate / stream / batch / count_tokens。子类必须实现 generate 和 stream，否则无法实例化。
+    batch 的默认实现是在线程池中并发调用 generate，单个失败的 Prompt 对应位置返回异常对象。
+    """
+    name = 'base'
+    model_name = None
+
+    @abc.abstractmethod
+    def generate(self, prompt: str, timeout: float = None) -> LLMResponse:
+        """返回完整响应"""
+
+    @abc.abstractmethod
+    def stream(self, prompt: str, timeout: float = None) -> Iterator[str]:
+        """逐个产出文本片段"""
+
+    def batch(self, prompts: List[str], timeout: float = None, max_concurrency: int = 8) -> List[Any]:
+        if not prompts:
+            return []
+        with ThreadPoolExecutor(max_workers=min(max(1, max_concurrency), len(prompts)),
+                                thread_name_prefix=f"{self.name}_batch") as executor:
+            futures = [executor.submit(self.generate, prompt, timeout) for prompt in prompts]
+            results = []
+            for future in futures:
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    results.append(e)
+            return results
+
+    def generate_with_prefix(self, prefix: str, prompt: str, timeout: float = None) -> LLMResponse:
+        """
+        prefix 为多次调用共享的前缀（如同一品牌的说明与品牌信息）。
+        支持前缀缓存的后端只需上传一次前缀；默认实现直接拼接后调用 generate。
+        """
+        return self.generate(f"{prefix}\n{prompt}", timeout)
+
+    def count_tokens(self, prompt: str) -> int:
+        return estimate_tokens(prompt)
+
+    def describe(self) -> Dict[str, Any]:
+        return {"name": self.name, "model_name": self.model_name}
+
+
+class GeminiBackend(LLMBackend):
+    """
+    包装 google.generativeai 的 GenerativeModel（或任何提供 generate_content 的对象）。
+    不使用显式的前缀缓存（CachedContent）：接口要求缓存内容达到数千 token 以上，而匹配 Prompt 的共享前缀
+    只有几百 token；前缀始终放在 Prompt 开头，可以利用服务端对相同前缀的隐式缓存。
+    """
+    name = 'gemini'
+
+    def __init__(self, model):
+        self.model = model
+        self.model_name = model.model_name
+
+    def generate(self, prompt: str, timeout: float = None) -> LLMResponse:
+        kwargs = {"request_options": {"timeout": timeout}} if timeout else {}
+        response = self.model.generate_content(prompt, **kwargs)
+        return LLMResponse(self._response_text(response), getattr(response, 'prompt_feedback', None))
+
+    def stream(self, prompt: str, timeout: float = None) -> Iterator[str]:
+        kwargs = {"request_options": {"timeout": timeout}} if timeout else {}
+        for chunk in self.model.generate_content(prompt, stream=True, **kwargs):
+            text = self._response_text(chunk)
+            if text:
+                yield text
+
+    def count_tokens(self, prompt: str) -> int:
+        try:
+            return int(self.model.count_tokens(prompt).total_tokens)
+        except Exception as e:
+            print(f"[GeminiBackend] count_tokens 失败，使用本地估算: {e}")
+            return estimate_tokens(prompt)
+
+    @staticmethod
+    def _response_text(response) -> str:
+        # 被安全策略拦截时 Gemini 访问 .text 会抛出 ValueError
+        try:
+            return response.text or ''
+        except (AttributeError, ValueError):
+            return ''
+
+
+class StubBackendError(RuntimeError):
+    """桩后端按错误率注入的模拟上游错误"""
+
+    def __init__(self, message: str, status_code: int = 503):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def parse_latency(spec: str):
+    """把延迟分布描述解析为 rng -> 秒数 的函数"""
+    spec = (spec or 'none').strip().lower()
+    if spec in ('none', '0', ''):
+        return lambda rng: 0.0
+    kind, _, raw_args = spec.partition(':')
+    if not raw_args:
+        kind, raw_args = 'fixed', kind
+    try:
+        args = [float(a) for a in raw_args.split(',')]
+        if kind == 'fixed' and len(args) == 1:
+            return lambda rng: args[0]
+        if kind == 'uniform' and len(args) == 2:
+            return lambda rng: rng.uniform(args[0], args[1])
+        if kind == 'normal' and len(args) == 2:
+            return lambda rng: max(0.0, rng.gauss(args[0], args[1]))
+        if kind == 'lognormal' and len(args) == 2:
+            mu = math.log(args[0])
+            return lambda rng: rng.lognormvariate(mu, args[1])
+        if kind == 'exp' and len(args) == 1:
+            return lambda rng: rng.expovariate(1 / args[0])
+    except ValueError:
+        pass
+    raise ValueError(f"无法解析的延迟分布: {spec}")
+
+
+class StubBackend(LLMBackend):
+    """
+    本地确定性桩后端，用于离线压测并发、缓存与流式链路；记录共享前缀的复用次数但不改变延迟。
+    输出只取决于 (seed, Prompt)：相同 Prompt 总是得到相同文本，并按 Prompt 类型返回可被解析的格式
+    （内容生成的段落格式、单个匹配的文本格式、批量匹配的JSON数组）。
+    延迟和错误由 (seed, Prompt, 第几次调用) 决定，与线程调度无关，重试同一 Prompt 可能成功。
+    """
+    name = 'stub'
+
+    def __init__(self, seed: int = STUB_SEED, latency: str = STUB_LATENCY, error_rate: float = STUB_ERROR_RATE,
+                 stream_chunk: int = STUB_STREAM_CHUNK, token_latency: float = STUB_TOKEN_LATENCY,
+                 model_name: str = 'stub-model', max_tracked_prompts: int = STUB_MAX_TRACKED_PROMPTS):
+        self.seed = seed
+        self.latency_spec = latency
+        self._sample_latency = parse_latency(latency)
+        self.error_rate = min(max(0.0, float(error_rate)), 1.0)
+        self.stream_chunk = max(1, int(stream_chunk))
+        self.token_latency = max(0.0, float(token_latency))
+        self.model_name = model_name
+        self.max_tracked_prompts = max(1, int(max_tracked_prompts))
+        # 以下两项按最近使用顺序保留至多 max_tracked_prompts 条，被淘汰的 Prompt 再次调用时按第一次调用处理
+        self._attempts = OrderedDict()  # Prompt 哈希 -> 调用次数
+        self._prefixes = OrderedDict()  # 已"缓存"的前缀哈希，模拟前缀缓存的命中情况
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+        self.prefix_hits = 0
+
+    def generate(self, prompt: str, timeout: float = None) -> LLMResponse:
+        self._simulate_call(prompt, timeout)
+        return LLMResponse(self._render(prompt))
+
+    def generate_with_prefix(self, prefix: str, prompt: str, timeout: float = None) -> LLMResponse:
+        digest = self._digest(prefix)
+        with self._lock:
+            if digest in self._prefixes:
+                self.prefix_hits += 1
+            self._track(self._prefixes, digest, True)
+        return super().generate_with_prefix(prefix, prompt, timeout)
+
+    def stream(self, prompt: str, timeout: float = None) -> Iterator[str]:
+        self._simulate_call(prompt, timeout)  # 首个片段前的延迟
+        text = self._render(prompt)
+        for start in range(0, len(text), self.stream_chunk):
+            if start and self.token_latency:
+                time.sleep(self.token_latency)
+            yield text[start:start + self.stream_chunk]
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "model_name": self.model_name,
+            "seed": self.seed,
+            "latency": self.latency_spec,
+            "error_rate": self.error_rate,
+            "calls": self.calls,
+            "errors": self.errors,
+            "prefix_hits": self.prefix_hits
+        }
+
+    def _simulate_call(self, prompt: str, timeout: Optional[float]) -> None:
+        digest = self._digest(prompt)
+        with self._lock:
+            attempt = self._attempts.get(digest, 0)
+            self._track(self._attempts, digest, attempt + 1)
+            self.calls += 1
+        rng = random.Random(f"{self.seed}:{digest}:{attempt}")
+
+        latency = self._sample_latency(rng)
+        if timeout and latency > timeout:
+            time.sleep(timeout)
+            raise TimeoutError(f"模拟请求超时（{timeout}秒）")
+        if latency:
+            time.sleep(latency)
+        if rng.random() < self.error_rate:
+            with self._lock:
+                self.errors += 1
+            raise StubBackendError("模拟的上游错误: 503 Service Unavailable")
+
+    def _track(self, entries: OrderedDict, digest: str, value: Any) -> None:
+        """写入记录并淘汰最久未使用的记录，调用方需持有 self._lock"""
+        entries[digest] = value
+        entries.move_to_end(digest)
+        while len(entries) > self.max_tracked_prompts:
+            entries.popitem(last=False)
+
+    def _digest(self, prompt: str) -> str:
+        return hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+
+    def _render(self, prompt: str) -> str:
+        rng = random.Random(f"{self.seed}:{self._digest(prompt)}")
+        if '请只返回一个JSON对象' in prompt:  # 风险复核；待检测内容可能包含其他分支的关键字，需最先判断
+            return self._render_risk(rng)
+        if '请只返回一个JSON数组' in prompt:
+            return self._render_batch_match(prompt, rng)
+        if '匹配度：' in prompt:
+            score = rng.choice(["高", "中", "低"])
+            return (f"匹配度：{score}\n"
+                    f"匹配理由：【桩】创作者画像与品牌目标受众的契合度为{score}。\n"
+                    f"合作建议：{'【桩】先进行一次短视频试投放' if score != '低' else '无'}")
+        if '标题：' in prompt:
+            return self._render_content(prompt, rng)
+        return f"【桩】已收到请求（{len(prompt)} 字符），编号 {rng.randrange(10 ** 6):06d}。"
+
+    def _render_batch_match(self, prompt: str, rng: random.Random) -> str:
+        items = []
+        for creator_id in re.findall(r'创作者ID：(\S+)', prompt):
+            score = rng.choice(["高", "中", "低"])
+            items.append({
+                "creator_id": creator_id,
+                "match_score": score,
+                "reason": f"【桩】创作者 {creator_id} 与品牌的契合度为{score}。",
+                "suggestions": "【桩】先进行一次短视频试投放" if score != '低' else "无"
+            })
+        return json.dumps(items, ensure_ascii=False)
+
+    def _render_risk(self, rng: random.Random) -> str:
+        levels = {category: rng.choice(["低", "低", "中"])
+                  for category in ("political_sensitivity", "legal_compliance", "ethical_concerns")}
+        result = {
+            "overall_risk": "中" if "中" in levels.values() else "低",
+            **{category: {"level": level, "reason": f"【桩】结合上下文判定为{level}风险。"}
+               for category, level in levels.items()},
+            "suggestions": ["【桩】建议人工复核相关表述"] if "中" in levels.values() else []
+        }
+        return json.dumps(result, ensure_ascii=False)
+
+    def _render_content(self, prompt: str, rng: random.Random) -> str:
+        topic_match = re.search(r'主题[^：\n]*：(.+)', prompt)
+        topic = topic_match.group(1).strip() if topic_match else "主题"
+        lines = [f"标题：【桩】{topic}的{rng.choice(['爆款', '干货', '必看', '宝藏'])}指南"]
+        if '描述：' in prompt:
+            script = "\n".join(f"第{i + 1}段：围绕{topic}展开第{i + 1}个要点。" for i in range(rng.randint(3, 6)))
+            lines += [
+                f"描述：【桩】三分钟带你了解{topic}。",
+                f"脚本：开场白\n{script}",
+                f"标签：{topic},{rng.choice(['生活', '测评', '教程'])},桩数据"
+            ]
+        return "\n".join(lines)
+
+
+def create_backend(name: str) -> Optional[LLMBackend]:
+    """按名称创建不依赖 API KEY 的后端；gemini 后端由 ModelResolver 延迟解析，这里返回 None"""
+    name = (name or 'gemini').lower()
+    if name == 'stub':
+        return StubBackend()
+    if name == 'gemini':
+        return None
+    raise ValueError(f"不支持的模型后端: {name}")
@@ -0,0 +1,132 @@
+# mcn_ai_system/src/services/match_store.py
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+# 参与匹配 Prompt 的品牌字段与创作者字段，任一字段变化都会使该品牌×创作者的缓存结果失效
+BRAND_FINGERPRINT_FIELDS = ('name', 'description', 'target_audience', 'products_services')
+CREATOR_FINGERPRINT_FIELDS = ('tags', 'style', 'followers', 'past_collaborations')
+
+
+class MatchResultStore:
+    """
+    品牌×创作者匹配结果存储。
+    以 (品牌, 创作者) 为槽位，保存匹配详情及其对应的资料指纹；
+    读取时指纹不一致说明品牌或创作者资料已修改，该结果作废并需要重新评估。
+    可选的 SQLite 持久层与响应缓存共用同一个数据库文件。
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl: float = 86400, db_path: str = None):
+        self.max_entries = max(1, int(max_entries))
+        self.ttl = float(ttl)
+        self._entries = OrderedDict()  # 槽位 -> (指纹, 过期时间戳, 匹配详情)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+        self._conn = None
+
+        if db_path:
+            try:
+                os.makedirs(os.path.dirname(db_path), exist_ok=True)
+                self._conn = sqlite3.connect(db_path, check_same_thread=False)
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS match_results ("
+                    "pair_key TEXT PRIMARY KEY, fingerprint TEXT NOT NULL, "
+                    "details TEXT NOT NULL, expires_at REAL NOT NULL)"
+                )
+                self._conn.execute("DELETE FROM match_results WHERE expires_at < ?", (time.time(),))
+                self._conn.commit()
+            except sqlite3.Error as e:
+                print(f"[MatchResultStore] 持久化存储初始化失败，仅使用内存: {e}")
+                self._conn = None
+
+    @staticmethod
+    def pair_key(brand_info: Dict[str, Any], creator_info: Dict[str, Any]) -> str:
+        """品牌×创作者槽位：优先使用ID，没有ID时退化为名称"""
+        brand_ref = brand_info.get('id') or brand_info.get('name', '')
+        creator_ref = creator_info.get('id') or creator_info.get('name', '')
+        return f"{brand_ref}|{creator_ref}"
+
+    @staticmethod
+    def fingerprint(brand_info: Dict[str, Any], creator_info: Dict[str, Any], model_name: str) -> str:
+        payload = {
+            "model": model_name,
+            "brand": {field: brand_info.get(field) for field in BRAND_FINGERPRINT_FIELDS},
+            "creator": {field: creator_info.get(field) for field in CREATOR_FINGERPRINT_FIELDS}
+        }
+        encoded = json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str)
+        return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+    def get(self, brand_info: Dict[str, Any], creator_info: Dict[str, Any],
+            model_name: str) -> Optional[Dict[str, Any]]:
+        key = self.pair_key(brand_info, creator_info)
+        fingerprint = self.fingerprint(brand_info, creator_info, model_name)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None and self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT fingerprint, expires_at, details FROM match_results WHERE pair_key = ?", (key,)
+                ).fetchone()
+                if row:
+                    entry = (row[0], row[1], json.loads(row[2]))
+                    self._store_in_memory(key, entry)
+
+            if entry is not None:
+                if entry[0] == fingerprint and entry[1] > now:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return dict(entry[2])
+                # 资料已变更或已过期：丢弃旧结果
+                self._invalidations += 1
+                self._delete(key)
+
+            self._misses += 1
+            return None
+
+    def put(self, brand_info: Dict[str, Any], creator_info: Dict[str, Any],
+            model_name: str, details: Dict[str, Any]) -> None:
+        key = self.pair_key(brand_info, creator_info)
+        entry = (self.fingerprint(brand_info, creator_info, model_name), time.time() + self.ttl, dict(details))
+        with self._lock:
+            self._store_in_memory(key, entry)
+            if self._conn is not None:
+                try:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO match_results (pair_key, fingerprint, details, expires_at) "
+                        "VALUES (?, ?, ?, ?)",
+                        (key, entry[0], json.dumps(entry[2], ensure_ascii=False), entry[1])
+                    )
+                    self._conn.commit()
+                except sqlite3.Error as e:
+                    print(f"[MatchResultStore] 写入持久化存储失败: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "invalidations": self._invalidations,
+                "size": len(self._entries),
+                "persistent": self._conn is not None
+            }
+
+    def _store_in_memory(self, key: str, entry: tuple) -> None:
+        # 调用方需持有锁
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _delete(self, key: str) -> None:
+        # 调用方需持有锁
+        self._entries.pop(key, None)
+        if self._conn is not None:
+            self._conn.execute("DELETE FROM match_results WHERE pair_key = ?", (key,))
+            self._conn.commit()
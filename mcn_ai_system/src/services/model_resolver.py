@@ -0,0 +1,146 @@
+# mcn_ai_system/src/services/model_resolver.py
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Any, Optional
+
+# 模型选择结果的磁盘缓存，避免每个进程启动后都调用 list_models
+DEFAULT_MODEL_SELECTION_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'database',
+                                            'model_selection.json')
+MODEL_SELECTION_TTL = float(os.getenv('AI_MODEL_SELECTION_TTL', '86400'))
+# 模型发现失败后，间隔多少秒再重新尝试
+MODEL_RETRY_INTERVAL = float(os.getenv('AI_MODEL_RETRY_INTERVAL', '60'))
+
+# 模型优先级：依次选择第一个可用的模型，都不可用时选择列表中的第一个
+PREFERRED_MODELS = ('gemini-1.5-flash', 'gemini-1.5-pro', 'gemini-pro')
+
+# 解析状态
+STATE_DISABLED = 'disabled'  # 未配置 API KEY
+STATE_UNRESOLVED = 'unresolved'
+STATE_RESOLVING = 'resolving'
+STATE_READY = 'ready'
+STATE_FAILED = 'failed'
+
+
+def select_model_name(available_models: List[str]) -> Optional[str]:
+    """从支持 generateContent 的模型列表中按优先级选择模型（兼容带或不带 'models/' 前缀的名称）"""
+    short_names = [name.split('/')[-1] for name in available_models]
+    for preferred in PREFERRED_MODELS:
+        if preferred in short_names:
+            return preferred
+    return short_names[0] if short_names else None
+
+
+class ModelResolver:
+    """
+    延迟解析 Gemini 模型：构造时不做任何网络请求，首次使用模型时才调用 list_models 选择模型。
+    选择结果连同 API KEY 指纹写入磁盘缓存，有效期内的新进程直接复用，无需再次列出模型。
+    可通过 warm_up 在后台线程提前解析。genai_client 默认为 google.generativeai，
+    也可以传入实现了 configure / list_models / GenerativeModel 的本地桩对象。
+    """
+
+    def __init__(self, api_key: str = None, genai_client=None, cache_path: str = DEFAULT_MODEL_SELECTION_PATH,
+                 ttl: float = MODEL_SELECTION_TTL, retry_interval: float = MODEL_RETRY_INTERVAL):
+        self.api_key = api_key
+        self.genai_client = genai_client
+        self.cache_path = cache_path
+        self.ttl = float(ttl)
+        self.retry_interval = float(retry_interval)
+        self._lock = threading.Lock()
+        self._model = None
+        self._state = STATE_UNRESOLVED if api_key else STATE_DISABLED
+        self._source = None  # cache / discovery / override
+        self._error = None
+        self._failed_at = 0.0
+
+    def resolve(self):
+        """返回可用的模型对象，未配置或解析失败时返回 None；并发调用时只有一个线程执行解析"""
+        if self._state in (STATE_READY, STATE_DISABLED) or (
+                self._state == STATE_FAILED and time.monotonic() - self._failed_at < self.retry_interval):
+            return self._model
+        with self._lock:
+            if self._state in (STATE_UNRESOLVED, STATE_FAILED):
+                self._resolve_locked()
+            return self._model
+
+    def override(self, model) -> None:
+        """直接指定模型对象（如测试桩），跳过模型发现"""
+        with self._lock:
+            self._model = model
+            self._state = STATE_READY if model is not None else STATE_DISABLED
+            self._source = 'override'
+            self._error = None
+
+    def warm_up(self) -> threading.Thread:
+        """在后台线程中提前解析模型，不阻塞调用方"""
+        thread = threading.Thread(target=self.resolve, name="ai_model_warm_up", daemon=True)
+        thread.start()
+        return thread
+
+    def status(self) -> Dict[str, Any]:
+        """当前解析状态，不会触发解析"""
+        return {
+            "state": self._state,
+            "model_name": getattr(self._model, 'model_name', None),
+            "source": self._source,
+            "error": self._error
+        }
+
+    def _resolve_locked(self) -> None:
+        self._state = STATE_RESOLVING
+        try:
+            self.genai_client.configure(api_key=self.api_key)
+            model_name, source = self._read_cache(), 'cache'
+            if model_name is None:
+                model_name, source = self._discover(), 'discovery'
+            if model_name is None:
+                raise RuntimeError("未找到任何支持 'generateContent' 方法的模型。")
+
+            self._model = self.genai_client.GenerativeModel(model_name)
+            self._state, self._source, self._error = STATE_READY, source, None
+            print(f"[ModelResolver] 模型初始化成功，使用的模型: {self._model.model_name}（来源: {source}）")
+        except Exception as e:
+            print(f"[ModelResolver] 列出模型或选择模型失败: {e}")
+            self._model = None
+            self._state, self._error = STATE_FAILED, str(e)
+            self._failed_at = time.monotonic()
+
+    def _discover(self) -> Optional[str]:
+        available_models = [m.name for m in self.genai_client.list_models()
+                            if 'generateContent' in m.supported_generation_methods]
+        model_name = select_model_name(available_models)
+        if model_name:
+            self._write_cache(model_name)
+        return model_name
+
+    def _key_fingerprint(self) -> str:
+        # 不同的 API KEY 可用模型可能不同，缓存只对同一个 KEY 有效；文件中不保存 KEY 本身
+        return hashlib.sha256(self.api_key.encode('utf-8')).hexdigest()[:16]
+
+    def _read_cache(self) -> Optional[str]:
+        if not self.cache_path:
+            return None
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            if entry.get('key_fingerprint') == self._key_fingerprint() and \
+                    time.time() - float(entry.get('resolved_at', 0)) < self.ttl:
+                return entry.get('model_name')
+        except (OSError, ValueError, TypeError):
+            pass
+        return None
+
+    def _write_cache(self, model_name: str) -> None:
+        if not self.cache_path:
+            return
+        entry = {"model_name": model_name, "resolved_at": time.time(), "key_fingerprint": self._key_fingerprint()}
+        tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, self.cache_path)  # 原子替换，多个进程同时写入也不会读到半个文件
+        except OSError as e:
+            print(f"[ModelResolver] 模型选择结果写入失败: {e}")
@@ -0,0 +1,221 @@
+# mcn_ai_system/src/services/prompt_builder.py
+import os
+import textwrap
+import threading
+from typing import Dict, List, Any, Tuple
+
+from src.services.llm_backends import estimate_tokens
+
+# 长文本字段（品牌描述、过往合作等）在 Prompt 中的 token 上限
+PROMPT_FIELD_TOKEN_BUDGET = int(os.getenv('AI_PROMPT_FIELD_TOKEN_BUDGET', '80'))
+TRUNCATED_FIELDS = ('description', 'target_audience', 'products_services', 'past_collaborations')
+# 风险复核时待检测内容的 token 上限
+RISK_CONTENT_TOKEN_BUDGET = int(os.getenv('AI_RISK_CONTENT_TOKEN_BUDGET', '2000'))
+
+
+def compact_template(template: str) -> str:
+    """去掉 f-string 模板的缩进、行首行尾空白和空行"""
+    lines = (line.strip() for line in textwrap.dedent(template).splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def truncate_tokens(text: str, budget: int) -> Tuple[str, bool]:
+    """把文本截断到 token 预算以内（按本地估算），返回 (文本, 是否截断)"""
+    if budget <= 0 or estimate_tokens(text) <= budget:
+        return text, False
+    low, high = 0, len(text)
+    while low < high:  # 二分查找满足预算的最长前缀
+        middle = (low + high + 1) // 2
+        if estimate_tokens(text[:middle]) < budget:
+            low = middle
+        else:
+            high = middle - 1
+    return text[:low].rstrip() + "…", True
+
+
+# 内容生成模板
+_TITLE_TEMPLATE = compact_template("""
+    请为以下主题生成一个吸引人的标题：{topic}
+    请按以下格式返回：
+    标题：[生成一个吸引人的标题]
+    要求：
+    1. 标题要简洁有力，具有吸引力
+    2. 10-30字
+    3. 符合社交媒体传播特点
+""")
+_CONTENT_TEMPLATE = compact_template("""
+    请为以下主题生成{content_kind}内容：{topic}
+    请按以下格式返回：
+    标题：[生成一个吸引人的标题]
+    描述：[生成一个简洁的描述，50-100字]
+    脚本：[生成详细的内容脚本，200-500字]
+    标签：[生成3-5个相关标签，用逗号分隔]
+    要求：
+    1. 内容要有创意且吸引人
+    2. 符合社交媒体传播特点
+    3. 语言生动有趣
+    4. 适合目标受众
+""")
+
+# 匹配模板：说明和品牌信息放在前面作为同一品牌共享的前缀，创作者信息放在最后
+_MATCH_PREFIX_TEMPLATE = compact_template("""
+    请根据以下品牌信息和创作者信息，评估该创作者与品牌的匹配度，并给出匹配理由。
+    要求：
+    1. 匹配度：高/中/低
+    2. 匹配理由：详细说明匹配或不匹配的原因。
+    3. 如果匹配度为中或高，请给出1-2点合作建议。
+    请按以下格式返回：
+    匹配度：[高/中/低]
+    匹配理由：[详细说明匹配原因]
+    合作建议：[如果匹配度为中或高，请给出1-2点建议，否则写无]
+    {brand_block}
+""")
+_BATCH_MATCH_PREFIX_TEMPLATE = compact_template("""
+    请根据以下品牌信息和多位创作者信息，逐一评估每位创作者与品牌的匹配度，并给出匹配理由。
+    要求：
+    1. 匹配度：高/中/低
+    2. 匹配理由：详细说明匹配或不匹配的原因。
+    3. 如果匹配度为中或高，请给出1-2点合作建议，否则写无。
+    请只返回一个JSON数组，不要包含其他文字，每位创作者对应一个元素：
+    [{{"creator_id": "创作者ID", "match_score": "高/中/低", "reason": "匹配理由", "suggestions": "合作建议"}}]
+    {brand_block}
+""")
+_BRAND_TEMPLATE = compact_template("""
+    品牌信息：
+    品牌名称：{name}
+    品牌描述：{description}
+    目标受众：{target_audience}
+    主要产品/服务：{products_services}
+""")
+_CREATOR_TEMPLATE = compact_template("""
+    创作者名称：{name}
+    创作者领域/标签：{tags}
+    创作者风格：{style}
+    粉丝数量：{followers}
+    过往合作案例：{past_collaborations}
+""")
+
+# 风险复核模板：只有规则引擎命中依赖上下文的词语时才使用
+_RISK_TEMPLATE = compact_template("""
+    请从政治敏感性、法律合规性、道德伦理三个维度评估以下社交媒体内容的发布风险。
+    规则引擎命中了以下需要结合上下文判断的词语：{hits}
+    请判断这些词语在上下文中是否构成违规，每个维度给出风险等级（高/中/低）和理由，并给出修改建议。
+    请只返回一个JSON对象，不要包含其他文字：
+    {{"overall_risk": "高/中/低", "political_sensitivity": {{"level": "高/中/低", "reason": "理由"}}, "legal_compliance": {{"level": "高/中/低", "reason": "理由"}}, "ethical_concerns": {{"level": "高/中/低", "reason": "理由"}}, "suggestions": ["修改建议"]}}
+    待检测内容：
+    {content}
+""")
+
+
+class PromptParts:
+    """
+    一个 Prompt 的组成：prefix 为可在多次调用间共享的前缀（同一品牌的说明和品牌信息），
+    body 为每次调用不同的部分。不支持前缀缓存的后端直接发送 prefix + body。
+    """
+
+    def __init__(self, kind: str, prefix: str, body: str):
+        self.kind = kind
+        self.prefix = prefix
+        self.body = body
+        self.text = f"{prefix}\n{body}" if prefix else body
+        self.tokens = estimate_tokens(self.text)
+        self.prefix_tokens = estimate_tokens(prefix) if prefix else 0
+
+
+class PromptBuilder:
+    """
+    构建内容生成、智能匹配与风险复核的 Prompt：模板已去除缩进与空行，字段值合并空白，
+    长文本字段截断到 token 预算内；按 Prompt 类型统计数量和 token 数。所有方法都是线程安全的。
+    """
+
+    def __init__(self, field_token_budget: int = PROMPT_FIELD_TOKEN_BUDGET,
+                 risk_content_token_budget: int = RISK_CONTENT_TOKEN_BUDGET):
+        self.field_token_budget = field_token_budget
+        self.risk_content_token_budget = risk_content_token_budget
+        self._lock = threading.Lock()
+        self._stats = {}  # 类型 -> 统计
+        self._truncated_fields = 0
+
+    def content_prompt(self, topic: str, content_type: str) -> PromptParts:
+        topic = self._clean(topic)
+        if content_type == "title":
+            body = _TITLE_TEMPLATE.format(topic=topic)
+        else:
+            content_kind = "社交媒体帖子" if content_type == "post" else self._clean(content_type)
+            body = _CONTENT_TEMPLATE.format(content_kind=content_kind, topic=topic)
+        return self._record(PromptParts('content', '', body))
+
+    def match_prompt(self, brand_info: Dict[str, Any], creator_info: Dict[str, Any]) -> PromptParts:
+        prefix = _MATCH_PREFIX_TEMPLATE.format(brand_block=self._brand_block(brand_info))
+        body = "创作者信息：\n" + self._creator_block(creator_info)
+        return self._record(PromptParts('match', prefix, body))
+
+    def batch_match_prompt(self, brand_info: Dict[str, Any], creators: List[Dict[str, Any]],
+                           creator_keys: List[str]) -> PromptParts:
+        prefix = _BATCH_MATCH_PREFIX_TEMPLATE.format(brand_block=self._brand_block(brand_info))
+        blocks = [f"创作者ID：{key}\n{self._creator_block(creator_info)}"
+                  for key, creator_info in zip(creator_keys, creators)]
+        body = "创作者列表：\n" + "\n".join(blocks)
+        return self._record(PromptParts('batch_match', prefix, body))
+
+    def risk_prompt(self, content: str, hits: List[Dict[str, Any]]) -> PromptParts:
+        """hits 为规则引擎的命中列表，列出命中的词语及其规则分组，提示模型重点判断"""
+        terms = "、".join(dict.fromkeys(f"{hit['text']}（{hit['group']}）" for hit in hits)) or "无"
+        content, truncated = truncate_tokens(self._clean(content), self.risk_content_token_budget)
+        if truncated:
+            with self._lock:
+                self._truncated_fields += 1
+        return self._record(PromptParts('risk', '', _RISK_TEMPLATE.format(hits=self._clean(terms), content=content)))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            by_kind = {
+                kind: {**entry, "avg_tokens": round(entry["tokens"] / entry["prompts"], 1)}
+                for kind, entry in self._stats.items()
+            }
+            return {
+                "field_token_budget": self.field_token_budget,
+                "truncated_fields": self._truncated_fields,
+                "by_kind": by_kind
+            }
+
+    def _brand_block(self, brand_info: Dict[str, Any]) -> str:
+        return _BRAND_TEMPLATE.format(
+            name=self._clean(brand_info.get('name', '未知品牌')),
+            description=self._field(brand_info, 'description', '无描述'),
+            target_audience=self._field(brand_info, 'target_audience', '不明确'),
+            products_services=self._field(brand_info, 'products_services', '不明确')
+        )
+
+    def _creator_block(self, creator_info: Dict[str, Any]) -> str:
+        tags = creator_info.get('tags')
+        return _CREATOR_TEMPLATE.format(
+            name=self._clean(creator_info.get('name', '未知创作者')),
+            tags=', '.join(tags) if tags else '无标签',
+            style=self._clean(creator_info.get('style', '不明确')),
+            followers=creator_info.get('followers', '不明确'),
+            past_collaborations=self._field(creator_info, 'past_collaborations', '无')
+        )
+
+    def _field(self, info: Dict[str, Any], name: str, default: str) -> str:
+        value = self._clean(info.get(name) or default)
+        if name in TRUNCATED_FIELDS:
+            value, truncated = truncate_tokens(value, self.field_token_budget)
+            if truncated:
+                with self._lock:
+                    self._truncated_fields += 1
+        return value
+
+    @staticmethod
+    def _clean(value: Any) -> str:
+        return " ".join(str(value).split())
+
+    def _record(self, parts: PromptParts) -> PromptParts:
+        with self._lock:
+            entry = self._stats.setdefault(parts.kind, {"prompts": 0, "tokens": 0, "prefix_tokens": 0,
+                                                        "max_tokens": 0})
+            entry["prompts"] += 1
+            entry["tokens"] += parts.tokens
+            entry["prefix_tokens"] += parts.prefix_tokens
+            entry["max_tokens"] = max(entry["max_tokens"], parts.tokens)
+        return parts
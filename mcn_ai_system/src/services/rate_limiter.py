@@ -0,0 +1,319 @@
+# mcn_ai_system/src/services/rate_limiter.py
+import os
+import random
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, Callable, Iterator, Optional
+
+# 每分钟请求数 / token 数上限，0 表示不限制
+RATE_LIMIT_RPM = float(os.getenv('AI_RATE_LIMIT_RPM', '0'))
+RATE_LIMIT_TPM = float(os.getenv('AI_RATE_LIMIT_TPM', '0'))
+# 设置后令牌桶保存在该 SQLite 文件中，同一台机器上的多个 worker 进程共享配额
+RATE_LIMIT_DB = os.getenv('AI_RATE_LIMIT_DB', '')
+# 自适应并发（AIMD）：初始值、上下限，以及触发降低并发的延迟阈值（秒）
+ADAPTIVE_INITIAL = int(os.getenv('AI_ADAPTIVE_INITIAL', '16'))
+ADAPTIVE_MIN = int(os.getenv('AI_ADAPTIVE_MIN', '1'))
+ADAPTIVE_MAX = int(os.getenv('AI_ADAPTIVE_MAX', '64'))
+ADAPTIVE_LATENCY_TARGET = float(os.getenv('AI_ADAPTIVE_LATENCY_TARGET', '20'))
+# 可重试错误的最大重试次数，以及指数退避的基础与最大间隔（秒）
+MAX_RETRIES = int(os.getenv('AI_MAX_RETRIES', '3'))
+RETRY_BASE_DELAY = float(os.getenv('AI_RETRY_BASE_DELAY', '0.5'))
+RETRY_MAX_DELAY = float(os.getenv('AI_RETRY_MAX_DELAY', '8'))
+
+# 可重试的 HTTP 状态码与异常类型（google.api_core 的异常按类名识别，无需导入）
+RETRIABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+RETRIABLE_EXCEPTION_NAMES = {'ResourceExhausted', 'TooManyRequests', 'ServiceUnavailable', 'DeadlineExceeded',
+                             'InternalServerError', 'GatewayTimeout', 'Aborted'}
+
+
+class RateLimitTimeout(TimeoutError):
+    """在调用方的截止时间内无法获得配额"""
+
+
+def is_retriable(e: BaseException) -> bool:
+    """限流、超时、服务端临时错误可以重试；参数错误、鉴权失败、内容被拦截等不重试"""
+    if isinstance(e, RateLimitTimeout):
+        return False
+    if isinstance(e, (TimeoutError, ConnectionError)):
+        return True
+    if type(e).__name__ in RETRIABLE_EXCEPTION_NAMES:
+        return True
+    code = getattr(e, 'status_code', None) or getattr(e, 'code', None)
+    try:
+        return int(code) in RETRIABLE_STATUS_CODES
+    except (TypeError, ValueError):
+        return False
+
+
+def backoff_delay(attempt: int, base: float = RETRY_BASE_DELAY, cap: float = RETRY_MAX_DELAY) -> float:
+    """带完全抖动（full jitter）的指数退避：在 [0, min(cap, base * 2^attempt)] 内均匀取值"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class TokenBucket:
+    """
+    进程内令牌桶：每分钟补充 rate_per_minute 个令牌，最多积累 capacity 个（默认一分钟的量）。
+    acquire 阻塞直到令牌足够；charge 直接扣减（允许为负），用于事后按实际输出补记 token 用量。
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: float = None):
+        self.rate = float(rate_per_minute) / 60.0  # 每秒补充的令牌数
+        self.capacity = float(capacity or rate_per_minute)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, amount: float = 1, deadline: float = None) -> float:
+        """取走 amount 个令牌并返回等待的秒数；截止时间（time.monotonic）前无法取得时抛出 RateLimitTimeout"""
+        amount = min(float(amount), self.capacity)  # 超过桶容量的请求按满桶处理，否则永远无法满足
+        waited = 0.0
+        while True:
+            wait = self._take(amount)
+            if wait <= 0:
+                return waited
+            if deadline is not None and time.monotonic() + wait > deadline:
+                raise RateLimitTimeout(f"等待限流配额超时（还需 {wait:.1f} 秒）")
+            # 分段等待：其他进程或 charge 可能改变令牌数量
+            time.sleep(min(wait, 1.0))
+            waited += min(wait, 1.0)
+
+    def charge(self, amount: float) -> None:
+        self._take(float(amount), force=True)
+
+    def level(self) -> float:
+        """当前可用令牌数"""
+        return round(self._take(0.0, peek=True), 2)
+
+    def _take(self, amount: float, force: bool = False, peek: bool = False) -> float:
+        # 返回 0 表示已取走，否则返回还需等待的秒数；peek 时返回当前令牌数
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            if peek:
+                return self._tokens
+            if force or self._tokens >= amount:
+                self._tokens -= amount
+                return 0.0
+            return (amount - self._tokens) / self.rate
+
+
+class SQLiteTokenBucket(TokenBucket):
+    """
+    保存在 SQLite 中的令牌桶，多个进程使用同一文件时共享配额。
+    每次取令牌在 BEGIN IMMEDIATE 事务中完成补充和扣减，保证跨进程原子性；时间使用墙上时钟。
+    """
+
+    def __init__(self, name: str, rate_per_minute: float, db_path: str, capacity: float = None):
+        super().__init__(rate_per_minute, capacity)
+        self.name = name
+        self.db_path = db_path
+        self._local = threading.local()  # 每个线程使用自己的连接
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS rate_limit_buckets ("
+            "name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def _take(self, amount: float, force: bool = False, peek: bool = False) -> float:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            row = conn.execute("SELECT tokens, updated_at FROM rate_limit_buckets WHERE name = ?",
+                               (self.name,)).fetchone()
+            tokens = self.capacity if row is None else min(self.capacity, row[0] + (now - row[1]) * self.rate)
+            wait = 0.0
+            if peek:
+                wait = tokens
+            elif force or tokens >= amount:
+                tokens -= amount
+            else:
+                wait = (amount - tokens) / self.rate
+            conn.execute("INSERT OR REPLACE INTO rate_limit_buckets (name, tokens, updated_at) VALUES (?, ?, ?)",
+                         (self.name, tokens, now))
+            conn.execute("COMMIT")
+            return wait
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD 自适应并发：成功且延迟低于阈值时线性增加上限（每个"上限"个成功请求 +1），
+    出现限流/超时等过载信号或延迟超过阈值时乘性减半；减半之间至少间隔 cooldown 秒，
+    避免同一波失败把上限一次降到底。
+    """
+
+    def __init__(self, initial: int = ADAPTIVE_INITIAL, min_limit: int = ADAPTIVE_MIN,
+                 max_limit: int = ADAPTIVE_MAX, latency_target: float = ADAPTIVE_LATENCY_TARGET,
+                 decrease_factor: float = 0.5, cooldown: float = 1.0):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(max(initial, self.min_limit), self.max_limit))
+        self.latency_target = latency_target
+        self.decrease_factor = decrease_factor
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+
+    def acquire(self, deadline: float = None) -> None:
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise RateLimitTimeout("等待并发配额超时")
+                self._condition.wait(remaining)
+            self.in_flight += 1
+
+    def release(self, latency: float, overloaded: bool = False, succeeded: bool = True) -> None:
+        with self._condition:
+            self.in_flight -= 1
+            if overloaded or latency > self.latency_target:
+                now = time.monotonic()
+                if now - self._last_decrease >= self.cooldown:
+                    self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+                    self._last_decrease = now
+            elif succeeded:
+                self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+            self._condition.notify_all()
+
+
+class ModelRateLimiter:
+    """
+    模型调用的客户端限流：每次调用依次获取并发配额（AIMD）、请求配额（rpm）和 token 配额（tpm），
+    调用结束后按实际输出补记 token 用量。可重试的错误（见 is_retriable）按带抖动的指数退避重试，
+    重试不会超出调用方的截止时间；其他错误立即抛出。
+    """
+
+    def __init__(self, rpm: float = RATE_LIMIT_RPM, tpm: float = RATE_LIMIT_TPM, db_path: str = RATE_LIMIT_DB,
+                 concurrency: AdaptiveConcurrencyLimiter = None, max_retries: int = MAX_RETRIES):
+        def bucket(name, rate):
+            if not rate:
+                return None
+            return SQLiteTokenBucket(name, rate, db_path) if db_path else TokenBucket(rate)
+
+        self.request_bucket = bucket('requests', rpm)
+        self.token_bucket = bucket('tokens', tpm)
+        self.concurrency = concurrency or AdaptiveConcurrencyLimiter()
+        self.max_retries = max(0, max_retries)
+        self.shared = bool(db_path)
+        self._lock = threading.Lock()
+        self._stats = {"calls": 0, "retries": 0, "overloaded": 0, "failed": 0, "throttled_seconds": 0.0}
+
+    def call(self, fn: Callable[[Optional[float]], Any], tokens: int = 0, timeout: float = None,
+             output_tokens: Callable[[Any], int] = None) -> Any:
+        """
+        fn 接收剩余超时时间（秒，无截止时间时为 None）并执行一次模型调用；
+        output_tokens 根据结果计算输出 token 数，用于补记 tpm 用量。
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        attempt = 0
+        while True:
+            self._acquire(tokens, deadline)
+            started = time.monotonic()
+            try:
+                result = fn(self._remaining(deadline))
+            except Exception as e:
+                if self._handle_failure(e, started, attempt, deadline):
+                    attempt += 1
+                    continue
+                raise
+            self.concurrency.release(time.monotonic() - started)
+            if self.token_bucket and output_tokens:
+                self.token_bucket.charge(output_tokens(result))
+            return result
+
+    def stream(self, fn: Callable[[Optional[float]], Iterator[str]], tokens: int = 0, timeout: float = None,
+               output_tokens: Callable[[str], int] = None) -> Iterator[str]:
+        """流式调用：在产出第一个片段之前失败可以重试，之后的错误直接抛给调用方"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        attempt = 0
+        while True:
+            self._acquire(tokens, deadline)
+            started = time.monotonic()
+            try:
+                iterator = iter(fn(self._remaining(deadline)))
+                first = next(iterator, None)
+            except Exception as e:
+                if self._handle_failure(e, started, attempt, deadline):
+                    attempt += 1
+                    continue
+                raise
+            break
+
+        # 以首个片段的延迟作为 AIMD 的延迟信号，配额一直占用到流结束
+        first_latency = time.monotonic() - started
+        produced, overloaded = [], False
+        try:
+            if first is not None:
+                produced.append(first)
+                yield first
+            for chunk in iterator:
+                produced.append(chunk)
+                yield chunk
+        except Exception as e:
+            overloaded = is_retriable(e)
+            raise
+        finally:
+            self.concurrency.release(first_latency, overloaded=overloaded)
+            if self.token_bucket and output_tokens:
+                self.token_bucket.charge(output_tokens("".join(produced)))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats, throttled_seconds=round(self._stats["throttled_seconds"], 2))
+        stats.update({
+            "concurrency_limit": round(self.concurrency.limit, 2),
+            "in_flight": self.concurrency.in_flight,
+            "rpm_available": self.request_bucket.level() if self.request_bucket else None,
+            "tpm_available": self.token_bucket.level() if self.token_bucket else None,
+            "shared": self.shared
+        })
+        return stats
+
+    def _acquire(self, tokens: int, deadline: Optional[float]) -> None:
+        waited = 0.0
+        self.concurrency.acquire(deadline)
+        try:
+            if self.request_bucket:
+                waited += self.request_bucket.acquire(1, deadline)
+            if self.token_bucket and tokens:
+                waited += self.token_bucket.acquire(tokens, deadline)
+        except BaseException:
+            self.concurrency.release(0.0, succeeded=False)
+            raise
+        with self._lock:
+            self._stats["calls"] += 1
+            self._stats["throttled_seconds"] += waited
+
+    def _handle_failure(self, e: Exception, started: float, attempt: int, deadline: Optional[float]) -> bool:
+        """释放并发配额并记录失败，返回是否应当重试（已完成退避等待）"""
+        retriable = is_retriable(e)
+        self.concurrency.release(time.monotonic() - started, overloaded=retriable, succeeded=False)
+        with self._lock:
+            self._stats["overloaded" if retriable else "failed"] += 1
+        if not retriable or attempt >= self.max_retries:
+            return False
+        delay = backoff_delay(attempt)
+        if deadline is not None and time.monotonic() + delay >= deadline:
+            return False
+        print(f"[ModelRateLimiter] 可重试错误（{type(e).__name__}: {e}），{delay:.2f} 秒后第 {attempt + 1} 次重试")
+        with self._lock:
+            self._stats["retries"] += 1
+        time.sleep(delay)
+        return True
+
+    @staticmethod
+    def _remaining(deadline: Optional[float]) -> Optional[float]:
+        return None if deadline is None else max(0.001, deadline - time.monotonic())
@@ -0,0 +1,127 @@
+# mcn_ai_system/src/services/response_cache.py
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+# 默认的持久化缓存文件，与 app.db 放在同一目录
+DEFAULT_CACHE_DB_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'database', 'ai_cache.db')
+# 持久化缓存被其他进程锁住时等待的秒数；读写在缓存锁内进行，等待时间不宜过长，超时按未命中/未写入处理
+CACHE_DB_TIMEOUT = float(os.getenv('AI_CACHE_DB_TIMEOUT', '1.0'))
+
+
+class ResponseCache:
+    """
+    AI 响应缓存：以 (模型名称, Prompt) 的哈希为键。
+    内存层为带 TTL 的 LRU，可选的 SQLite 持久层保证进程重启后缓存仍然可用。
+    所有方法都是线程安全的。
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 86400, db_path: str = None):
+        self.max_entries = max(1, int(max_entries))
+        self.ttl = float(ttl)
+        self.db_path = db_path
+        self._entries = OrderedDict()  # key -> (过期时间戳, 值)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._conn = None
+
+        if db_path:
+            try:
+                os.makedirs(os.path.dirname(db_path), exist_ok=True)
+                self._conn = sqlite3.connect(db_path, timeout=CACHE_DB_TIMEOUT, check_same_thread=False)
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS response_cache ("
+                    "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+                )
+                self._conn.execute("DELETE FROM response_cache WHERE expires_at < ?", (time.time(),))
+                self._conn.commit()
+                print(f"[ResponseCache] 已启用持久化缓存: {db_path}")
+            except sqlite3.Error as e:
+                print(f"[ResponseCache] 持久化缓存初始化失败，仅使用内存缓存: {e}")
+                self._conn = None
+
+    @staticmethod
+    def make_key(model_name: str, prompt: str) -> str:
+        """根据模型名称和 Prompt 计算内容寻址的缓存键"""
+        return hashlib.sha256(f"{model_name}\n{prompt}".encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return entry[1]
+                del self._entries[key]
+
+            if self._conn is not None:
+                try:
+                    row = self._conn.execute(
+                        "SELECT value, expires_at FROM response_cache WHERE key = ?", (key,)
+                    ).fetchone()
+                except sqlite3.Error as e:
+                    # 数据库被锁住或损坏时按未命中处理，不影响调用方
+                    print(f"[ResponseCache] 读取持久化缓存失败，按未命中处理: {e}")
+                    row = None
+                if row and row[1] > now:
+                    # 从磁盘命中后提升到内存层
+                    self._store_in_memory(key, row[0], row[1])
+                    self._hits += 1
+                    self._disk_hits += 1
+                    return row[0]
+
+            self._misses += 1
+            return None
+
+    def set(self, key: str, value: str) -> None:
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._store_in_memory(key, value, expires_at)
+            if self._conn is not None:
+                try:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO response_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                        (key, value, expires_at)
+                    )
+                    self._conn.commit()
+                except sqlite3.Error as e:
+                    print(f"[ResponseCache] 写入持久化缓存失败: {e}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            if self._conn is not None:
+                try:
+                    self._conn.execute("DELETE FROM response_cache")
+                    self._conn.commit()
+                except sqlite3.Error as e:
+                    print(f"[ResponseCache] 清空持久化缓存失败: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "disk_hits": self._disk_hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "persistent": self._conn is not None
+            }
+
+    def _store_in_memory(self, key: str, value: str, expires_at: float) -> None:
+        # 调用方需持有锁
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
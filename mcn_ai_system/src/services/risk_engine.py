@@ -0,0 +1,165 @@
+# mcn_ai_system/src/services/risk_engine.py
+import re
+from collections import deque
+from typing import Dict, List, Any, Iterable, Tuple
+
+from src.services.risk_rules import (
+    KEYWORD_RULES, REGEX_RULES, ALLOW_TERMS, SKIP_CHARACTERS,
+    RISK_CATEGORIES, CATEGORY_LABELS, SEVERITY_HIGH, SEVERITY_REVIEW
+)
+
+# 全角 ASCII 转半角、全角空格转半角、大写字母转小写；逐字符映射，不改变文本长度，命中位置可直接对应原文
+_NORMALIZE_TABLE = {code: code - 0xFEE0 for code in range(0xFF01, 0xFF5F)}
+_NORMALIZE_TABLE[0x3000] = 0x20
+_NORMALIZE_TABLE.update({code: code + 32 for code in range(ord('A'), ord('Z') + 1)})
+_NORMALIZE_TABLE.update({code: code - 0xFEE0 + 32 for code in range(0xFF21, 0xFF3B)})  # 全角大写 -> 半角小写
+
+RISK_LEVELS = ("低", "中", "高")
+_RISK_SCORE_BASE = {"低": 5, "中": 45, "高": 80}
+
+
+def normalize_text(text: str) -> str:
+    return text.translate(_NORMALIZE_TABLE)
+
+
+class AhoCorasick:
+    """
+    Aho-Corasick 多模式匹配：一次线性扫描找出文本中所有关键词的出现位置，与关键词数量无关。
+    skip 中的字符在匹配时被跳过（不推进自动机），命中位置仍对应原文。
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[str, Any]]):
+        self._goto = [{}]  # 状态 -> {字符: 下一状态}
+        self._fail = [0]
+        self._output = [[]]  # 状态 -> [(模式长度, 附加信息)]
+        for pattern, payload in patterns:
+            if pattern:
+                self._add(pattern, payload)
+        self._build_failure_links()
+
+    def _add(self, pattern: str, payload: Any) -> None:
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append((len(pattern), payload))
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                # 合并失败链上的输出，扫描时无需沿失败链查找
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def find_all(self, text: str, skip: frozenset = frozenset()) -> List[Tuple[int, int, Any]]:
+        """返回所有命中 (起始位置, 结束位置, 附加信息)，位置为原文下标（左闭右开）"""
+        goto, fail, output = self._goto, self._fail, self._output
+        root = goto[0]
+        matches = []
+        consumed = []  # 已推进自动机的字符在原文中的下标
+        state = 0
+        for index, char in enumerate(text):
+            if char in skip:
+                continue
+            if state == 0 and char not in root:
+                # 快速路径：根状态下不可能开始匹配的字符（绝大多数正常文本）
+                continue
+            consumed.append(index)
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length, payload in output[state]:
+                matches.append((consumed[-length], index + 1, payload))
+        return matches
+
+
+class RiskRuleEngine:
+    """
+    规则引擎：关键词使用 Aho-Corasick 一次扫描，正则规则合并为一个带命名分组的正则一次扫描。
+    high 命中直接定级为高风险；只有 review 命中（依赖上下文）时标记为需要 AI 复核。
+    """
+
+    def __init__(self, keyword_rules: List[Dict[str, Any]] = KEYWORD_RULES,
+                 regex_rules: List[Dict[str, Any]] = REGEX_RULES, allow_terms: List[str] = ALLOW_TERMS,
+                 skip_characters: str = SKIP_CHARACTERS):
+        patterns = [(normalize_text(term), rule) for rule in keyword_rules for term in rule["terms"]]
+        patterns += [(normalize_text(term), None) for term in allow_terms]  # None 表示放行词
+        self._automaton = AhoCorasick(patterns)
+        self._skip = frozenset(skip_characters)
+        self._regex_rules = list(regex_rules)
+        self._regex = re.compile("|".join(f"(?P<r{i}>{rule['pattern']})" for i, rule in enumerate(regex_rules))) \
+            if regex_rules else None
+
+    def scan(self, content: str) -> Dict[str, Any]:
+        """
+        扫描内容，返回命中列表、各维度的规则判定（与 detect_risk 的 risk_assessment 结构相同）
+        以及是否需要 AI 复核（needs_review）。
+        """
+        normalized = normalize_text(content)
+        raw_hits = self._automaton.find_all(normalized, self._skip)
+        allowed = [(start, end) for start, end, rule in raw_hits if rule is None]
+        hits = []
+        for start, end, rule in raw_hits:
+            if rule is None or any(a_start <= start and end <= a_end for a_start, a_end in allowed):
+                continue
+            hits.append(self._hit(content, start, end, rule))
+        if self._regex is not None:
+            for match in self._regex.finditer(normalized):
+                rule = self._regex_rules[int(match.lastgroup[1:])]
+                hits.append(self._hit(content, match.start(), match.end(), rule))
+        hits.sort(key=lambda hit: hit["start"])
+        return self._assess(hits)
+
+    @staticmethod
+    def _hit(content: str, start: int, end: int, rule: Dict[str, Any]) -> Dict[str, Any]:
+        return {"text": content[start:end], "start": start, "end": end, "category": rule["category"],
+                "severity": rule["severity"], "group": rule["group"], "suggestion": rule["suggestion"]}
+
+    def _assess(self, hits: List[Dict[str, Any]]) -> Dict[str, Any]:
+        assessment, suggestions = {}, []
+        for category in RISK_CATEGORIES:
+            category_hits = [hit for hit in hits if hit["category"] == category]
+            if any(hit["severity"] == SEVERITY_HIGH for hit in category_hits):
+                level = "高"
+            elif category_hits:
+                level = "中"
+            else:
+                level = "低"
+            if category_hits:
+                terms = "、".join(dict.fromkeys(hit["text"] for hit in category_hits))
+                reason = f"命中{CATEGORY_LABELS[category]}规则：{terms}"
+            else:
+                reason = "未发现风险"
+            assessment[category] = {"level": level, "reason": reason}
+            for hit in category_hits:
+                if hit["suggestion"] not in suggestions:
+                    suggestions.append(hit["suggestion"])
+
+        overall = max((assessment[c]["level"] for c in RISK_CATEGORIES), key=RISK_LEVELS.index)
+        has_high = any(hit["severity"] == SEVERITY_HIGH for hit in hits)
+        return {
+            "overall_risk": overall,
+            **assessment,
+            "suggestions": suggestions or ["内容未发现明显风险，可以发布"],
+            "risk_score": risk_score(overall, len(hits)),
+            "matches": hits,
+            # 只有依赖上下文的命中、且没有明确违规时才需要 AI 复核
+            "needs_review": bool(hits) and not has_high and any(hit["severity"] == SEVERITY_REVIEW for hit in hits)
+        }
+
+
+def risk_score(overall_risk: str, hit_count: int = 0) -> int:
+    """0-100 的风险分：按总体风险等级取基础分，命中越多分数越高（同一等级内最多加 15 分）"""
+    return _RISK_SCORE_BASE.get(overall_risk, 0) + min(15, hit_count * 3)
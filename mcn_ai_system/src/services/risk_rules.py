@@ -0,0 +1,86 @@
+# mcn_ai_system/src/services/risk_rules.py
+"""
+内容风险规则库。
+
+每条规则属于一个风险维度，并带有严重程度：
+- high：明确违规（如违禁内容、《广告法》明令禁止的用语），直接判定为高风险，无需 AI 复核；
+- review：是否违规取决于上下文（如"最好"、"第一"），命中后交给 AI 复核。
+关键词在匹配前统一转为小写、全角字符转为半角；ALLOW_TERMS 中的常见搭配覆盖的命中会被忽略。
+"""
+
+POLITICAL = 'political_sensitivity'
+LEGAL = 'legal_compliance'
+ETHICAL = 'ethical_concerns'
+RISK_CATEGORIES = (POLITICAL, LEGAL, ETHICAL)
+CATEGORY_LABELS = {POLITICAL: '政治敏感性', LEGAL: '法律合规性', ETHICAL: '道德伦理'}
+
+SEVERITY_HIGH = 'high'
+SEVERITY_REVIEW = 'review'
+
+KEYWORD_RULES = [
+    {
+        "category": POLITICAL, "severity": SEVERITY_HIGH, "group": "涉政违禁内容",
+        "suggestion": "删除涉及国家安全、分裂国家或邪教的内容",
+        "terms": ["颠覆国家政权", "分裂国家", "台独", "藏独", "疆独", "港独", "邪教", "法轮功", "恐怖袭击",
+                  "恐怖主义", "煽动暴乱"]
+    },
+    {
+        "category": POLITICAL, "severity": SEVERITY_REVIEW, "group": "涉政话题",
+        "suggestion": "商业内容避免讨论政治人物与时政话题",
+        "terms": ["国家领导人", "领导人", "政府", "政治", "游行", "示威", "抗议", "敏感事件", "政策解读", "外交"]
+    },
+    {
+        "category": LEGAL, "severity": SEVERITY_HIGH, "group": "广告法禁用词",
+        "suggestion": "删除《广告法》禁止的绝对化用语（国家级、最高级等）",
+        "terms": ["国家级", "最高级", "全网第一", "销量第一", "全国第一", "世界第一", "第一品牌", "独一无二",
+                  "绝无仅有", "史无前例", "万能"]
+    },
+    {
+        "category": LEGAL, "severity": SEVERITY_HIGH, "group": "虚假或夸大功效",
+        "suggestion": "删除无法证实的功效承诺，医疗/保健功效需有资质证明",
+        "terms": ["根治", "药到病除", "包治百病", "无副作用", "零风险", "100%有效", "百分之百有效", "立即见效",
+                  "永不反弹", "稳赚不赔", "保本保息", "躺赚"]
+    },
+    {
+        "category": LEGAL, "severity": SEVERITY_HIGH, "group": "侵权与违禁商品",
+        "suggestion": "不得推广仿冒、盗版或违禁商品",
+        "terms": ["高仿", "a货", "盗版", "破解版", "代开发票", "刷单"]
+    },
+    {
+        "category": LEGAL, "severity": SEVERITY_REVIEW, "group": "绝对化用语",
+        "suggestion": "绝对化用语需结合语境确认，建议改为客观描述",
+        "terms": ["最佳", "最好", "最强", "最优", "最低价", "最便宜", "顶级", "极品", "第一", "首选", "独家",
+                  "绝对", "永久", "特效", "治愈", "减肥", "祛斑", "美白", "处方药", "投资回报", "收益率"]
+    },
+    {
+        "category": ETHICAL, "severity": SEVERITY_HIGH, "group": "违法与低俗内容",
+        "suggestion": "删除涉及毒品、赌博、色情或自残的内容",
+        "terms": ["毒品", "吸毒", "贩毒", "网络赌博", "赌博网站", "博彩", "代孕", "裸聊", "约炮", "自杀方法"]
+    },
+    {
+        "category": ETHICAL, "severity": SEVERITY_REVIEW, "group": "道德风险话题",
+        "suggestion": "涉及暴力、歧视、烟酒或未成年人的内容需谨慎表达",
+        "terms": ["赌", "暴力", "血腥", "色情", "自杀", "自残", "歧视", "地域黑", "香烟", "电子烟", "酒驾",
+                  "未成年", "整容", "炫富"]
+    },
+]
+
+REGEX_RULES = [
+    {
+        "category": LEGAL, "severity": SEVERITY_REVIEW, "group": "站外导流",
+        "suggestion": "移除微信号、手机号等站外联系方式",
+        "pattern": r"(?:微信|威信|vx|v信|wx|加v)[:：\s]*[a-z0-9_-]{5,}|(?<!\d)1[3-9]\d{9}(?!\d)"
+    },
+    {
+        "category": LEGAL, "severity": SEVERITY_REVIEW, "group": "功效承诺",
+        "pattern": r"\d+\s*天\s*(?:瘦|见效|白|痊愈)|(?:瘦|减)\s*\d+\s*(?:斤|公斤|kg)",
+        "suggestion": "具体功效承诺需有依据，建议删除或注明个体差异"
+    },
+]
+
+# 常见的非违规搭配，被它们完整覆盖的命中不计入（如"第一次"中的"第一"）
+ALLOW_TERMS = ["第一次", "第一步", "第一天", "第一期", "第一集", "第一季", "第一章", "第一眼", "第一口", "第一站",
+               "第一名", "赌气", "打赌", "赌约"]
+
+# 匹配时跳过的分隔字符，用于识别"赌 博"、"毒*品"这类插入符号规避检测的写法
+SKIP_CHARACTERS = " \t*·•_|-/\\"
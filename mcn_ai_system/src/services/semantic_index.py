@@ -0,0 +1,500 @@
+# mcn_ai_system/src/services/semantic_index.py
+import abc
+import hashlib
+import json
+import math
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+import zlib
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+import numpy as np
+
+# 索引文件目录（与 app.db 放在同一目录），重启后直接内存映射，创作者数据未变化时无需重新计算向量
+DEFAULT_SEMANTIC_INDEX_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'database', 'semantic_index')
+SEMANTIC_EMBEDDER = os.getenv('AI_SEMANTIC_EMBEDDER', 'hashed-tfidf')
+SEMANTIC_DIM = int(os.getenv('AI_SEMANTIC_DIM', '512'))
+# 检索模式：brute（精确）/ ivf（倒排聚类近似检索）/ auto（创作者数量达到 SEMANTIC_IVF_MIN_ROWS 时使用 ivf）
+SEMANTIC_MODE = os.getenv('AI_SEMANTIC_MODE', 'auto').lower()
+SEMANTIC_IVF_MIN_ROWS = int(os.getenv('AI_SEMANTIC_IVF_MIN_ROWS', '5000'))
+# IVF 聚类数（0 表示取 sqrt(n)）与每次检索探查的聚类数
+SEMANTIC_IVF_LISTS = int(os.getenv('AI_SEMANTIC_IVF_LISTS', '0'))
+SEMANTIC_IVF_PROBES = int(os.getenv('AI_SEMANTIC_IVF_PROBES', '16'))
+# 增量写入的向量超过主索引的该比例时，下次检索前重建索引
+SEMANTIC_REBUILD_RATIO = float(os.getenv('AI_SEMANTIC_REBUILD_RATIO', '0.1'))
+
+SEARCH_MODES = ('brute', 'ivf', 'auto')
+# 特征哈希缓存的最大条目数
+FEATURE_CACHE_SIZE = 200000
+_CJK_RUN = re.compile(r'[一-鿿]+')
+_WORD = re.compile(r'[a-z0-9]+')
+_ASSIGN_CHUNK_ROWS = 8192
+_EMBED_CHUNK_ROWS = 4096
+# IVF 聚类在每个聚类平均 IVF_TRAIN_ROWS_PER_LIST 行的采样上训练，再对全部向量分配一次
+IVF_TRAIN_ROWS_PER_LIST = 64
+# 磁盘索引的每次构建写入 index_dir/builds/<构建ID>/，meta.json 指向当前构建；
+# 切换后保留上一个构建和最近 SEMANTIC_BUILD_KEEP_SECONDS 秒内的构建，供仍在映射旧文件的进程使用
+SEMANTIC_BUILD_KEEP_SECONDS = 600
+_BUILDS_DIR = 'builds'
+
+
+def creator_document(creator_info: Dict[str, Any]) -> str:
+    """创作者画像文本：领域和标签出现两次以提高权重"""
+    tags = " ".join(creator_info.get('tags') or [])
+    category = creator_info.get('category') or ''
+    return " ".join(filter(None, (category, category, tags, tags, creator_info.get('style') or '',
+                                  creator_info.get('past_collaborations') or '')))
+
+
+def brand_document(brand_info: Dict[str, Any]) -> str:
+    category = brand_info.get('category') or ''
+    return " ".join(str(brand_info.get(field) or '') for field in
+                    ('name', 'description', 'target_audience', 'products_services', 'requirements')) + \
+        f" {category} {category}"
+
+
+class Embedder(abc.ABC):
+    """
+    向量化接口：fit 在创作者语料上拟合（可为空操作），embed 返回 L2 归一化的 float32 矩阵 (len(texts), dim)，
+    子类必须实现 embed。get_state / set_state 用于把拟合结果（如 IDF）与索引一起保存。
+    """
+    name = 'base'
+    dim = 0
+
+    def fit(self, texts: List[str]) -> None:
+        pass
+
+    @abc.abstractmethod
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """返回 texts 的向量矩阵"""
+
+    def fit_embed(self, texts: List[str]) -> np.ndarray:
+        """拟合并返回语料的向量，子类可合并两步以避免重复计算"""
+        self.fit(texts)
+        return self.embed(texts)
+
+    def get_state(self) -> Dict[str, np.ndarray]:
+        return {}
+
+    def set_state(self, state: Dict[str, np.ndarray]) -> None:
+        pass
+
+
+class HashingTfidfEmbedder(Embedder):
+    """
+    本地哈希 n-gram TF-IDF：中文按字的 1~3-gram、英文数字按单词切分，特征经 crc32 哈希到 dim 维（带符号），
+    词频取 1+log(tf)，IDF 由创作者语料的文档频率计算。不依赖网络和模型文件。
+    """
+    name = 'hashed-tfidf'
+
+    def __init__(self, dim: int = SEMANTIC_DIM, max_ngram: int = 3):
+        self.dim = int(dim)
+        self.max_ngram = max_ngram
+        self.idf = np.ones(self.dim, dtype=np.float32)
+        self._feature_cache = {}  # 特征 -> (桶, 符号)
+
+    def features(self, text: str) -> List[str]:
+        text = (text or '').lower()
+        features = _WORD.findall(text)
+        for run in _CJK_RUN.findall(text):
+            for size in range(1, self.max_ngram + 1):
+                features.extend(run[i:i + size] for i in range(len(run) - size + 1))
+        return features
+
+    def _codes(self, text: str) -> List[int]:
+        """
+        特征哈希：每个特征映射为 桶号（负号）或 dim + 桶号（正号）。
+        特征的哈希结果会被缓存（n-gram 在语料中大量重复）。
+        """
+        cache = self._feature_cache
+        codes = []
+        for feature in self.features(text):
+            code = cache.get(feature)
+            if code is None:
+                digest = zlib.crc32(feature.encode('utf-8'))
+                code = digest % self.dim + (self.dim if digest & 0x80000000 else 0)
+                if len(cache) < FEATURE_CACHE_SIZE:
+                    cache[feature] = code
+            codes.append(code)
+        return codes
+
+    def fit(self, texts: List[str]) -> None:
+        self.fit_embed(texts)
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        return self._weighted(self._term_frequencies(texts))
+
+    def fit_embed(self, texts: List[str]) -> np.ndarray:
+        frequencies = self._term_frequencies(texts)
+        document_frequency = np.count_nonzero(frequencies, axis=0)
+        self.idf = (np.log((1 + len(texts)) / (1 + document_frequency)) + 1).astype(np.float32)
+        return self._weighted(frequencies)
+
+    def _term_frequencies(self, texts: List[str]) -> np.ndarray:
+        """带符号的次线性词频矩阵 sign(tf)·(1+log|tf|)，按块用 bincount 向量化计数"""
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        width = 2 * self.dim
+        for offset in range(0, len(texts), _EMBED_CHUNK_ROWS):
+            chunk = texts[offset:offset + _EMBED_CHUNK_ROWS]
+            codes, rows = [], []
+            for row, text in enumerate(chunk):
+                text_codes = self._codes(text)
+                codes.extend(text_codes)
+                rows.extend([row * width] * len(text_codes))
+            counts = np.bincount(np.add(rows, codes, dtype=np.int64), minlength=len(chunk) * width)
+            counts = counts.reshape(len(chunk), 2, self.dim)
+            signed = (counts[:, 1] - counts[:, 0]).astype(np.float32)
+            magnitude = np.abs(signed)
+            np.log(magnitude, out=magnitude, where=magnitude > 0)
+            matrix[offset:offset + len(chunk)] = np.where(signed != 0, np.sign(signed) * (1 + magnitude), 0)
+        return matrix
+
+    def _weighted(self, frequencies: np.ndarray) -> np.ndarray:
+        frequencies *= self.idf
+        return _normalize_rows(frequencies)
+
+    def get_state(self) -> Dict[str, np.ndarray]:
+        return {"idf": self.idf}
+
+    def set_state(self, state: Dict[str, np.ndarray]) -> None:
+        self.idf = np.asarray(state["idf"], dtype=np.float32)
+
+
+EMBEDDERS = {HashingTfidfEmbedder.name: HashingTfidfEmbedder}
+
+
+def create_embedder(name: str = SEMANTIC_EMBEDDER) -> Embedder:
+    """按名称创建向量化器；自定义实现可注册到 EMBEDDERS，或直接传给 SemanticIndex"""
+    if name not in EMBEDDERS:
+        raise ValueError(f"未知的向量化器: {name}，可选: {', '.join(EMBEDDERS)}")
+    return EMBEDDERS[name]()
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """返回得分最高的 k 个位置（按得分降序），O(n) 选择 + O(k log k) 排序"""
+    if k >= len(scores):
+        return np.argsort(-scores, kind='stable')
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    return candidates[np.argsort(-scores[candidates], kind='stable')]
+
+
+def _assign(matrix: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """把每一行分配到内积最大的聚类中心，按块计算避免 n × n_lists 的大矩阵"""
+    assignment = np.zeros(len(matrix), dtype=np.int64)
+    for offset in range(0, len(matrix), _ASSIGN_CHUNK_ROWS):
+        block = matrix[offset:offset + _ASSIGN_CHUNK_ROWS]
+        assignment[offset:offset + len(block)] = np.argmax(block @ centroids.T, axis=1)
+    return assignment
+
+
+def train_ivf(matrix: np.ndarray, n_lists: int, iterations: int = 8,
+              seed: int = 0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    球面 k-means 聚类，返回 (聚类中心, 按聚类排序的行号, 每个聚类在行号数组中的起止偏移)。
+    聚类中心在采样上迭代训练，最后对全部向量分配一次。
+    """
+    n = len(matrix)
+    n_lists = max(1, min(n_lists, n))
+    rng = np.random.default_rng(seed)
+    sample = np.asarray(matrix[np.sort(rng.choice(n, min(n, n_lists * IVF_TRAIN_ROWS_PER_LIST), replace=False))])
+    centroids = sample[rng.choice(len(sample), n_lists, replace=False)].copy()
+    for _ in range(iterations):
+        sample_assignment = _assign(sample, centroids)
+        # 用 one-hot 矩阵乘法按聚类求和（比 np.add.at 快一个数量级）
+        one_hot = np.zeros((len(sample), n_lists), dtype=np.float32)
+        one_hot[np.arange(len(sample)), sample_assignment] = 1
+        sums = one_hot.T @ sample
+        empty = ~sums.any(axis=1)
+        sums[empty] = centroids[empty]  # 空聚类保留原中心
+        centroids = _normalize_rows(sums)
+    assignment = _assign(matrix, centroids)
+    order = np.argsort(assignment, kind='stable')
+    offsets = np.searchsorted(assignment[order], np.arange(n_lists + 1))
+    return centroids, order, offsets
+
+
+class SemanticIndex:
+    """
+    创作者语义检索索引。向量保存为连续的 float32 矩阵文件（.npy），加载时内存映射；
+    支持精确的暴力检索（一次矩阵-向量乘法）和 IVF 近似检索（只计算最近的若干聚类内的向量）。
+    创作者写入后增量更新：旧向量标记删除，新向量放入内存中的增量区（暴力检索），
+    增量超过主索引的 SEMANTIC_REBUILD_RATIO 时下次检索前重建。所有方法都是线程安全的。
+    """
+
+    def __init__(self, index_dir: Optional[str] = DEFAULT_SEMANTIC_INDEX_DIR, embedder: Embedder = None,
+                 mode: str = SEMANTIC_MODE, ivf_lists: int = SEMANTIC_IVF_LISTS, ivf_probes: int = SEMANTIC_IVF_PROBES,
+                 ivf_min_rows: int = SEMANTIC_IVF_MIN_ROWS, rebuild_ratio: float = SEMANTIC_REBUILD_RATIO):
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"不支持的检索模式: {mode}")
+        self.index_dir = index_dir
+        self.embedder = embedder or create_embedder()
+        self.mode = mode
+        self.ivf_lists = ivf_lists
+        self.ivf_probes = max(1, ivf_probes)
+        self.ivf_min_rows = ivf_min_rows
+        self.rebuild_ratio = rebuild_ratio
+        self._lock = threading.RLock()
+        self._built = False
+        self._needs_rebuild = False
+        self._vectors = np.zeros((0, self.embedder.dim), dtype=np.float32)
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._live = np.zeros(0, dtype=bool)
+        self._positions = {}  # 创作者ID -> 主索引行号
+        self._ivf = None  # (聚类中心, 行号, 偏移)
+        self._delta = {}  # 创作者ID -> 增量向量
+        self._searches = 0
+        self._build_seconds = 0.0
+        self._loaded_from_disk = False
+
+    @property
+    def built(self) -> bool:
+        return self._built
+
+    @property
+    def needs_rebuild(self) -> bool:
+        return self._needs_rebuild
+
+    def build(self, documents: Dict[int, str]) -> None:
+        """
+        从 创作者ID -> 画像文本 构建索引。指定了 index_dir 且磁盘上的索引与当前文本一致时直接内存映射，
+        否则重新拟合、计算向量并写入磁盘。
+        """
+        started = time.perf_counter()
+        ids = np.array(sorted(documents), dtype=np.int64)
+        fingerprint = self._fingerprint(ids, documents)
+        if not self._load(fingerprint):
+            texts = [documents[int(i)] for i in ids]
+            vectors = self.embedder.fit_embed(texts) if texts else np.zeros((0, self.embedder.dim), np.float32)
+            # 检索模式可按请求指定，因此 brute 模式下数据量达到阈值时同样训练 IVF
+            train = len(ids) > 0 and (self.mode == 'ivf' or len(ids) >= self.ivf_min_rows)
+            ivf = train_ivf(vectors, self._lists_for(len(ids))) if train else None
+            vectors = self._save(fingerprint, ids, vectors, ivf)
+            self._install(ids, vectors, ivf, from_disk=False)
+        self._build_seconds = time.perf_counter() - started
+        print(f"[SemanticIndex] 索引就绪，创作者 {len(ids)}，维度 {self.embedder.dim}，"
+              f"{'内存映射已有索引' if self._loaded_from_disk else '重新构建'}，耗时 {self._build_seconds:.3f}s")
+
+    def invalidate(self) -> None:
+        """标记为需要重建（如批量导入后），丢弃增量区"""
+        with self._lock:
+            self._delta = {}
+            self._needs_rebuild = True
+
+    def apply_changes(self, upserted: Dict[int, str], removed_ids: Iterable[int]) -> None:
+        """增量更新：upserted 为 创作者ID -> 新的画像文本"""
+        if self._needs_rebuild:
+            return  # 下次检索前会整体重建，无需维护增量区
+        vectors = self.embedder.embed(list(upserted.values())) if upserted else None
+        with self._lock:
+            for creator_id in list(removed_ids) + list(upserted):
+                position = self._positions.get(creator_id)
+                if position is not None:
+                    self._live[position] = False
+                self._delta.pop(creator_id, None)
+            for row, creator_id in enumerate(upserted):
+                self._delta[creator_id] = vectors[row]
+            if len(self._delta) > max(64, self.rebuild_ratio * len(self._ids)):
+                self._needs_rebuild = True
+
+    def search(self, query_text: str, k: int, allowed_ids: Iterable[int] = None,
+               mode: str = None) -> List[Tuple[int, float]]:
+        """
+        返回与查询文本最相似的 k 位创作者 [(创作者ID, 余弦相似度)]，按相似度降序。
+        allowed_ids 不为 None 时只在这些创作者中检索（如平台筛选后的集合）。
+        """
+        mode = mode or self.mode
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"不支持的检索模式: {mode}")
+        if k <= 0:
+            return []
+        query = self.embedder.embed([query_text])[0]
+        with self._lock:
+            self._searches += 1
+            vectors, ids, live, ivf = self._vectors, self._ids, self._live.copy(), self._ivf
+            delta_ids = np.fromiter(self._delta, dtype=np.int64, count=len(self._delta))
+            delta_vectors = np.array(list(self._delta.values()), dtype=np.float32).reshape(-1, self.embedder.dim)
+
+        allowed = None if allowed_ids is None else np.fromiter(set(allowed_ids), dtype=np.int64)
+        if allowed is not None:
+            live &= np.isin(ids, allowed)
+            keep = np.isin(delta_ids, allowed)
+            delta_ids, delta_vectors = delta_ids[keep], delta_vectors[keep]
+
+        use_ivf = ivf is not None and (mode == 'ivf' or mode == 'auto' and len(ids) >= self.ivf_min_rows)
+        positions, scores = self._search_ivf(query, k, vectors, live, ivf) if use_ivf \
+            else self._search_brute(query, k, vectors, live)
+
+        # 合并主索引与增量区的结果
+        result_ids = np.concatenate((ids[positions], delta_ids))
+        result_scores = np.concatenate((scores, delta_vectors @ query if len(delta_ids) else np.zeros(0)))
+        best = _top_k(result_scores, k)
+        return [(int(result_ids[i]), round(float(result_scores[i]), 4)) for i in best]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "built": self._built,
+                "embedder": self.embedder.name,
+                "dim": self.embedder.dim,
+                "rows": int(self._live.sum()) + len(self._delta),
+                "delta_rows": len(self._delta),
+                "mode": self.mode,
+                "ivf_lists": 0 if self._ivf is None else len(self._ivf[0]),
+                "ivf_probes": self.ivf_probes,
+                "memory_mapped": isinstance(self._vectors, np.memmap),
+                "loaded_from_disk": self._loaded_from_disk,
+                "needs_rebuild": self._needs_rebuild,
+                "build_seconds": round(self._build_seconds, 3),
+                "searches": self._searches
+            }
+
+    def _search_brute(self, query: np.ndarray, k: int, vectors: np.ndarray,
+                      live: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        if live.all():
+            scores = vectors @ query
+            positions = _top_k(scores, k)
+            return positions, scores[positions]
+        candidates = np.flatnonzero(live)
+        scores = vectors[candidates] @ query
+        best = _top_k(scores, k)
+        return candidates[best], scores[best]
+
+    def _search_ivf(self, query: np.ndarray, k: int, vectors: np.ndarray, live: np.ndarray,
+                    ivf) -> Tuple[np.ndarray, np.ndarray]:
+        """探查与查询最近的 ivf_probes 个聚类；有效候选不足 k 个时加倍探查数量"""
+        centroids, order, offsets = ivf
+        ranked_lists = np.argsort(-(centroids @ query), kind='stable')
+        probes = self.ivf_probes
+        while True:
+            lists = ranked_lists[:probes]
+            candidates = np.concatenate([order[offsets[i]:offsets[i + 1]] for i in lists])
+            candidates = candidates[live[candidates]]
+            if len(candidates) >= k or probes >= len(ranked_lists):
+                break
+            probes *= 2
+        candidates.sort()  # 按行号顺序读取内存映射的文件
+        scores = vectors[candidates] @ query
+        best = _top_k(scores, k)
+        return candidates[best], scores[best]
+
+    def _lists_for(self, rows: int) -> int:
+        return self.ivf_lists or max(1, int(math.sqrt(rows)))
+
+    def _fingerprint(self, ids: np.ndarray, documents: Dict[int, str]) -> str:
+        digest = hashlib.sha256(f"{self.embedder.name}:{self.embedder.dim}\n".encode('utf-8'))
+        for creator_id in ids:
+            digest.update(f"{int(creator_id)}\t{documents[int(creator_id)]}\n".encode('utf-8'))
+        return digest.hexdigest()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.index_dir, name)
+
+    def _build_path(self, build_id: str, name: str = '') -> str:
+        return os.path.join(self.index_dir, _BUILDS_DIR, build_id, name)
+
+    def _load(self, fingerprint: str) -> bool:
+        """
+        磁盘上的索引与当前创作者文本一致时内存映射加载。各数组只从 meta.json 指向的构建目录读取，
+        构建目录写完后不再修改，因此 meta、ids 与向量总是来自同一次构建。
+        """
+        if not self.index_dir:
+            return False
+        try:
+            with open(self._path('meta.json'), encoding='utf-8') as f:
+                meta = json.load(f)
+            build_id = meta.get('build')
+            if meta.get('fingerprint') != fingerprint or not build_id:
+                return False
+            vectors = np.load(self._build_path(build_id, 'vectors.npy'), mmap_mode='r')
+            ids = np.load(self._build_path(build_id, 'ids.npy'))
+            self.embedder.set_state({name: np.load(self._build_path(build_id, f'embedder_{name}.npy'))
+                                     for name in meta.get('embedder_state', [])})
+            ivf = tuple(np.load(self._build_path(build_id, f'ivf_{name}.npy'))
+                        for name in ('centroids', 'order', 'offsets')) if meta.get('ivf') else None
+            if len(ids) != meta.get('rows') or vectors.shape != (len(ids), self.embedder.dim):
+                raise ValueError(f"构建 {build_id} 的数组与 meta.json 不一致")
+        except (OSError, ValueError, KeyError) as e:
+            if not isinstance(e, FileNotFoundError):
+                print(f"[SemanticIndex] 读取磁盘索引失败，重新构建: {e}")
+            return False
+        self._install(ids, vectors, ivf, from_disk=True)
+        return True
+
+    def _save(self, fingerprint: str, ids: np.ndarray, vectors: np.ndarray, ivf) -> np.ndarray:
+        """
+        把本次构建的数组写入新的构建目录（先写临时目录再整体改名），最后替换 meta.json 指向它；
+        其他进程要么读到旧的 meta 与旧构建，要么读到新的 meta 与新构建。返回内存映射的向量矩阵。
+        """
+        if not self.index_dir:
+            return vectors
+        build_id = f"{int(time.time())}-{uuid.uuid4().hex[:8]}"
+        try:
+            os.makedirs(self._path(_BUILDS_DIR), exist_ok=True)
+            previous = self._current_build()
+            temp_dir = self._path(os.path.join(_BUILDS_DIR, f'.{build_id}.tmp'))
+            os.makedirs(temp_dir)
+            arrays = {'vectors': vectors, 'ids': ids,
+                      **{f'embedder_{name}': value for name, value in self.embedder.get_state().items()}}
+            if ivf is not None:
+                arrays.update(zip(('ivf_centroids', 'ivf_order', 'ivf_offsets'), ivf))
+            for name, value in arrays.items():
+                with open(os.path.join(temp_dir, f'{name}.npy'), 'wb') as f:
+                    np.save(f, np.ascontiguousarray(value))
+            os.replace(temp_dir, self._build_path(build_id))
+            meta = {"fingerprint": fingerprint, "build": build_id, "embedder": self.embedder.name,
+                    "dim": self.embedder.dim, "rows": len(ids), "ivf": ivf is not None,
+                    "embedder_state": list(self.embedder.get_state()), "built_at": time.time()}
+            temp_path = self._path(f'meta.json.{build_id}.tmp')
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+            os.replace(temp_path, self._path('meta.json'))
+            self._remove_old_builds(keep={build_id, previous})
+            return np.load(self._build_path(build_id, 'vectors.npy'), mmap_mode='r')
+        except OSError as e:
+            print(f"[SemanticIndex] 写入磁盘索引失败，仅使用内存索引: {e}")
+            return vectors
+
+    def _current_build(self) -> Optional[str]:
+        try:
+            with open(self._path('meta.json'), encoding='utf-8') as f:
+                return json.load(f).get('build')
+        except (OSError, ValueError, AttributeError):
+            return None
+
+    def _remove_old_builds(self, keep: set) -> None:
+        """删除不再被引用的旧构建（以及旧版本直接写在 index_dir 下的数组）；失败时忽略，下次构建再清理"""
+        cutoff = time.time() - SEMANTIC_BUILD_KEEP_SECONDS
+        builds_dir = self._path(_BUILDS_DIR)
+        for name in os.listdir(builds_dir):
+            path = os.path.join(builds_dir, name)
+            try:
+                if name not in keep and os.path.getmtime(path) < cutoff:
+                    shutil.rmtree(path)
+            except OSError:
+                pass
+        for name in os.listdir(self.index_dir):
+            if name.endswith('.npy'):
+                try:
+                    os.remove(self._path(name))
+                except OSError:
+                    pass
+
+    def _install(self, ids: np.ndarray, vectors: np.ndarray, ivf, from_disk: bool) -> None:
+        with self._lock:
+            self._ids, self._vectors, self._ivf = ids, vectors, ivf
+            self._live = np.ones(len(ids), dtype=bool)
+            self._positions = {int(creator_id): position for position, creator_id in enumerate(ids)}
+            self._delta = {}
+            self._needs_rebuild = False
+            self._loaded_from_disk = from_disk
+            self._built = True
@@ -0,0 +1,159 @@
+# mcn_ai_system/src/services/single_flight.py
+import hashlib
+import re
+import threading
+from typing import Dict, Any, Callable, Iterator, Tuple
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_prompt(prompt: str) -> str:
+    """合并连续空白并去掉首尾空白：仅缩进或换行不同的 Prompt 视为同一请求"""
+    return _WHITESPACE.sub(' ', prompt).strip()
+
+
+def make_flight_key(model_name: str, prompt: str) -> str:
+    return hashlib.sha256(f"{model_name}\n{normalize_prompt(prompt)}".encode('utf-8')).hexdigest()
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class _SharedStream:
+    """
+    被多个读者共享的流式调用：后台线程从上游读取片段追加到 chunks，
+    各读者按自己的进度读取；所有读者都离开后后台线程停止读取上游。
+    """
+
+    def __init__(self):
+        self.chunks = []
+        self.finished = False
+        self.error = None
+        self.readers = 0
+        self.condition = threading.Condition()
+
+
+class SingleFlight:
+    """
+    请求合并（single-flight）：同一时刻键相同的多个调用只执行一次，所有调用方共享其结果或异常。
+    调用完成后立即移除，不缓存结果（结果缓存由 ResponseCache / MatchResultStore 负责）。
+    所有方法都是线程安全的，可在多线程 WSGI 服务器中使用。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}  # 键 -> _Call
+        self._streams = {}  # 键 -> _SharedStream
+        self._executions = 0
+        self._coalesced = 0
+        self._stream_executions = 0
+        self._stream_coalesced = 0
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """执行或等待键对应的调用，返回 (结果, 是否与其他调用共享)"""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self._coalesced += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self._executions += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, call.waiters > 0
+
+    def stream(self, key: str, fn: Callable[[], Iterator[str]]) -> Iterator[str]:
+        """
+        流式调用的合并：键相同的并发调用共享同一个上游流，后加入的读者会先收到已产出的片段。
+        上游出错时所有读者都会收到同一个异常。
+        """
+        with self._lock:
+            shared = self._streams.get(key)
+            leader = shared is None
+            if leader:
+                shared = self._streams[key] = _SharedStream()
+                self._stream_executions += 1
+            else:
+                self._stream_coalesced += 1
+            # 先登记读者再启动后台线程，避免后台线程误以为没有读者而提前停止
+            with shared.condition:
+                shared.readers += 1
+        if leader:
+            threading.Thread(target=self._pump, args=(key, shared, fn),
+                             name="single_flight_stream", daemon=True).start()
+
+        position = 0
+        try:
+            while True:
+                with shared.condition:
+                    while position >= len(shared.chunks) and not shared.finished:
+                        shared.condition.wait()
+                    pending = shared.chunks[position:]
+                    finished, error = shared.finished, shared.error
+                for chunk in pending:
+                    yield chunk
+                position += len(pending)
+                if finished and position >= len(shared.chunks):
+                    if error is not None:
+                        raise error
+                    return
+        finally:
+            with shared.condition:
+                shared.readers -= 1
+
+    def _pump(self, key: str, shared: _SharedStream, fn: Callable[[], Iterator[str]]) -> None:
+        upstream = None
+        try:
+            upstream = fn()
+            for chunk in upstream:
+                with shared.condition:
+                    shared.chunks.append(chunk)
+                    shared.condition.notify_all()
+                    if shared.readers == 0:
+                        break  # 读者都已离开（如客户端断开），不再读取上游
+        except Exception as e:
+            shared.error = e
+        finally:
+            if upstream is not None and hasattr(upstream, 'close'):
+                upstream.close()
+            # 先摘除再标记完成，之后到来的同键请求会发起新的上游调用
+            with self._lock:
+                self._streams.pop(key, None)
+            with shared.condition:
+                shared.finished = True
+                shared.condition.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self._executions + self._coalesced
+            return {
+                "executions": self._executions,
+                "coalesced": self._coalesced,
+                "coalesce_rate": round(self._coalesced / total, 4) if total else 0.0,
+                "in_flight": len(self._calls),
+                "stream_executions": self._stream_executions,
+                "stream_coalesced": self._stream_coalesced,
+                "streams_in_flight": len(self._streams)
+            }
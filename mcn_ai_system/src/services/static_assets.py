@@ -0,0 +1,289 @@
+# mcn_ai_system/src/services/static_assets.py
+"""
+静态资源服务。
+
+启动时扫描静态目录，为每个文件建立清单：MIME 类型、内容哈希（ETag）、是否带指纹（构建清单中列出的产物，
+或文件名含十六进制内容哈希，如 index-3f2a9c1b.js），以及同目录下预压缩的 .br / .gz 版本。请求时只查清单：
+- If-None-Match 命中时直接返回 304，不访问文件系统；
+- 按 Accept-Encoding 优先返回 br，其次 gzip 预压缩版本；
+- 带指纹的文件设置一年的 immutable 缓存，index.html 设置 no-cache（每次用 ETag 确认），其余文件缓存 STATIC_MAX_AGE 秒；
+- 不超过 STATIC_MEMORY_MAX_BYTES 的文件内容常驻内存，返回 200 时同样不访问文件系统。
+清单只在启动（或调用 build）时生成，静态文件更新后需要重启服务。
+"""
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import threading
+from typing import Dict, List, Any, Optional
+
+from flask import Response, send_file
+
+INDEX_FILE = 'index.html'
+# 文件名中的内容哈希：.3f2a9c1b. / -3f2a9c1b.，至少 8 位且同时含数字和 a-f 的十六进制串。
+# 只按文件名判断时宁可漏判（按普通文件缓存）也不误判：如 main-version2.css、app-bundle01.js 不算带指纹
+STATIC_FINGERPRINT_PATTERN = os.getenv(
+    'STATIC_FINGERPRINT_PATTERN',
+    r'[.-](?=[0-9a-f]*\d)(?=[0-9a-f]*[a-f])[0-9a-f]{8,}(?:\.[A-Za-z0-9]+)+$'
+)
+# 构建工具输出的清单（相对静态目录），其中列出的产物文件名都带内容哈希，例如 Vite 的 index-BdK3x9Qa.js。
+# mcn_ai_frontend 的 vite.config.js 开启了 build.manifest；部署时需连同 dist/.vite 目录一起复制（cp -r dist/. static/）
+STATIC_BUILD_MANIFESTS = ('.vite/manifest.json', 'manifest.json')
+# 未带指纹的文件（index.html 除外）的缓存时间（秒）
+STATIC_MAX_AGE = int(os.getenv('STATIC_MAX_AGE', '3600'))
+# 内容常驻内存的单个文件大小上限与总大小上限（字节）
+STATIC_MEMORY_MAX_BYTES = int(os.getenv('STATIC_MEMORY_MAX_BYTES', str(512 * 1024)))
+STATIC_MEMORY_TOTAL_BYTES = int(os.getenv('STATIC_MEMORY_TOTAL_BYTES', str(64 * 1024 * 1024)))
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+# (Accept-Encoding 中的编码名, 预压缩文件后缀)，按优先级排列
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+# 预压缩时处理的 MIME 类型与最小文件大小
+COMPRESSIBLE_TYPES = ('text/', 'application/javascript', 'application/json', 'application/xml',
+                      'image/svg+xml', 'application/wasm', 'font/ttf', 'font/otf', 'image/x-icon',
+                      'image/vnd.microsoft.icon')
+PRECOMPRESS_MIN_BYTES = 1024
+
+_HASH_CHUNK = 1024 * 1024
+
+
+class _Representation:
+    """资源的一种编码（原始、br 或 gzip）：磁盘路径、大小、ETag，以及可能常驻内存的内容"""
+
+    __slots__ = ('path', 'size', 'etag', 'body', 'encoding')
+
+    def __init__(self, path: str, size: int, etag: str, body: Optional[bytes], encoding: Optional[str]):
+        self.path = path
+        self.size = size
+        self.etag = etag
+        self.body = body
+        self.encoding = encoding
+
+
+class StaticAsset:
+    """清单中的一个静态文件"""
+
+    __slots__ = ('name', 'mimetype', 'fingerprinted', 'cache_control', 'etags', 'representations')
+
+    def __init__(self, name: str, mimetype: str, fingerprinted: bool, representations: Dict[str, _Representation]):
+        self.name = name
+        self.mimetype = mimetype
+        self.fingerprinted = fingerprinted
+        if fingerprinted:
+            self.cache_control = IMMUTABLE_CACHE_CONTROL
+        elif name == INDEX_FILE:
+            self.cache_control = 'no-cache'
+        else:
+            self.cache_control = f'public, max-age={STATIC_MAX_AGE}'
+        self.representations = representations  # 编码名（原始为 ''）-> 表示
+        self.etags = [r.etag for r in representations.values()]
+
+    def negotiate(self, accept_encodings) -> _Representation:
+        """按 Accept-Encoding 选择预压缩版本，客户端不接受时返回原始文件"""
+        for encoding, _ in ENCODINGS:
+            representation = self.representations.get(encoding)
+            if representation is not None and accept_encodings[encoding]:
+                return representation
+        return self.representations['']
+
+
+def _file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as source:
+        for chunk in iter(lambda: source.read(_HASH_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:20]
+
+
+def _is_compressible(mimetype: str) -> bool:
+    return any(mimetype.startswith(prefix) for prefix in COMPRESSIBLE_TYPES)
+
+
+def _build_manifest_files(root: str) -> set:
+    """
+    读取 Vite 风格的构建清单（{"src/main.ts": {"file": "assets/index-BdK3x9Qa.js", "css": [...], "assets": [...]}}），
+    返回其中列出的产物路径。不是这种结构的同名文件（如 PWA 的 manifest.json）忽略。
+    """
+    files = set()
+    for relative in STATIC_BUILD_MANIFESTS:
+        path = os.path.join(root, relative)
+        if not os.path.isfile(path):
+            continue
+        try:
+            with open(path, encoding='utf-8') as source:
+                manifest = json.load(source)
+        except (OSError, ValueError) as e:
+            print(f"[StaticAssets] 构建清单读取失败，已忽略: {relative}: {e}")
+            continue
+        if not isinstance(manifest, dict):
+            continue
+        for entry in manifest.values():
+            if not isinstance(entry, dict) or not isinstance(entry.get('file'), str):
+                continue
+            listed = [entry['file']]
+            for key in ('css', 'assets'):
+                # 键不存在、为 null 或不是数组时忽略
+                if isinstance(entry.get(key), list):
+                    listed.extend(entry[key])
+            for name in listed:
+                if isinstance(name, str):
+                    files.add(name.lstrip('/'))
+    # index.html 引用各产物的最新文件名，无论如何都不能长期缓存
+    files.discard(INDEX_FILE)
+    return files
+
+
+class StaticAssets:
+    """
+    静态资源清单与响应。root 为静态目录；build 扫描目录（启动时调用一次），serve 只查清单生成响应。
+    所有方法都是线程安全的。
+    """
+
+    def __init__(self, root: Optional[str], fingerprint_pattern: str = STATIC_FINGERPRINT_PATTERN,
+                 memory_max_bytes: int = STATIC_MEMORY_MAX_BYTES,
+                 memory_total_bytes: int = STATIC_MEMORY_TOTAL_BYTES):
+        self.root = root
+        self._fingerprint = re.compile(fingerprint_pattern)
+        self.memory_max_bytes = memory_max_bytes
+        self.memory_total_bytes = memory_total_bytes
+        self._assets = {}  # 相对路径（/ 分隔）-> StaticAsset
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+
+    def build(self) -> 'StaticAssets':
+        """扫描静态目录生成清单；.br / .gz 文件作为同名文件的预压缩版本，不单独提供"""
+        assets, memory_bytes = {}, 0
+        if self.root and os.path.isdir(self.root):
+            built_files = _build_manifest_files(self.root)
+            for directory, _, filenames in os.walk(self.root):
+                names = set(filenames)
+                for filename in sorted(names):
+                    if any(filename.endswith(suffix) and filename[:-len(suffix)] in names for _, suffix in ENCODINGS):
+                        continue
+                    path = os.path.join(directory, filename)
+                    name = os.path.relpath(path, self.root).replace(os.sep, '/')
+                    asset, used = self._load_asset(name, path, names, memory_bytes, name in built_files)
+                    assets[name] = asset
+                    memory_bytes += used
+        with self._lock:
+            self._assets = assets
+            self._memory_bytes = memory_bytes
+        print(f"[StaticAssets] 静态资源清单已生成，文件 {len(assets)}，"
+              f"带指纹 {sum(a.fingerprinted for a in assets.values())}，"
+              f"预压缩版本 {sum(len(a.representations) - 1 for a in assets.values())}，"
+              f"常驻内存 {memory_bytes / 1024:.1f} KB")
+        return self
+
+    def _load_asset(self, name: str, path: str, siblings: set, memory_bytes: int, in_build_manifest: bool):
+        mimetype = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+        digest = _file_digest(path)
+        representations, used = {}, 0
+        candidates = [('', path)]
+        for encoding, suffix in ENCODINGS:
+            if os.path.basename(path) + suffix not in siblings:
+                continue
+            # 比原文件旧的预压缩版本内容可能已过期，不使用
+            if os.path.getmtime(path + suffix) < os.path.getmtime(path):
+                print(f"[StaticAssets] 预压缩文件早于原文件，已忽略: {name}{suffix}")
+                continue
+            candidates.append((encoding, path + suffix))
+        for encoding, variant_path in candidates:
+            size = os.path.getsize(variant_path)
+            body = None
+            if size <= self.memory_max_bytes and memory_bytes + used + size <= self.memory_total_bytes:
+                with open(variant_path, 'rb') as source:
+                    body = source.read()
+                used += size
+            # 同一内容的不同编码使用不同的 ETag
+            etag = digest if not encoding else f"{digest}-{encoding}"
+            representations[encoding] = _Representation(variant_path, size, etag, body, encoding or None)
+        fingerprinted = in_build_manifest or bool(self._fingerprint.search(os.path.basename(name)))
+        return StaticAsset(name, mimetype, fingerprinted, representations), used
+
+    def lookup(self, path: str) -> Optional[StaticAsset]:
+        """按请求路径查找资源：不存在且看起来不是文件（最后一段没有扩展名）的路径返回 index.html（前端路由）"""
+        assets = self._assets
+        asset = assets.get(path)
+        if asset is None and '.' not in path.rsplit('/', 1)[-1]:
+            asset = assets.get(INDEX_FILE)
+        return asset
+
+    def serve(self, path: str, request) -> Response:
+        asset = self.lookup(path)
+        if asset is None:
+            return Response("Not Found" if '.' in path.rsplit('/', 1)[-1] else "index.html not found", status=404)
+
+        has_variants = len(asset.representations) > 1
+        if request.if_none_match and any(request.if_none_match.contains_weak(etag) for etag in asset.etags):
+            response = Response(status=304)
+            response.set_etag(next(e for e in asset.etags if request.if_none_match.contains_weak(e)))
+        else:
+            representation = asset.negotiate(request.accept_encodings)
+            if representation.body is not None:
+                response = Response(representation.body, mimetype=asset.mimetype)
+            else:
+                response = send_file(representation.path, mimetype=asset.mimetype, conditional=False,
+                                     etag=False, last_modified=None, max_age=None)
+            if representation.encoding:
+                response.headers['Content-Encoding'] = representation.encoding
+            response.set_etag(representation.etag)
+        response.headers['Cache-Control'] = asset.cache_control
+        if has_variants:
+            response.vary.add('Accept-Encoding')
+        return response
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "files": len(self._assets),
+                "fingerprinted": sum(a.fingerprinted for a in self._assets.values()),
+                "memory_bytes": self._memory_bytes
+            }
+
+    def manifest(self) -> Dict[str, Dict[str, Any]]:
+        """清单的可序列化形式：路径 -> ETag、MIME 类型、是否带指纹、可用编码"""
+        return {name: {"etag": asset.representations[''].etag, "mimetype": asset.mimetype,
+                       "fingerprinted": asset.fingerprinted,
+                       "encodings": sorted(e for e in asset.representations if e)}
+                for name, asset in sorted(self._assets.items())}
+
+
+def precompress(root: str, min_bytes: int = PRECOMPRESS_MIN_BYTES) -> List[str]:
+    """
+    为静态目录中可压缩的文件生成 .gz（以及安装了 brotli 时的 .br）预压缩版本，
+    压缩后没有变小或已是最新的版本跳过。返回写入的文件列表。
+    """
+    try:
+        import brotli
+    except ImportError:
+        brotli = None
+        print("[precompress] 未安装 brotli，只生成 gzip 版本")
+
+    written = []
+    for directory, _, filenames in os.walk(root):
+        for filename in filenames:
+            if filename.endswith(tuple(suffix for _, suffix in ENCODINGS)):
+                continue
+            path = os.path.join(directory, filename)
+            mimetype = mimetypes.guess_type(filename)[0] or ''
+            if not _is_compressible(mimetype) or os.path.getsize(path) < min_bytes:
+                continue
+            with open(path, 'rb') as source:
+                data = source.read()
+            # mtime=0 使相同内容生成的 gzip 文件完全一致
+            variants = [('.gz', lambda d: gzip.compress(d, compresslevel=9, mtime=0))]
+            if brotli is not None:
+                variants.append(('.br', lambda d: brotli.compress(d, quality=11)))
+            for suffix, compress in variants:
+                target = path + suffix
+                if os.path.exists(target) and os.path.getmtime(target) >= os.path.getmtime(path):
+                    continue
+                compressed = compress(data)
+                if len(compressed) >= len(data):
+                    continue
+                with open(target, 'wb') as output:
+                    output.write(compressed)
+                written.append(target)
+    return written